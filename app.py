@@ -1,39 +1,213 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
-from datetime import datetime
+from flask import (
+    Flask, Response, current_app, g, make_response, render_template, request, redirect,
+    session, url_for, flash, jsonify
+)
+from werkzeug.http import is_resource_modified
+from datetime import datetime, timezone
+from functools import partial, wraps
+from pathlib import Path
+import atexit
 import sqlite3
-import os
-
-app = Flask(__name__)
-app.secret_key = 'your_secret_key_here'  # Change this to a secure secret key
+import threading
+
+from src.api import registrar_api
+from src.cache import CacheResultados
+from src.database import (
+    MAX_CANDIDATOS_BUSCA, PoolConexoes, atualizar_esquema, consulta_busca, expressao_busca,
+    filtros_transacoes, inserir_transacoes, iterar_consulta, versao_dados
+)
+from src.exportador import ler_filtros, gerar_csv, gerar_jsonl
+from src.metricas import RegistroMetricas, instrumentar_app
+from src.sugestoes import CONSULTA_DESCRICOES, IndiceSugestoes, registrar_rota_sugestoes
+from src.utils import (
+    codificar_cursor, decodificar_cursor, ler_limite,
+    valor_para_centavos, centavos_para_decimal, formatar_valor_monetario
+)
 
 # Configuração do banco de dados
 DATABASE = 'fin_assist.db'
 
+# Métodos atendidos com conexões somente leitura
+METODOS_LEITURA = ('GET', 'HEAD', 'OPTIONS')
+
+# Rotas registradas em cada app criado por create_app: (regra, view, opções)
+_rotas = []
+
+def rota(regra, **opcoes):
+    """Como ``app.route``, mas para todos os apps criados por ``create_app``."""
+    def registrar(view):
+        _rotas.append((regra, view, opcoes))
+        return view
+    return registrar
+
 def dict_factory(cursor, row):
     d = {}
     for idx, col in enumerate(cursor.description):
         d[col[0]] = row[idx]
     return d
 
+class RecursosApp:
+    """Pool de conexões, cache e sugestões de um app criado por ``create_app``."""
+
+    def __init__(self, database, conexoes, codigo_alterado_em=0):
+        self.pool = PoolConexoes(database, tamanho=conexoes)
+        # Entra no ETag das páginas: uma nova versão do código invalida as antigas
+        self.codigo_alterado_em = codigo_alterado_em
+        # Resultados do dashboard, invalidados pelas rotas de escrita
+        self.cache = CacheResultados()
+        # Autocompletar da descrição em /api/sugestoes, atualizado a cada nova transação
+        self.sugestoes = IndiceSugestoes(self.carregar_descricoes)
+
+    def carregar_descricoes(self):
+        with self.pool.conexao(somente_leitura=True) as db:
+            return db.execute(CONSULTA_DESCRICOES).fetchall()
+
+    def add_transacoes_lote(self, transacoes, atomico=False):
+        """
+        Grava transações da API JSON e atualiza cache e sugestões.
+
+        Mesma assinatura e retorno de ``DatabaseManager.add_transacoes_lote``.
+        """
+        transacoes = list(transacoes)
+        with self.pool.conexao() as db:
+            resultados = inserir_transacoes(db, transacoes, atomico)
+        gravadas = [transacao for transacao, resultado in zip(transacoes, resultados)
+                    if isinstance(resultado, int)]
+        if gravadas:
+            self.cache.invalidar()
+            for _, _, data, descricao, categoria in gravadas:
+                self.sugestoes.registrar(descricao, categoria, data)
+        return resultados
+
+def recursos():
+    """Recursos do app da requisição atual."""
+    return current_app.extensions['fin_assist']
+
 def get_db():
-    db = sqlite3.connect(DATABASE)
-    db.row_factory = dict_factory
-    return db
-
-def init_db():
-    if not os.path.exists(DATABASE):
-        db = get_db()
-        with app.open_resource('schema.sql', mode='r') as f:
-            db.cursor().executescript(f.read())
+    """
+    Conexão da requisição atual, emprestada do pool do processo na primeira
+    chamada: somente leitura em GET e leitura e escrita nos demais métodos.
+    Consultas acima do limite vão para logs/consultas_lentas.log com o plano.
+    """
+    if 'db' not in g:
+        g.db = recursos().pool.emprestar(somente_leitura=request.method in METODOS_LEITURA)
+        g.db.row_factory = dict_factory
+    return g.db
+
+def devolver_db(exc=None):
+    """Devolve a conexão ao pool ao fim da requisição (teardown)."""
+    db = g.pop('db', None)
+    if db is not None:
+        recursos().pool.devolver(db)
+
+def momento_codigo(app):
+    """Última modificação (segundos Unix) do código e dos templates que geram as páginas."""
+    raiz = Path(app.root_path)
+    arquivos = [raiz / 'app.py', *(raiz / 'templates').glob('*.html'), *(raiz / 'src').glob('*.py')]
+    return int(max(arquivo.stat().st_mtime for arquivo in arquivos))
+
+def condicional(por_mes=False):
+    """
+    Valida a página pelo contador de escritas (tabela versao_dados) antes de
+    executar a view: se o ETag ou o Last-Modified que o cliente já tem
+    continuam valendo, a resposta é 304 sem consultar os dados nem renderizar.
+
+    Args:
+        por_mes (bool): A página mostra o mês atual e muda na virada do mês
+    """
+    def decorador(view):
+        @wraps(view)
+        def validar(*args, **kwargs):
+            versao, alterado_em = versao_dados(get_db())
+            # Disponível para a view, ex: como parte da chave de cache
+            g.versao_dados = versao
+            if session.get('_flashes'):
+                # A mensagem aparece uma única vez: esta página não pode ser reaproveitada
+                resposta = make_response(view(*args, **kwargs))
+                resposta.cache_control.no_store = True
+                return resposta
+
+            codigo = recursos().codigo_alterado_em
+            etag = f'{codigo:x}-{versao}'
+            ultima = max(alterado_em, codigo)
+            if por_mes:
+                agora = datetime.now()
+                etag += f'-{agora:%Y%m}'
+                ultima = max(ultima, int(datetime(agora.year, agora.month, 1).timestamp()))
+            ultima_modificacao = datetime.fromtimestamp(ultima, timezone.utc)
+
+            if is_resource_modified(request.environ, etag=etag, last_modified=ultima_modificacao):
+                resposta = make_response(view(*args, **kwargs))
+            else:
+                resposta = current_app.response_class(status=304)
+            resposta.set_etag(etag)
+            resposta.last_modified = ultima_modificacao
+            # O navegador guarda a página, mas revalida a cada acesso
+            resposta.cache_control.no_cache = True
+            return resposta
+        return validar
+    return decorador
+
+def init_db(app):
+    db = sqlite3.connect(app.config['DATABASE'])
+    try:
+        if not db.execute("SELECT 1 FROM sqlite_master WHERE name = 'transacoes'").fetchone():
+            with app.open_resource('schema.sql', mode='r') as f:
+                db.executescript(f.read())
+        # Bancos antigos são migrados e ganham índices e resumo mensal
+        atualizar_esquema(db)
         db.commit()
-
-# Rotas principais
-@app.route('/')
-def dashboard():
+        # Conexões somente leitura não podem ativar o WAL
+        db.execute("PRAGMA journal_mode = WAL")
+    finally:
+        db.close()
+
+def create_app(database=None, conexoes=None):
+    """
+    Cria o app web com banco, pool de conexões, cache e métricas próprios.
+
+    Sem argumentos, a configuração vem de FIN_ASSIST_DATABASE e
+    FIN_ASSIST_CONEXOES, quando definidas no ambiente.
+
+    Args:
+        database (Optional[str]): Arquivo SQLite (padrão: ``DATABASE``); o
+            esquema é criado ou migrado aqui
+        conexoes (Optional[int]): Conexões livres mantidas por tipo (leitura e
+            escrita), normalmente uma por thread do processo (padrão: 8); as
+            de leitura são abertas já na criação
+
+    Returns:
+        Flask: App pronto para um servidor WSGI
+    """
+    app = Flask(__name__)
+    app.secret_key = 'your_secret_key_here'  # Change this to a secure secret key
+    app.config.update(DATABASE=DATABASE, CONEXOES=8)
+    app.config.from_prefixed_env('FIN_ASSIST')
+    if database:
+        app.config['DATABASE'] = database
+    if conexoes:
+        app.config['CONEXOES'] = conexoes
+    app.add_template_filter(formatar_valor_monetario, 'moeda')
+    app.add_template_filter(centavos_para_decimal, 'reais')
+
+    init_db(app)
+    estado = app.extensions['fin_assist'] = RecursosApp(
+        app.config['DATABASE'], app.config['CONEXOES'], momento_codigo(app))
+    estado.pool.aquecer(app.config['CONEXOES'])
+    atexit.register(estado.pool.close)
+    app.teardown_appcontext(devolver_db)
+
+    # Latência por rota, status e requisições em andamento, expostas em /metrics
+    instrumentar_app(app, RegistroMetricas())
+    registrar_rota_sugestoes(app, estado.sugestoes)
+    registrar_api(app, estado.pool.conexao, estado.add_transacoes_lote,
+                  partial(estado.pool.conexao, somente_leitura=True), estado.cache)
+    for regra, view, opcoes in _rotas:
+        app.add_url_rule(regra, view_func=view, **opcoes)
+    return app
+
+def calcular_dashboard(mes_atual, ano_atual):
     db = get_db()
-    now = datetime.now()
-    mes_atual = now.month
-    ano_atual = now.year
 
     # Obter resumo financeiro
     resumo = {
@@ -45,11 +219,11 @@ def dashboard():
 
     # Calcular receitas e despesas
     cursor = db.execute('''
-        SELECT tipo, SUM(valor) as total
-        FROM transacoes 
-        WHERE strftime('%m', data) = ? AND strftime('%Y', data) = ?
+        SELECT tipo, SUM(total) as total
+        FROM resumo_mensal
+        WHERE ano = ? AND mes = ?
         GROUP BY tipo
-    ''', (f'{mes_atual:02d}', str(ano_atual)))
+    ''', (ano_atual, mes_atual))
     
     for row in cursor:
         if row['tipo'] == 'Receita':
@@ -61,26 +235,23 @@ def dashboard():
 
     # Calcular despesas por categoria
     cursor = db.execute('''
-        SELECT categoria, SUM(valor) as total
-        FROM transacoes 
-        WHERE tipo = 'Despesa' AND strftime('%m', data) = ? AND strftime('%Y', data) = ?
-        GROUP BY categoria
-    ''', (f'{mes_atual:02d}', str(ano_atual)))
+        SELECT categoria, total
+        FROM resumo_mensal
+        WHERE ano = ? AND mes = ? AND tipo = 'Despesa'
+    ''', (ano_atual, mes_atual))
     
     resumo['despesas_por_categoria'] = cursor.fetchall()
 
     # Obter orçamentos
     orcamentos = db.execute('''
-        SELECT id, categoria, valor_limite, 
-               COALESCE((SELECT SUM(valor) 
-                        FROM transacoes 
-                        WHERE categoria = o.categoria 
-                        AND tipo = 'Despesa'
-                        AND strftime('%m', data) = ? 
-                        AND strftime('%Y', data) = ?), 0) as valor_atual
+        SELECT o.id, o.categoria, o.valor_limite,
+               COALESCE(r.total, 0) as valor_atual
         FROM orcamentos o
-        WHERE mes = ? AND ano = ?
-    ''', (f'{mes_atual:02d}', str(ano_atual), mes_atual, ano_atual)).fetchall()
+        LEFT JOIN resumo_mensal r
+            ON r.ano = o.ano AND r.mes = o.mes
+            AND r.tipo = 'Despesa' AND r.categoria = o.categoria
+        WHERE o.mes = ? AND o.ano = ?
+    ''', (mes_atual, ano_atual)).fetchall()
 
     # Obter metas
     metas = db.execute('''
@@ -103,53 +274,149 @@ def dashboard():
         LIMIT 5
     ''').fetchall()
 
-    return render_template('dashboard.html',
-                         now=now,
-                         resumo=resumo,
-                         orcamentos=orcamentos,
-                         metas=metas,
-                         transacoes=transacoes)
+    return {
+        'resumo': resumo,
+        'orcamentos': orcamentos,
+        'metas': metas,
+        'transacoes': transacoes
+    }
+
+# Rotas principais
+@rota('/')
+@condicional(por_mes=True)
+def dashboard():
+    now = datetime.now()
+    # A versão dos dados na chave percebe também escritas de outros processos
+    dados = recursos().cache.obter(('dashboard', g.versao_dados, now.year, now.month),
+                        lambda: calcular_dashboard(now.month, now.year))
 
-@app.route('/transactions')
+    return render_template('dashboard.html', now=now, **dados)
+
+@rota('/cache/estatisticas')
+def estatisticas_cache():
+    return jsonify(recursos().cache.estatisticas())
+
+@rota('/transactions')
+@condicional()
 def transactions():
     db = get_db()
     tipo = request.args.get('tipo')
     categoria = request.args.get('categoria')
     data_inicio = request.args.get('data_inicio')
     data_fim = request.args.get('data_fim')
+    cursor = decodificar_cursor(request.args.get('cursor'))
+    limite = ler_limite(request.args.get('limite'))
 
     query = '''
-        SELECT id, 
+        SELECT id, data,
                strftime('%d/%m/%Y', data) as data_formatada,
                tipo, descricao, categoria, valor 
         FROM transacoes 
         WHERE 1=1
     '''
-    params = []
-
-    if tipo:
-        query += ' AND tipo = ?'
-        params.append(tipo)
-    if categoria:
-        query += ' AND categoria = ?'
-        params.append(categoria)
-    if data_inicio:
-        query += ' AND data >= ?'
-        params.append(data_inicio)
-    if data_fim:
-        query += ' AND data <= ?'
-        params.append(data_fim)
-
-    query += ' ORDER BY data DESC, id DESC'
+    clausula, params = filtros_transacoes(tipo, categoria, data_inicio, data_fim)
+    query += clausula
+
+    if cursor:
+        query += ' AND (data, id) < (?, ?)'
+        params.extend(cursor)
+
+    # Busca uma linha a mais para saber se existe próxima página
+    query += ' ORDER BY data DESC, id DESC LIMIT ?'
+    params.append(limite + 1)
     
     transacoes = db.execute(query, params).fetchall()
+    proximo_cursor = None
+    if len(transacoes) > limite:
+        transacoes = transacoes[:limite]
+        proximo_cursor = codificar_cursor(transacoes[-1]['data'], transacoes[-1]['id'])
     categorias = db.execute('SELECT DISTINCT nome FROM categorias ORDER BY nome').fetchall()
 
+    filtros = {chave: valor for chave, valor in request.args.items()
+               if chave != 'cursor' and valor}
+
     return render_template('transactions.html',
                          transacoes=transacoes,
-                         categorias=[cat['nome'] for cat in categorias])
+                         categorias=[cat['nome'] for cat in categorias],
+                         filtros=filtros,
+                         primeira_pagina=cursor is None,
+                         proximo_cursor=proximo_cursor)
+
+@rota('/search')
+def buscar_transacoes():
+    busca = request.args.get('q', '').strip()
+    expressao = expressao_busca(busca)
+    if expressao is None:
+        return redirect(url_for('transactions'))
+
+    db = get_db()
+    limite = ler_limite(request.args.get('limite'))
+    clausula, params = filtros_transacoes(**ler_filtros(request.args))
+    query = consulta_busca('''
+        id, data,
+        strftime('%d/%m/%Y', data) as data_formatada,
+        tipo, descricao, categoria, valor
+    ''', clausula)
+    transacoes = db.execute(query, [expressao, *params, MAX_CANDIDATOS_BUSCA, limite]).fetchall()
+    categorias = db.execute('SELECT DISTINCT nome FROM categorias ORDER BY nome').fetchall()
+
+    filtros = {chave: valor for chave, valor in request.args.items() if valor}
 
-@app.route('/budgets')
+    return render_template('transactions.html',
+                         transacoes=transacoes,
+                         categorias=[cat['nome'] for cat in categorias],
+                         filtros=filtros,
+                         busca=busca,
+                         primeira_pagina=True,
+                         proximo_cursor=None)
+
+def iter_transacoes_filtradas(pool, filtros, busca=None):
+    """
+    Percorre as transações filtradas em blocos, para exportação.
+
+    Com ``busca`` (o ``q`` da página /search) exporta todas as transações que
+    casam com a busca textual, além dos filtros, em vez de todas as filtradas.
+
+    Roda durante o envio da resposta, depois do teardown da requisição, por
+    isso usa uma conexão própria do pool em vez da de get_db().
+    """
+    clausula, params = filtros_transacoes(**filtros)
+    expressao = expressao_busca(busca)
+    if expressao is None:
+        query = f'''
+            SELECT id, data, tipo, valor, categoria, descricao
+            FROM transacoes
+            WHERE 1=1{clausula}
+            ORDER BY data DESC, id DESC
+        '''
+    else:
+        query = f'''
+            SELECT t.id, t.data, t.tipo, t.valor, t.categoria, t.descricao
+            FROM transacoes_fts
+            JOIN transacoes t ON t.id = transacoes_fts.rowid
+            WHERE transacoes_fts MATCH ?{clausula}
+            ORDER BY t.data DESC, t.id DESC
+        '''
+        params = [expressao, *params]
+    with pool.conexao(somente_leitura=True) as db:
+        yield from iterar_consulta(db, query, params)
+
+@rota('/export/transacoes.csv')
+def exportar_transacoes_csv():
+    linhas = iter_transacoes_filtradas(recursos().pool, ler_filtros(request.args),
+                                     request.args.get('q'))
+    return Response(gerar_csv(linhas), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.csv'})
+
+@rota('/export/transacoes.jsonl')
+def exportar_transacoes_jsonl():
+    linhas = iter_transacoes_filtradas(recursos().pool, ler_filtros(request.args),
+                                     request.args.get('q'))
+    return Response(gerar_jsonl(linhas), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.jsonl'})
+
+@rota('/budgets')
+@condicional(por_mes=True)
 def budgets():
     db = get_db()
     now = datetime.now()
@@ -157,16 +424,14 @@ def budgets():
     ano_atual = now.year
 
     orcamentos = db.execute('''
-        SELECT id, categoria, valor_limite, 
-               COALESCE((SELECT SUM(valor) 
-                        FROM transacoes 
-                        WHERE categoria = o.categoria 
-                        AND tipo = 'Despesa'
-                        AND strftime('%m', data) = ? 
-                        AND strftime('%Y', data) = ?), 0) as valor_atual
+        SELECT o.id, o.categoria, o.valor_limite,
+               COALESCE(r.total, 0) as valor_atual
         FROM orcamentos o
-        WHERE mes = ? AND ano = ?
-    ''', (f'{mes_atual:02d}', str(ano_atual), mes_atual, ano_atual)).fetchall()
+        LEFT JOIN resumo_mensal r
+            ON r.ano = o.ano AND r.mes = o.mes
+            AND r.tipo = 'Despesa' AND r.categoria = o.categoria
+        WHERE o.mes = ? AND o.ano = ?
+    ''', (mes_atual, ano_atual)).fetchall()
 
     categorias = db.execute('SELECT DISTINCT nome FROM categorias ORDER BY nome').fetchall()
 
@@ -176,7 +441,8 @@ def budgets():
                          mes_atual=mes_atual,
                          ano_atual=ano_atual)
 
-@app.route('/goals')
+@rota('/goals')
+@condicional()
 def goals():
     db = get_db()
     metas = db.execute('''
@@ -191,39 +457,37 @@ def goals():
 
     return render_template('goals.html', metas=metas)
 
-@app.route('/categories')
+@rota('/categories')
 def categories():
     db = get_db()
     categorias = db.execute('SELECT nome FROM categorias ORDER BY nome').fetchall()
     
-    # Calcular estatísticas para cada categoria
-    estatisticas = {}
-    for cat in categorias:
-        nome = cat['nome']
-        stats = db.execute('''
-            SELECT COUNT(*) as total, SUM(valor) as valor
-            FROM transacoes
-            WHERE categoria = ?
-        ''', (nome,)).fetchone()
-        
-        estatisticas[nome] = {
-            'total': stats['total'],
-            'valor': stats['valor'] or 0
-        }
+    # Calcular estatísticas para cada categoria a partir do resumo mensal
+    estatisticas = {cat['nome']: {'total': 0, 'valor': 0} for cat in categorias}
+    for stats in db.execute('''
+        SELECT categoria, SUM(contagem) as total, SUM(total) as valor
+        FROM resumo_mensal
+        GROUP BY categoria
+    '''):
+        if stats['categoria'] in estatisticas:
+            estatisticas[stats['categoria']] = {
+                'total': stats['total'],
+                'valor': stats['valor'] or 0
+            }
 
     return render_template('categories.html',
                          categorias=[cat['nome'] for cat in categorias],
                          estatisticas=estatisticas)
 
 # Rotas para adicionar dados
-@app.route('/adicionar_transacao', methods=['POST'])
+@rota('/adicionar_transacao', methods=['POST'])
 def adicionar_transacao():
     db = get_db()
     try:
         tipo = request.form['tipo']
         descricao = request.form['descricao']
         categoria = request.form['categoria']
-        valor = float(request.form['valor'].replace('.', '').replace(',', '.'))
+        valor = valor_para_centavos(request.form['valor'])
         data = request.form['data']
 
         db.execute('''
@@ -231,18 +495,20 @@ def adicionar_transacao():
             VALUES (?, ?, ?, ?, ?)
         ''', (data, tipo, descricao, categoria, valor))
         db.commit()
+        recursos().cache.invalidar()
+        recursos().sugestoes.registrar(descricao, categoria, data)
         flash('Transação adicionada com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao adicionar transação: {str(e)}', 'error')
     
     return redirect(url_for('transactions'))
 
-@app.route('/adicionar_orcamento', methods=['POST'])
+@rota('/adicionar_orcamento', methods=['POST'])
 def adicionar_orcamento():
     db = get_db()
     try:
         categoria = request.form['categoria']
-        valor_limite = float(request.form['valor_limite'].replace('.', '').replace(',', '.'))
+        valor_limite = valor_para_centavos(request.form['valor_limite'])
         mes = int(request.form['mes'])
         ano = int(request.form['ano'])
 
@@ -251,18 +517,19 @@ def adicionar_orcamento():
             VALUES (?, ?, ?, ?)
         ''', (categoria, valor_limite, mes, ano))
         db.commit()
+        recursos().cache.invalidar()
         flash('Orçamento adicionado com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao adicionar orçamento: {str(e)}', 'error')
     
     return redirect(url_for('budgets'))
 
-@app.route('/adicionar_meta', methods=['POST'])
+@rota('/adicionar_meta', methods=['POST'])
 def adicionar_meta():
     db = get_db()
     try:
         descricao = request.form['descricao']
-        valor_alvo = float(request.form['valor_alvo'].replace('.', '').replace(',', '.'))
+        valor_alvo = valor_para_centavos(request.form['valor_alvo'])
         data_inicio = request.form['data_inicio']
         data_fim = request.form['data_fim']
 
@@ -271,19 +538,21 @@ def adicionar_meta():
             VALUES (?, ?, 0, ?, ?)
         ''', (descricao, valor_alvo, data_inicio, data_fim))
         db.commit()
+        recursos().cache.invalidar()
         flash('Meta adicionada com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao adicionar meta: {str(e)}', 'error')
     
     return redirect(url_for('goals'))
 
-@app.route('/adicionar_categoria', methods=['POST'])
+@rota('/adicionar_categoria', methods=['POST'])
 def adicionar_categoria():
     db = get_db()
     try:
         nome = request.form['nome']
         db.execute('INSERT INTO categorias (nome) VALUES (?)', (nome,))
         db.commit()
+        recursos().cache.invalidar()
         flash('Categoria adicionada com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao adicionar categoria: {str(e)}', 'error')
@@ -291,13 +560,13 @@ def adicionar_categoria():
     return redirect(url_for('categories'))
 
 # Rotas para atualizar dados
-@app.route('/atualizar_meta/<int:id>', methods=['POST'])
+@rota('/atualizar_meta/<int:id>', methods=['POST'])
 def atualizar_meta(id):
     db = get_db()
     try:
         descricao = request.form['descricao']
-        valor_alvo = float(request.form['valor_alvo'].replace('.', '').replace(',', '.'))
-        valor_atual = float(request.form['valor_atual'].replace('.', '').replace(',', '.'))
+        valor_alvo = valor_para_centavos(request.form['valor_alvo'])
+        valor_atual = valor_para_centavos(request.form['valor_atual'])
         data_inicio = request.form['data_inicio']
         data_fim = request.form['data_fim']
         status = request.form['status']
@@ -309,13 +578,14 @@ def atualizar_meta(id):
             WHERE id = ?
         ''', (descricao, valor_alvo, valor_atual, data_inicio, data_fim, id))
         db.commit()
+        recursos().cache.invalidar()
         flash('Meta atualizada com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao atualizar meta: {str(e)}', 'error')
     
     return redirect(url_for('goals'))
 
-@app.route('/atualizar_categoria/<nome>', methods=['POST'])
+@rota('/atualizar_categoria/<nome>', methods=['POST'])
 def atualizar_categoria(nome):
     db = get_db()
     try:
@@ -324,6 +594,7 @@ def atualizar_categoria(nome):
         db.execute('UPDATE transacoes SET categoria = ? WHERE categoria = ?', (novo_nome, nome))
         db.execute('UPDATE orcamentos SET categoria = ? WHERE categoria = ?', (novo_nome, nome))
         db.commit()
+        recursos().cache.invalidar()
         flash('Categoria atualizada com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao atualizar categoria: {str(e)}', 'error')
@@ -331,54 +602,71 @@ def atualizar_categoria(nome):
     return redirect(url_for('categories'))
 
 # Rotas para excluir dados
-@app.route('/excluir_transacao/<int:id>', methods=['POST'])
+@rota('/excluir_transacao/<int:id>', methods=['POST'])
 def excluir_transacao(id):
     db = get_db()
     try:
         db.execute('DELETE FROM transacoes WHERE id = ?', (id,))
         db.commit()
+        recursos().cache.invalidar()
         flash('Transação excluída com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao excluir transação: {str(e)}', 'error')
     
     return redirect(url_for('transactions'))
 
-@app.route('/excluir_orcamento/<int:id>', methods=['POST'])
+@rota('/excluir_orcamento/<int:id>', methods=['POST'])
 def excluir_orcamento(id):
     db = get_db()
     try:
         db.execute('DELETE FROM orcamentos WHERE id = ?', (id,))
         db.commit()
+        recursos().cache.invalidar()
         flash('Orçamento excluído com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao excluir orçamento: {str(e)}', 'error')
     
     return redirect(url_for('budgets'))
 
-@app.route('/excluir_meta/<int:id>', methods=['POST'])
+@rota('/excluir_meta/<int:id>', methods=['POST'])
 def excluir_meta(id):
     db = get_db()
     try:
         db.execute('DELETE FROM metas WHERE id = ?', (id,))
         db.commit()
+        recursos().cache.invalidar()
         flash('Meta excluída com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao excluir meta: {str(e)}', 'error')
     
     return redirect(url_for('goals'))
 
-@app.route('/excluir_categoria/<nome>', methods=['POST'])
+@rota('/excluir_categoria/<nome>', methods=['POST'])
 def excluir_categoria(nome):
     db = get_db()
     try:
         db.execute('DELETE FROM categorias WHERE nome = ?', (nome,))
         db.commit()
+        recursos().cache.invalidar()
         flash('Categoria excluída com sucesso!', 'success')
     except Exception as e:
         flash(f'Erro ao excluir categoria: {str(e)}', 'error')
     
     return redirect(url_for('categories'))
 
+_lock_app = threading.Lock()
+
+def __getattr__(nome):
+    """
+    Cria o app padrão (``app.app``, usado por servidores WSGI) no primeiro
+    acesso: importar o módulo não cria, migra nem abre ``fin_assist.db``.
+    """
+    if nome != 'app':
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    with _lock_app:
+        if 'app' not in globals():
+            globals()['app'] = create_app()
+    return globals()['app']
+
 if __name__ == '__main__':
-    init_db()
-    app.run(debug=True, host='0.0.0.0', port=8000)
+    create_app().run(debug=True, host='0.0.0.0', port=8000)
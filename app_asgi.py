@@ -0,0 +1,92 @@
+"""
+Modo ASGI dos apps: as mesmas rotas, atendidas por um único processo com
+número limitado de threads (requer um servidor ASGI, ex: uvicorn):
+
+    uvicorn app_asgi:app              # simple_app
+    uvicorn app_asgi:app_principal    # app.py
+    uvicorn app_asgi:app_web          # web_app
+
+No simple_app o dashboard (/) roda como corrotina: suas consultas vão em
+paralelo para o executor do AsyncDatabaseManager e o loop de eventos segue
+atendendo outros clientes enquanto o SQLite trabalha. As demais rotas, e
+todas as do app.py e do web_app, são as views WSGI, executadas no executor
+do AppAsgi. ``app_principal`` e ``app_web`` só são criados no primeiro acesso.
+"""
+
+import asyncio
+import os
+import threading
+
+from flask import request
+
+import simple_app
+from src.asgi import AppAsgi
+from src.database_async import AsyncDatabaseManager
+from src.utils import decodificar_cursor, ler_limite
+
+# Threads para as views WSGI e para o banco (cada uma com sua conexão)
+MAX_THREADS = int(os.environ.get('FIN_ASSIST_ASGI_THREADS', 8))
+MAX_WORKERS_BANCO = int(os.environ.get('FIN_ASSIST_ASGI_WORKERS_BANCO', 4))
+
+def criar_app(db=None, max_threads=MAX_THREADS, max_workers_banco=MAX_WORKERS_BANCO):
+    """
+    Monta o app ASGI sobre o DatabaseManager do simple_app (ou ``db``), de
+    modo que cache, métricas e sugestões sejam os mesmos das views WSGI.
+    """
+    db = db or simple_app.db
+    banco = AsyncDatabaseManager(db, max_workers=max_workers_banco)
+    app = AppAsgi(simple_app.app, max_threads=max_threads, registro=db.metricas)
+    app.ao_encerrar(banco.close)
+
+    @app.rota('/')
+    async def index():
+        mes_atual, ano_atual = simple_app.get_mes_ano_atual()
+        cursor = decodificar_cursor(request.args.get('cursor'))
+        limite = ler_limite(request.args.get('limite'))
+
+        async def calcular_dashboard():
+            return simple_app.montar_dashboard(*await asyncio.gather(
+                banco.get_resumo_financeiro(),
+                banco.get_pagina_transacoes(after=cursor, limit=limite),
+                banco.get_categorias(),
+                banco.get_orcamentos(mes_atual, ano_atual),
+                banco.get_metas()
+            ))
+
+        chave = ('index', await banco.get_versao_dados(), mes_atual, ano_atual, cursor, limite)
+        dados = await db.cache.obter_async(chave, calcular_dashboard)
+        return simple_app.renderizar_index(dados, mes_atual, ano_atual, cursor, limite)
+
+    return app
+
+def criar_app_principal(database=None, max_threads=MAX_THREADS):
+    """
+    Monta o app ASGI sobre um app criado por ``app.create_app``, com uma
+    conexão de leitura livre por thread do executor.
+    """
+    import app as app_principal
+
+    aplicacao = app_principal.create_app(database, conexoes=max_threads)
+    app = AppAsgi(aplicacao, max_threads=max_threads)
+    app.ao_encerrar(aplicacao.extensions['fin_assist'].pool.close)
+    return app
+
+def criar_app_web(max_threads=MAX_THREADS):
+    """Monta o app ASGI sobre o web_app e o seu DatabaseManager."""
+    import web_app
+
+    return AppAsgi(web_app.app, max_threads=max_threads, registro=web_app.db.metricas)
+
+app = criar_app()
+
+FABRICAS = {'app_principal': criar_app_principal, 'app_web': criar_app_web}
+_lock_apps = threading.Lock()
+
+def __getattr__(nome):
+    # Importar este módulo não cria os bancos do app.py e do web_app
+    if nome not in FABRICAS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    with _lock_apps:
+        if nome not in globals():
+            globals()[nome] = FABRICAS[nome]()
+    return globals()[nome]
@@ -0,0 +1 @@
+"""Benchmarks do Fin Assist (executar com ``python -m benchmarks.bench``)."""
@@ -0,0 +1,426 @@
+"""
+Benchmark dos métodos do DatabaseManager e das rotas Flask.
+
+Para cada tamanho pedido é gerado (ou reaproveitado) um banco sintético com
+esse número de transações (src/gerador_dados.py). Cada operação é executada
+várias vezes e o resultado (p50/p95, linhas por segundo e pico de memória) é
+gravado em JSON, que pode ser comparado com o de uma execução anterior:
+
+    python -m benchmarks.bench --tamanhos 10000 100000 --saida novo.json
+    python -m benchmarks.bench --saida novo.json --baseline anterior.json
+
+O dashboard do simple_app também é medido sob clientes simultâneos no modo
+WSGI (uma thread por requisição, até ``--threads``) e no modo ASGI
+(app_asgi.py, com o mesmo número de threads), em requisições por segundo,
+e a vazão de add_transacao com um commit por chamada é comparada com a da
+escrita agrupada (``DatabaseManager.ativar_escrita_agrupada``).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import resource
+import sqlite3
+import sys
+import time
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from src.database import DatabaseManager
+from src.gerador_dados import banco_sintetico
+
+TAMANHOS_PADRAO = (10_000, 100_000, 1_000_000)
+CONCORRENCIAS_PADRAO = (1, 8, 32)
+
+def obter_banco(diretorio, quantidade):
+    """Retorna o banco sintético do tamanho pedido, gerando-o se ainda não existir."""
+    inicio = time.perf_counter()
+    caminho = banco_sintetico(diretorio, quantidade, anos=5, semente=42)
+    print(f'Banco com {quantidade} transações: {caminho} ({time.perf_counter() - inicio:.1f}s)',
+          flush=True)
+    return caminho
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    posto = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[posto - 1]
+
+def contar_linhas(resultado):
+    """Número de linhas produzidas por uma operação, quando mensurável."""
+    if isinstance(resultado, (list, tuple)):
+        return len(resultado)
+    if isinstance(resultado, int) and not isinstance(resultado, bool):
+        return resultado
+    return None
+
+def medir(operacao, repeticoes, tempo_maximo):
+    """
+    Executa ``operacao`` até ``repeticoes`` vezes (no mínimo 3) ou até
+    ``tempo_maximo`` segundos e resume os tempos.
+
+    O pico de memória vem de uma execução extra sob tracemalloc, para não
+    distorcer os tempos.
+    """
+    resultado = operacao()  # aquecimento
+    tempos = []
+    limite = time.perf_counter() + tempo_maximo
+    while len(tempos) < repeticoes and (len(tempos) < 3 or time.perf_counter() < limite):
+        inicio = time.perf_counter()
+        resultado = operacao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    operacao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50 = percentil(tempos, 50)
+    linhas = contar_linhas(resultado)
+    medicao = {
+        'execucoes': len(tempos),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(percentil(tempos, 95) * 1000, 3),
+        'linhas': linhas,
+        'linhas_por_segundo': round(linhas / p50) if linhas and p50 else None,
+        'pico_memoria_kb': round(pico / 1024, 1),
+    }
+    if hasattr(resultado, 'data'):
+        medicao['bytes'] = len(resultado.data)
+    return medicao
+
+def requisicao(cliente, url, antes=None):
+    """Operação que faz um GET pelo test client e exige status 200."""
+    def executar():
+        if antes is not None:
+            antes()
+        resposta = cliente.get(url)
+        if resposta.status_code != 200:
+            raise RuntimeError(f'GET {url} retornou {resposta.status_code}')
+        return resposta
+    return executar
+
+def validacao(cliente, url):
+    """Operação que revalida ``url`` com o ETag obtido na primeira execução e exige 304."""
+    cabecalhos = {}
+    def executar():
+        if not cabecalhos:
+            cabecalhos['If-None-Match'] = cliente.get(url).headers['ETag']
+        resposta = cliente.get(url, headers=cabecalhos)
+        if resposta.status_code != 304:
+            raise RuntimeError(f'GET {url} com If-None-Match retornou {resposta.status_code}')
+        return resposta
+    return executar
+
+def operacoes_database(db):
+    """Operações de leitura e escrita do DatabaseManager."""
+    agora = datetime.now()
+    with db.conexao() as conn:
+        total = conn.execute('SELECT COUNT(*) FROM transacoes').fetchone()[0]
+        meio = conn.execute('''
+            SELECT data, id FROM transacoes ORDER BY data DESC, id DESC LIMIT 1 OFFSET ?
+        ''', (total // 2,)).fetchone()
+
+    def inserir_e_excluir():
+        id = db.add_transacao('Despesa', 1234, agora.strftime('%Y-%m-%d'), 'benchmark', 'Outros')
+        db.delete_transacao(id)
+
+    return {
+        'get_categorias': db.get_categorias,
+        'get_resumo_financeiro': db.get_resumo_financeiro,
+        'get_despesas_por_categoria': db.get_despesas_por_categoria,
+        'get_orcamentos(mes, ano)': lambda: db.get_orcamentos(agora.month, agora.year),
+        'get_metas': db.get_metas,
+        'get_transacoes(limit=50)': lambda: db.get_transacoes(limit=50),
+        'get_pagina_transacoes(meio)': lambda: db.get_pagina_transacoes(after=tuple(meio), limit=50)[0],
+        'get_transacoes()': db.get_transacoes,
+        'iter_transacoes(tipo=Despesa)': lambda: sum(1 for _ in db.iter_transacoes(tipo='Despesa')),
+        'add_transacao + delete_transacao': inserir_e_excluir,
+    }
+
+def operacoes_rotas(caminho, db):
+    """Rotas do app.py e do simple_app.py, com os caches esvaziados a cada chamada."""
+    import app as app_principal
+    import simple_app
+
+    aplicacao = app_principal.create_app(str(caminho))
+    simple_app.db.close()
+    simple_app.db = db
+
+    cliente = aplicacao.test_client()
+    cliente_simples = simple_app.app.test_client()
+    return {
+        'app.py GET /': requisicao(cliente, '/', aplicacao.extensions['fin_assist'].cache.invalidar),
+        'app.py GET / (cache)': requisicao(cliente, '/'),
+        'app.py GET / (304)': validacao(cliente, '/'),
+        'app.py GET /transactions': requisicao(cliente, '/transactions'),
+        'app.py GET /transactions?tipo=Despesa': requisicao(cliente, '/transactions?tipo=Despesa'),
+        'app.py GET /transactions (304)': validacao(cliente, '/transactions'),
+        'app.py GET /budgets': requisicao(cliente, '/budgets'),
+        'app.py GET /categories': requisicao(cliente, '/categories'),
+        'simple_app.py GET /': requisicao(cliente_simples, '/', db.cache.invalidar),
+    }
+
+def resumir_carga(latencias, duracao):
+    """Vazão e latências de uma rodada de requisições simultâneas."""
+    return {
+        'requisicoes': len(latencias),
+        'requisicoes_por_segundo': round(len(latencias) / duracao, 1),
+        'p50_ms': round(percentil(latencias, 50) * 1000, 3),
+        'p95_ms': round(percentil(latencias, 95) * 1000, 3),
+    }
+
+def carga_wsgi(app, db, url, clientes, requisicoes, threads):
+    """
+    ``clientes`` threads fazem ``requisicoes`` GETs no total, como em um
+    servidor WSGI com uma thread por requisição e no máximo ``threads``
+    atendendo ao mesmo tempo; a espera por uma thread entra na latência.
+    """
+    from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+    vagas = threading.BoundedSemaphore(threads)
+    restantes = iter(range(requisicoes))
+    latencias = []
+
+    def cliente():
+        while next(restantes, None) is not None:
+            environ = EnvironBuilder(url).get_environ()
+            inicio = time.perf_counter()
+            with vagas:
+                db.cache.invalidar()
+                iterador, status, _ = run_wsgi_app(app, environ, buffered=True)
+            latencias.append(time.perf_counter() - inicio)
+            if not status.startswith('200'):
+                raise RuntimeError(f'GET {url} retornou {status}')
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(clientes) as executor:
+        for futuro in [executor.submit(cliente) for _ in range(clientes)]:
+            futuro.result()
+    return resumir_carga(latencias, time.perf_counter() - inicio)
+
+async def _get_asgi(app, url):
+    """Faz um GET em um app ASGI e retorna o status."""
+    caminho, _, consulta = url.partition('?')
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': caminho, 'root_path': '',
+        'query_string': consulta.encode('latin-1'), 'headers': [],
+        'http_version': '1.1', 'scheme': 'http',
+        'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+    }
+    mensagens = iter([{'type': 'http.request', 'body': b'', 'more_body': False}])
+    status = []
+
+    async def receive():
+        return next(mensagens, {'type': 'http.disconnect'})
+
+    async def send(mensagem):
+        if mensagem['type'] == 'http.response.start':
+            status.append(mensagem['status'])
+
+    await app(scope, receive, send)
+    return status[0]
+
+def carga_asgi(app, db, url, clientes, requisicoes):
+    """``clientes`` corrotinas fazem ``requisicoes`` GETs no total em um único loop."""
+    restantes = iter(range(requisicoes))
+    latencias = []
+
+    async def cliente():
+        while next(restantes, None) is not None:
+            inicio = time.perf_counter()
+            db.cache.invalidar()
+            status = await _get_asgi(app, url)
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                raise RuntimeError(f'GET {url} retornou {status}')
+
+    async def rodada():
+        await asyncio.gather(*(cliente() for _ in range(clientes)))
+
+    inicio = time.perf_counter()
+    asyncio.run(rodada())
+    return resumir_carga(latencias, time.perf_counter() - inicio)
+
+def comparar_modos(db, concorrencias, requisicoes, threads, url='/'):
+    """Mede o dashboard do simple_app nos modos WSGI e ASGI para cada concorrência."""
+    import app_asgi
+    import simple_app
+
+    app_assincrono = app_asgi.criar_app(db, max_threads=threads)
+    modos = {}
+    try:
+        for clientes in concorrencias:
+            for modo, medir_carga in (
+                ('wsgi', lambda: carga_wsgi(simple_app.app, db, url, clientes, requisicoes, threads)),
+                ('asgi', lambda: carga_asgi(app_assincrono, db, url, clientes, requisicoes)),
+            ):
+                medir_carga()  # aquecimento (conexões e threads dos executores)
+                nome = f'{modo} GET {url} ({clientes} clientes)'
+                medicao = modos[nome] = medir_carga()
+                print(f'  {nome:<52} {medicao["requisicoes_por_segundo"]:8.1f} req/s  '
+                      f'p50 {medicao["p50_ms"]:10.3f} ms  p95 {medicao["p95_ms"]:10.3f} ms',
+                      flush=True)
+    finally:
+        app_assincrono.close()
+    return modos
+
+def comparar_escrita(caminho, clientes, insercoes):
+    """
+    Vazão de ``insercoes`` chamadas de add_transacao feitas por ``clientes``
+    threads, com um commit por chamada e com a escrita agrupada. As linhas
+    inseridas são removidas no fim de cada rodada.
+    """
+    data = datetime.now().strftime('%Y-%m-%d')
+    transacao = ('Despesa', 1234, data, 'benchmark escrita', 'Outros')
+    modos = {}
+    for agrupada in (False, True):
+        db = DatabaseManager(str(caminho))
+        if agrupada:
+            db.ativar_escrita_agrupada()
+        restantes = iter(range(insercoes))
+        latencias = []
+
+        def cliente():
+            while next(restantes, None) is not None:
+                inicio = time.perf_counter()
+                db.add_transacao(*transacao)
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(clientes) as executor:
+            for futuro in [executor.submit(cliente) for _ in range(clientes)]:
+                futuro.result()
+        nome = (f'add_transacao {"agrupada" if agrupada else "commit por chamada"} '
+                f'({clientes} clientes)')
+        medicao = modos[nome] = resumir_carga(latencias, time.perf_counter() - inicio)
+        if agrupada:
+            medicao['media_por_lote'] = round(db.escrita.estatisticas()['media_por_lote'], 1)
+        db.execute_query('DELETE FROM transacoes WHERE descricao = ?', (transacao[3],))
+        db.close()
+        print(f'  {nome:<52} {medicao["requisicoes_por_segundo"]:8.1f} ins/s  '
+              f'p50 {medicao["p50_ms"]:10.3f} ms  p95 {medicao["p95_ms"]:10.3f} ms',
+              flush=True)
+    return modos
+
+def executar(tamanhos, diretorio, repeticoes, tempo_maximo,
+             concorrencias=CONCORRENCIAS_PADRAO, requisicoes=200, threads=8, escritas=2000):
+    """Executa todas as operações em cada tamanho e retorna o relatório."""
+    Path(diretorio).mkdir(parents=True, exist_ok=True)
+    # Os apps criam fin_assist.db no diretório atual ao serem importados
+    os.chdir(diretorio)
+    relatorio = {
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'plataforma': platform.platform(),
+        'tamanhos': {},
+    }
+    for quantidade in tamanhos:
+        caminho = obter_banco(diretorio, quantidade)
+        db = DatabaseManager(str(caminho))
+        operacoes = {f'DatabaseManager.{nome}': operacao
+                     for nome, operacao in operacoes_database(db).items()}
+        operacoes.update(operacoes_rotas(caminho, db))
+
+        resultados = {}
+        print(f'\n{quantidade} transações', flush=True)
+        for nome, operacao in operacoes.items():
+            medicao = medir(operacao, repeticoes, tempo_maximo)
+            resultados[nome] = medicao
+            print(f'  {nome:<52} p50 {medicao["p50_ms"]:10.3f} ms  '
+                  f'p95 {medicao["p95_ms"]:10.3f} ms', flush=True)
+        relatorio['tamanhos'][str(quantidade)] = {'operacoes': resultados}
+        if concorrencias:
+            print(f'  WSGI x ASGI, {threads} threads, {requisicoes} requisições por rodada',
+                  flush=True)
+            relatorio['tamanhos'][str(quantidade)]['modos'] = comparar_modos(
+                db, concorrencias, requisicoes, threads)
+        if escritas:
+            print(f'  Commit por chamada x escrita agrupada, {escritas} inserções', flush=True)
+            relatorio['tamanhos'][str(quantidade)]['escrita'] = comparar_escrita(
+                caminho, threads, escritas)
+
+    relatorio['pico_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return relatorio
+
+def comparar(relatorio, baseline, tolerancia):
+    """
+    Compara o p50 de cada operação com o da baseline.
+
+    Returns:
+        list: Operações cujo p50 piorou mais que ``tolerancia`` (fração)
+    """
+    regressoes = []
+    print(f'\nComparação com a baseline de {baseline.get("gerado_em", "?")}')
+    for tamanho, dados in relatorio['tamanhos'].items():
+        anteriores = baseline.get('tamanhos', {}).get(tamanho, {}).get('operacoes', {})
+        for nome, medicao in dados['operacoes'].items():
+            anterior = anteriores.get(nome)
+            if not anterior or not anterior['p50_ms']:
+                continue
+            razao = medicao['p50_ms'] / anterior['p50_ms']
+            marcador = ''
+            if razao > 1 + tolerancia:
+                marcador = '  REGRESSÃO'
+                regressoes.append((tamanho, nome, razao))
+            print(f'  {tamanho:>8} {nome:<52} {anterior["p50_ms"]:10.3f} -> '
+                  f'{medicao["p50_ms"]:10.3f} ms ({razao:5.2f}x){marcador}')
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(TAMANHOS_PADRAO),
+                        help='número de transações de cada banco')
+    parser.add_argument('--dados', default=str(RAIZ / 'benchmarks' / 'dados'),
+                        help='diretório dos bancos gerados (reaproveitados entre execuções)')
+    parser.add_argument('--saida', default=str(RAIZ / 'benchmarks' / 'resultados.json'),
+                        help='arquivo JSON com os resultados')
+    parser.add_argument('--baseline', default=None,
+                        help='JSON de uma execução anterior para comparação')
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help='piora relativa do p50 aceita antes de acusar regressão')
+    parser.add_argument('--repeticoes', type=int, default=30,
+                        help='execuções de cada operação')
+    parser.add_argument('--tempo-maximo', type=float, default=5.0,
+                        help='segundos por operação antes de parar as repetições')
+    parser.add_argument('--concorrencias', type=int, nargs='*', default=list(CONCORRENCIAS_PADRAO),
+                        help='clientes simultâneos na comparação WSGI x ASGI (vazio desliga)')
+    parser.add_argument('--requisicoes', type=int, default=200,
+                        help='requisições por rodada da comparação WSGI x ASGI')
+    parser.add_argument('--threads', type=int, default=8,
+                        help='threads de cada modo na comparação WSGI x ASGI')
+    parser.add_argument('--escritas', type=int, default=2000,
+                        help='inserções por rodada da comparação da escrita agrupada (0 desliga)')
+    args = parser.parse_args(argv)
+
+    saida = Path(args.saida).resolve()
+    baseline = Path(args.baseline).resolve() if args.baseline else None
+    relatorio = executar(args.tamanhos, Path(args.dados).resolve(),
+                         args.repeticoes, args.tempo_maximo,
+                         args.concorrencias, args.requisicoes, args.threads, args.escritas)
+
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(relatorio, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f'\nResultados gravados em {saida}')
+
+    if baseline is not None:
+        regressoes = comparar(
+            relatorio, json.loads(baseline.read_text(encoding='utf-8')), args.tolerancia)
+        if regressoes:
+            print(f'{len(regressoes)} operações mais lentas que a baseline')
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
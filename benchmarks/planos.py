@@ -0,0 +1,245 @@
+"""
+Verificação dos planos de execução de todo o SQL do projeto.
+
+Os métodos do DatabaseManager e as rotas do app.py, simple_app.py e
+web_app.py (incluindo todas as combinações de filtros de /transactions) são
+executados sobre um banco sintético enquanto ``consultas_lentas.coletar()``
+registra cada comando. Em seguida cada comando distinto passa por
+``EXPLAIN QUERY PLAN`` e a verificação falha (código de saída 1) se algum
+comando sobre ``transacoes`` fizer uma varredura completa da tabela ou
+precisar de uma B-tree temporária para ordenar ou agrupar:
+
+    python -m benchmarks.planos
+    python -m benchmarks.planos --transacoes 100000 --detalhes
+
+A mesma verificação roda na suíte de testes (tests/test_planos.py).
+"""
+
+import argparse
+import contextlib
+import itertools
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+from src import consultas_lentas
+from src.database import DatabaseManager
+from src.gerador_dados import gerar_banco
+
+# Comandos que podem varrer transacoes, com o motivo
+PERMITIDOS = (
+    (re.compile(r'^INSERT INTO resumo_mensal .* FROM transacoes GROUP BY'),
+     'reconstrução completa do resumo mensal (manutenção)'),
+    (re.compile(r'^SELECT descricao, categoria, COUNT\(\*\), MAX\(data\) FROM transacoes'),
+     'carga do índice de sugestões, feita uma vez por processo'),
+    (re.compile(r'FROM transacoes_fts .* ORDER BY relevancia'),
+     'ordenação por relevância de no máximo MAX_CANDIDATOS_BUSCA linhas'),
+    (re.compile(r'FROM transacoes_fts .* ORDER BY t\.data DESC'),
+     'exportação dos resultados de uma busca: ordena só as linhas encontradas'),
+)
+
+TABELA_QUENTE = re.compile(r'\btransacoes\b', re.IGNORECASE)
+
+def problemas_do_plano(plano):
+    """Retorna os nós do plano que indicam varredura completa ou ordenação temporária."""
+    problemas = []
+    for linha in plano:
+        no = linha.strip()
+        if no == 'SCAN transacoes':
+            problemas.append(f'varredura completa: {no}')
+        elif no.startswith('USE TEMP B-TREE'):
+            problemas.append(f'B-tree temporária: {no}')
+    return problemas
+
+def exercitar_database(db, hoje):
+    """Chama cada método do DatabaseManager com argumentos realistas."""
+    data = hoje.isoformat()
+    db.get_categorias()
+    transacoes = db.get_transacoes(limit=10)
+    pagina, proximo = db.get_pagina_transacoes(limit=5)
+    db.get_pagina_transacoes(after=proximo, limit=5)
+    db.get_transacoes()
+    for combinacao in itertools.product((None, 'Despesa'), (None, 'Lazer'),
+                                        (None, '2024-01-01'), (None, data)):
+        for _ in db.iter_transacoes(*combinacao):
+            break
+    db.search_transacoes('mercado')
+    db.search_transacoes('farm', {'tipo': 'Despesa', 'categoria': 'Saúde',
+                                  'data_inicio': '2024-01-01', 'data_fim': data})
+    db.sugestoes.sugerir('me')
+    db.get_resumo_financeiro()
+    db.get_despesas_por_categoria()
+    db.get_orcamentos(hoje.month, hoje.year)
+    db.get_orcamentos()
+    db.get_metas()
+
+    id = db.add_transacao('Despesa', 1000, data, 'verificação', 'Outros')
+    db.update_transacao(id, 'Despesa', 2000, data, 'verificação', 'Lazer')
+    db.delete_transacao(id)
+    db.add_transacoes([('Receita', 500, data, 'verificação', 'Outros')])
+    db.add_orcamento('Lazer', 50_000, hoje.month, hoje.year)
+    db.delete_orcamento(-1)
+    db.add_meta('Meta de verificação', 100_000, data, data)
+    meta = db.get_metas()[-1][0]
+    db.update_meta(meta, 'Meta de verificação', 100_000, 10, data, data, 'Em Andamento')
+    db.atualizar_progresso_meta(meta, 20)
+    db.delete_meta(meta)
+    db.reconstruir_resumo_mensal()
+    return transacoes
+
+def exercitar_rotas(caminho, db, hoje):
+    """Faz as requisições de todas as rotas dos três apps sobre o banco ``caminho``."""
+    import app as app_principal
+    import simple_app
+    import web_app
+
+    aplicacao = app_principal.create_app(str(caminho))
+    originais = {modulo: modulo.db for modulo in (simple_app, web_app)}
+    try:
+        for modulo in originais:
+            modulo.db = db
+        _requisitar_rotas(aplicacao, simple_app, web_app, hoje)
+    finally:
+        for modulo, original in originais.items():
+            modulo.db = original
+        aplicacao.extensions['fin_assist'].pool.close()
+
+def _requisitar_rotas(aplicacao, simple_app, web_app, hoje):
+    data = hoje.isoformat()
+    cliente = aplicacao.test_client()
+    cliente.get('/')
+    filtros = itertools.product(('', 'Despesa'), ('', 'Lazer'), ('', '2024-01-01'), ('', data))
+    for tipo, categoria, inicio, fim in filtros:
+        consulta = f'tipo={tipo}&categoria={categoria}&data_inicio={inicio}&data_fim={fim}'
+        cliente.get(f'/transactions?{consulta}&limite=5')
+        cliente.get(f'/transactions?{consulta}&limite=5&cursor={data}:1000000')
+        cliente.get(f'/export/transacoes.csv?{consulta}')
+        cliente.get(f'/export/transacoes.jsonl?{consulta}')
+        cliente.get(f'/export/transacoes.csv?{consulta}&q=mercado')
+    cliente.get('/api/sugestoes?q=me')
+    cliente.get('/api/transacoes?tipo=Despesa&limite=5')
+    cliente.get(f'/api/transacoes?limite=5&cursor={data}:1000000')
+    cliente.get(f'/api/orcamentos?mes={hoje.month}&ano={hoje.year}')
+    cliente.get('/api/metas')
+    cliente.post('/api/transacoes/batch', json=[
+        {'tipo': 'Despesa', 'valor': 10, 'data': data, 'descricao': 'verificação', 'categoria': 'Outros'}])
+    cliente.post('/api/orcamentos', json={
+        'categoria': 'Lazer', 'valor_limite': 500, 'mes': hoje.month, 'ano': hoje.year})
+    cliente.post('/api/metas', json={
+        'descricao': 'Meta', 'valor_alvo': 1000, 'data_inicio': data, 'data_fim': data})
+    cliente.get('/search?q=mercado')
+    cliente.get(f'/search?q=farm&tipo=Despesa&categoria=Saúde&data_inicio=2024-01-01&data_fim={data}')
+    for rota in ('/budgets', '/goals', '/categories'):
+        cliente.get(rota)
+    cliente.post('/adicionar_transacao', data={
+        'tipo': 'Despesa', 'valor': '10,00', 'data': data,
+        'descricao': 'verificação', 'categoria': 'Outros'})
+    cliente.post('/adicionar_orcamento', data={
+        'categoria': 'Lazer', 'valor_limite': '500,00', 'mes': hoje.month, 'ano': hoje.year})
+    cliente.post('/adicionar_meta', data={
+        'descricao': 'Meta', 'valor_alvo': '1000,00', 'data_inicio': data, 'data_fim': data})
+    cliente.post('/atualizar_meta/1', data={'valor_atual': '10,00'})
+    cliente.post('/adicionar_categoria', data={'nome': 'Verificação'})
+    cliente.post('/atualizar_categoria/Verificação', data={'novo_nome': 'Verificada'})
+    cliente.post('/excluir_categoria/Verificada')
+    cliente.post('/excluir_transacao/1')
+    cliente.post('/excluir_orcamento/1')
+    cliente.post('/excluir_meta/1')
+
+    for modulo in (simple_app, web_app):
+        cliente = modulo.app.test_client()
+        cliente.get('/')
+        cliente.get('/api/sugestoes?q=me')
+        cliente.get(f'/?limite=5&cursor={data}:1000000')
+        cliente.get('/export/transacoes.csv?tipo=Despesa')
+
+def coletar_comandos(caminho, hoje):
+    """Executa todo o código que acessa o banco e retorna os comandos distintos."""
+    db = DatabaseManager(str(caminho))
+    try:
+        with consultas_lentas.coletar() as comandos:
+            exercitar_database(db, hoje)
+            exercitar_rotas(caminho, db, hoje)
+    finally:
+        db.close()
+
+    distintos = {}
+    for query, parametros in comandos:
+        sql = ' '.join(query.split())
+        if sql.upper().startswith(consultas_lentas.SEM_PLANO):
+            continue
+        distintos.setdefault(sql, (query, parametros))
+    return distintos
+
+def verificar(caminho, comandos, detalhes=False):
+    """
+    Analisa o plano de cada comando.
+
+    Returns:
+        int: Número de comandos com plano inaceitável
+    """
+    conn = sqlite3.connect(str(caminho))
+    falhas = 0
+    try:
+        for sql, (query, parametros) in sorted(comandos.items()):
+            plano = consultas_lentas.plano_consulta(conn, query, parametros)
+            problemas = problemas_do_plano(plano) if TABELA_QUENTE.search(sql) else []
+            motivo = next((motivo for padrao, motivo in PERMITIDOS if padrao.search(sql)), None)
+            if problemas and motivo is None:
+                falhas += 1
+                situacao = 'FALHA'
+            elif problemas:
+                situacao = 'PERMITIDO'
+            else:
+                situacao = 'OK'
+            if situacao != 'OK' or detalhes:
+                print(f'[{situacao}] {sql}')
+                if motivo and problemas:
+                    print(f'    motivo: {motivo}')
+                for problema in problemas:
+                    print(f'    {problema}')
+                for linha in plano:
+                    print(f'      {linha}')
+    finally:
+        conn.close()
+    return falhas
+
+def verificar_planos(transacoes=20_000, detalhes=False):
+    """
+    Gera um banco sintético temporário e verifica os planos de todo o SQL.
+
+    Returns:
+        Tuple[int, int]: Comandos verificados e comandos com plano inaceitável
+    """
+    hoje = date.today()
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = Path(diretorio) / 'planos.db'
+        gerar_banco(caminho, transacoes, data_final=hoje)
+        comandos = coletar_comandos(caminho, hoje)
+        falhas = verificar(caminho, comandos, detalhes)
+    return len(comandos), falhas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transacoes', type=int, default=20_000,
+                        help='tamanho do banco sintético usado na verificação')
+    parser.add_argument('--detalhes', action='store_true',
+                        help='mostra o plano de todos os comandos, não só os reprovados')
+    args = parser.parse_args(argv)
+
+    # Os apps criam fin_assist.db no diretório atual ao serem importados
+    with tempfile.TemporaryDirectory() as diretorio, contextlib.chdir(diretorio):
+        comandos, falhas = verificar_planos(args.transacoes, args.detalhes)
+
+    print(f'{comandos} comandos verificados, {falhas} com plano inaceitável')
+    return 1 if falhas else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
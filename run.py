@@ -2,10 +2,11 @@
 """
 Script para executar o Fin Assist.
 Execute este arquivo para iniciar a aplicação.
+Use `python run.py --help` para ver os comandos de manutenção.
 """
 
 import sys
-from src.main import main
+from src.cli import main
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,6 @@
+-- Valores monetários (valor, valor_limite, valor_alvo, valor_atual) são
+-- armazenados em centavos
+
 -- Tabela de Categorias
 CREATE TABLE IF NOT EXISTS categorias (
     nome TEXT PRIMARY KEY
@@ -10,15 +13,27 @@ CREATE TABLE IF NOT EXISTS transacoes (
     tipo TEXT NOT NULL CHECK (tipo IN ('Receita', 'Despesa')),
     descricao TEXT NOT NULL,
     categoria TEXT NOT NULL,
-    valor REAL NOT NULL,
+    valor INTEGER NOT NULL,
     FOREIGN KEY (categoria) REFERENCES categorias(nome)
 );
 
+-- Índices para os filtros por tipo, categoria e período
+CREATE INDEX IF NOT EXISTS idx_transacoes_tipo_data_id
+    ON transacoes (tipo, data, id);
+CREATE INDEX IF NOT EXISTS idx_transacoes_categoria_data_id
+    ON transacoes (categoria, data, id);
+CREATE INDEX IF NOT EXISTS idx_transacoes_data_id
+    ON transacoes (data DESC, id DESC);
+
+-- As tabelas resumo_mensal e versao_dados, seus triggers e as migrações de
+-- bancos antigos ficam em src/database.py (atualizar_esquema), chamado
+-- também pelo init_db
+
 -- Tabela de Orçamentos
 CREATE TABLE IF NOT EXISTS orcamentos (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     categoria TEXT NOT NULL,
-    valor_limite REAL NOT NULL,
+    valor_limite INTEGER NOT NULL,
     mes INTEGER NOT NULL CHECK (mes BETWEEN 1 AND 12),
     ano INTEGER NOT NULL,
     FOREIGN KEY (categoria) REFERENCES categorias(nome),
@@ -29,8 +44,8 @@ CREATE TABLE IF NOT EXISTS orcamentos (
 CREATE TABLE IF NOT EXISTS metas (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     descricao TEXT NOT NULL,
-    valor_alvo REAL NOT NULL,
-    valor_atual REAL NOT NULL DEFAULT 0,
+    valor_alvo INTEGER NOT NULL,
+    valor_atual INTEGER NOT NULL DEFAULT 0,
     data_inicio DATE NOT NULL,
     data_fim DATE NOT NULL,
     CHECK (data_fim >= data_inicio),
@@ -1,12 +1,27 @@
-from flask import Flask, request, redirect, url_for, render_template_string, jsonify
+from flask import Flask, Response, request, redirect, url_for, render_template, jsonify
+from src.api import registrar_api
 from src.database import DatabaseManager
+from src.exportador import ler_filtros, gerar_csv, gerar_jsonl
+from src.metricas import instrumentar_app
+from src.sugestoes import registrar_rota_sugestoes
 from src.models import Transacao, ResumoFinanceiro
-from src.utils import validar_valor, validar_data, formatar_valor_monetario
+from src.utils import (
+    validar_valor, validar_data, formatar_valor_monetario, centavos_para_decimal,
+    codificar_cursor, decodificar_cursor, ler_limite
+)
 from datetime import datetime, date
+from functools import cache
 import logging
+import atexit
 
 app = Flask(__name__)
+app.add_template_filter(formatar_valor_monetario, 'moeda')
+app.add_template_filter(centavos_para_decimal, 'reais')
 db = DatabaseManager()
+atexit.register(db.close)
+instrumentar_app(app, db.metricas)
+registrar_rota_sugestoes(app, db.sugestoes)
+registrar_api(app, db.conexao, db.add_transacoes_lote, cache=db.cache)
 
 # Funções auxiliares
 def get_mes_ano_atual():
@@ -262,14 +277,14 @@ TEMPLATE = '''
                     <i class="fas fa-arrow-up text-green-500 mr-2"></i>
                     Receitas
                 </div>
-                <div class="receita">R$ {{ "%.2f"|format(resumo.receitas) }}</div>
+                <div class="receita">{{ resumo.receitas|moeda }}</div>
             </div>
             <div class="card">
                 <div class="card-title">
                     <i class="fas fa-arrow-down text-red-500 mr-2"></i>
                     Despesas
                 </div>
-                <div class="despesa">R$ {{ "%.2f"|format(resumo.despesas) }}</div>
+                <div class="despesa">{{ resumo.despesas|moeda }}</div>
             </div>
             <div class="card">
                 <div class="card-title">
@@ -277,7 +292,7 @@ TEMPLATE = '''
                     Saldo
                 </div>
                 <div class="{{ 'receita' if resumo.saldo >= 0 else 'despesa' }}">
-                    R$ {{ "%.2f"|format(resumo.saldo) }}
+                    {{ resumo.saldo|moeda }}
                 </div>
             </div>
         </div>
@@ -290,7 +305,7 @@ TEMPLATE = '''
                 <div class="p-4 border rounded-lg">
                     <div class="flex justify-between items-center">
                         <span class="font-medium">{{ categoria }}</span>
-                        <span class="text-red-600">R$ {{ "%.2f"|format(total) }}</span>
+                        <span class="text-red-600">{{ total|moeda }}</span>
                     </div>
                 </div>
                 {% endfor %}
@@ -320,9 +335,9 @@ TEMPLATE = '''
                         </form>
                     </div>
                     <div class="mb-2">
-                        <span class="text-gray-600">Limite: R$ {{ "%.2f"|format(orcamento[2]) }}</span>
+                        <span class="text-gray-600">Limite: {{ orcamento[2]|moeda }}</span>
                         <span class="mx-2">|</span>
-                        <span class="text-gray-600">Atual: R$ {{ "%.2f"|format(orcamento[3]) }}</span>
+                        <span class="text-gray-600">Atual: {{ orcamento[3]|moeda }}</span>
                     </div>
                     {% set progresso = calcular_progresso(orcamento[3], orcamento[2]) %}
                     <div class="w-full bg-gray-200 rounded-full h-2.5">
@@ -354,7 +369,7 @@ TEMPLATE = '''
                         <span class="font-medium">{{ meta[1] }}</span>
                         <div class="flex gap-2">
                             <button onclick="abrirEdicaoMeta({{ meta[0] }}, '{{ meta[1] }}', 
-                                {{ meta[2] }}, {{ meta[3] }}, '{{ meta[4] }}', '{{ meta[5] }}', 
+                                {{ meta[2]|reais }}, {{ meta[3]|reais }}, '{{ meta[4] }}', '{{ meta[5] }}', 
                                 '{{ meta[6] }}')" 
                                     class="text-blue-600 hover:text-blue-800">
                                 <i class="fas fa-edit"></i>
@@ -368,9 +383,9 @@ TEMPLATE = '''
                         </div>
                     </div>
                     <div class="mb-2">
-                        <span class="text-gray-600">Meta: R$ {{ "%.2f"|format(meta[2]) }}</span>
+                        <span class="text-gray-600">Meta: {{ meta[2]|moeda }}</span>
                         <span class="mx-2">|</span>
-                        <span class="text-gray-600">Atual: R$ {{ "%.2f"|format(meta[3]) }}</span>
+                        <span class="text-gray-600">Atual: {{ meta[3]|moeda }}</span>
                     </div>
                     <div class="mb-2 text-sm text-gray-600">
                         {{ formatar_data(meta[4]) }} até {{ formatar_data(meta[5]) }}
@@ -605,7 +620,8 @@ TEMPLATE = '''
                 </div>
                 <div class="form-group">
                     <label class="form-label">Descrição</label>
-                    <input type="text" name="descricao" class="form-control" placeholder="Descrição da transação">
+                    <input type="text" name="descricao" class="form-control" placeholder="Descrição da transação"
+                           data-sugestoes="{{ url_for('sugestoes') }}">
                 </div>
                 <div class="text-right">
                     <button type="submit" class="btn">Salvar Transação</button>
@@ -636,7 +652,7 @@ TEMPLATE = '''
                             </span>
                         </td>
                         <td class="{{ 'receita' if transacao[1] == 'Receita' else 'despesa' }}">
-                            R$ {{ "%.2f"|format(transacao[2]) }}
+                            {{ transacao[2]|moeda }}
                         </td>
                         <td>{{ transacao[5] }}</td>
                         <td>{{ transacao[4] }}</td>
@@ -651,6 +667,16 @@ TEMPLATE = '''
                     {% endfor %}
                 </tbody>
             </table>
+            <div class="flex justify-between items-center" style="margin-top: 1rem;">
+                {% if not primeira_pagina %}
+                <a href="{{ url_for('index', limite=limite) }}" class="btn">Primeira página</a>
+                {% else %}
+                <span></span>
+                {% endif %}
+                {% if proximo_cursor %}
+                <a href="{{ url_for('index', cursor=proximo_cursor, limite=limite) }}" class="btn">Próxima página</a>
+                {% endif %}
+            </div>
         </div>
     </main>
 
@@ -784,38 +810,69 @@ TEMPLATE = '''
             }
         });
     </script>
+    <script src="{{ url_for('static', filename='js/sugestoes.js') }}"></script>
 </body>
 </html>
 '''
 
+def montar_dashboard(resumo, pagina, categorias, orcamentos, metas):
+    """Organiza os resultados das consultas do dashboard para o template."""
+    transacoes, proximo = pagina
+    return {
+        'resumo': ResumoFinanceiro.from_dict(resumo),
+        'transacoes': transacoes,
+        'categorias': [cat[0] for cat in categorias],
+        # Orçamentos do mês atual
+        'orcamentos': orcamentos,
+        # Metas ativas
+        'metas': metas,
+        'proximo_cursor': codificar_cursor(*proximo) if proximo else None
+    }
+
+@cache
+def modelo_index():
+    """TEMPLATE compilado uma única vez (render_template_string o recompila a cada chamada)."""
+    return app.jinja_env.from_string(TEMPLATE)
+
+def renderizar_index(dados, mes_atual, ano_atual, cursor, limite):
+    """Renderiza o dashboard; usado também pelo modo ASGI (app_asgi.py)."""
+    return render_template(
+        modelo_index(),
+        mes_atual=mes_atual,
+        ano_atual=ano_atual,
+        limite=limite,
+        primeira_pagina=cursor is None,
+        formatar_data=formatar_data_br,
+        calcular_progresso=calcular_progresso,
+        **dados
+    )
+
 @app.route('/')
 def index():
     """Página principal com dashboard."""
     mes_atual, ano_atual = get_mes_ano_atual()
+    cursor = decodificar_cursor(request.args.get('cursor'))
+    limite = ler_limite(request.args.get('limite'))
     
-    # Dados básicos
-    resumo = db.get_resumo_financeiro()
-    transacoes = db.get_transacoes()
-    categorias = [cat[0] for cat in db.get_categorias()]
+    def calcular_dashboard():
+        return montar_dashboard(
+            db.get_resumo_financeiro(),
+            db.get_pagina_transacoes(after=cursor, limit=limite),
+            db.get_categorias(),
+            db.get_orcamentos(mes_atual, ano_atual),
+            db.get_metas()
+        )
     
-    # Orçamentos do mês atual
-    orcamentos = db.get_orcamentos(mes_atual, ano_atual)
+    # A versão dos dados inclui escritas de outros processos no mesmo arquivo
+    chave = ('index', db.get_versao_dados(), mes_atual, ano_atual, cursor, limite)
+    dados = db.cache.obter(chave, calcular_dashboard)
     
-    # Metas ativas
-    metas = db.get_metas()
-    
-    return render_template_string(
-        TEMPLATE,
-        resumo=ResumoFinanceiro.from_dict(resumo),
-        transacoes=transacoes,
-        categorias=categorias,
-        orcamentos=orcamentos,
-        metas=metas,
-        mes_atual=mes_atual,
-        ano_atual=ano_atual,
-        formatar_data=formatar_data_br,
-        calcular_progresso=calcular_progresso
-    )
+    return renderizar_index(dados, mes_atual, ano_atual, cursor, limite)
+
+@app.route('/cache/estatisticas')
+def estatisticas_cache():
+    """Retorna os contadores do cache do dashboard."""
+    return jsonify(db.cache.estatisticas())
 
 # Rotas para Transações
 @app.route('/adicionar_transacao', methods=['POST'])
@@ -829,7 +886,7 @@ def adicionar_transacao():
         descricao = request.form['descricao']
 
         # Validações
-        valido, valor_float, erro = validar_valor(valor)
+        valido, valor_centavos, erro = validar_valor(valor)
         if not valido:
             return f"Erro: {erro}", 400
 
@@ -838,7 +895,7 @@ def adicionar_transacao():
             return f"Erro: {erro}", 400
 
         # Salva no banco de dados
-        db.add_transacao(tipo, valor_float, data, descricao, categoria)
+        db.add_transacao(tipo, valor_centavos, data, descricao, categoria)
         
         return redirect(url_for('index'))
         
@@ -857,11 +914,11 @@ def adicionar_orcamento():
         ano = int(request.form['ano'])
 
         # Validação do valor
-        valido, valor_float, erro = validar_valor(valor_limite)
+        valido, valor_centavos, erro = validar_valor(valor_limite)
         if not valido:
             return erro, 400
 
-        if db.add_orcamento(categoria, valor_float, mes, ano):
+        if db.add_orcamento(categoria, valor_centavos, mes, ano):
             return redirect(url_for('index'))
         else:
             return "Erro ao salvar orçamento", 500
@@ -891,7 +948,7 @@ def adicionar_meta():
         data_fim = request.form['data_fim']
 
         # Validações
-        valido, valor_float, erro = validar_valor(valor_alvo)
+        valido, valor_centavos, erro = validar_valor(valor_alvo)
         if not valido:
             return erro, 400
 
@@ -903,7 +960,7 @@ def adicionar_meta():
         if not valido:
             return erro, 400
 
-        db.add_meta(descricao, valor_float, data_inicio, data_fim)
+        db.add_meta(descricao, valor_centavos, data_inicio, data_fim)
         return redirect(url_for('index'))
             
     except Exception as e:
@@ -922,15 +979,15 @@ def atualizar_meta(id):
         status = request.form['status']
 
         # Validações
-        valido, valor_alvo_float, erro = validar_valor(valor_alvo)
+        valido, valor_alvo_centavos, erro = validar_valor(valor_alvo)
         if not valido:
             return erro, 400
 
-        valido, valor_atual_float, erro = validar_valor(valor_atual)
+        valido, valor_atual_centavos, erro = validar_valor(valor_atual)
         if not valido:
             return erro, 400
 
-        db.update_meta(id, descricao, valor_alvo_float, valor_atual_float,
+        db.update_meta(id, descricao, valor_alvo_centavos, valor_atual_centavos,
                       data_inicio, data_fim, status)
         return redirect(url_for('index'))
             
@@ -953,11 +1010,11 @@ def atualizar_progresso_meta(id):
     """Atualiza o progresso de uma meta."""
     try:
         valor_atual = request.form['valor_atual']
-        valido, valor_float, erro = validar_valor(valor_atual)
+        valido, valor_centavos, erro = validar_valor(valor_atual)
         if not valido:
             return erro, 400
 
-        db.atualizar_progresso_meta(id, valor_float)
+        db.atualizar_progresso_meta(id, valor_centavos)
         return redirect(url_for('index'))
     except Exception as e:
         logging.error(f"Erro ao atualizar progresso da meta: {e}")
@@ -973,5 +1030,20 @@ def excluir_transacao(id):
         logging.error(f"Erro ao excluir transação: {e}")
         return "Erro ao excluir a transação", 500
 
+# Rotas para Exportação
+@app.route('/export/transacoes.csv')
+def exportar_transacoes_csv():
+    """Exporta as transações filtradas em CSV."""
+    linhas = db.iter_transacoes(**ler_filtros(request.args))
+    return Response(gerar_csv(linhas), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.csv'})
+
+@app.route('/export/transacoes.jsonl')
+def exportar_transacoes_jsonl():
+    """Exporta as transações filtradas em JSON lines."""
+    linhas = db.iter_transacoes(**ler_filtros(request.args))
+    return Response(gerar_jsonl(linhas), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.jsonl'})
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8000, debug=True)
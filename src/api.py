@@ -0,0 +1,407 @@
+"""
+API JSON de transações, orçamentos e metas.
+
+Os POST aceitam um objeto ou uma lista de objetos. Cada registro é validado
+com os validadores de src/utils.py; os válidos são gravados juntos (as
+transações pelo mesmo caminho de escrita do app, ex:
+``DatabaseManager.add_transacoes_lote``) e a resposta traz o resultado de
+cada item, na ordem em que foram enviados:
+
+    POST /api/transacoes/batch
+    [{"tipo": "Despesa", "valor": "12,50", "data": "2024-05-01",
+      "categoria": "Lazer", "descricao": "Cinema"}, ...]
+
+    {"gravados": 1, "rejeitados": 0,
+     "resultados": [{"indice": 0, "ok": true, "id": 42}]}
+
+Com ``?atomico=1`` nada é gravado se algum registro for rejeitado. O status
+é 201 quando todos foram gravados, 422 quando nenhum foi e 200 nos demais
+casos. Valores monetários são recebidos em reais, com no máximo duas casas
+decimais: como número (12.5), texto com ponto decimal ("12.50") ou texto no
+formato dos formulários, com vírgula ("12,50", "R$ 1.234,56"). São
+retornados como texto com ponto decimal ("12.50"), sem passar por ponto
+flutuante.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from .database import filtros_transacoes, gravar_linhas
+from .exportador import ler_filtros
+from .utils import (
+    centavos_para_decimal, codificar_cursor, decodificar_cursor, ler_limite,
+    validar_categoria, validar_data, validar_descricao
+)
+
+# Maior número de registros aceito em uma requisição
+MAX_REGISTROS_LOTE = 1000
+
+TIPOS_TRANSACAO = ('Receita', 'Despesa')
+
+# Maior valor em centavos que cabe em um INTEGER do SQLite
+MAX_VALOR_CENTAVOS = 2**63 - 1
+
+# Maior valor em reais aceito, comparado antes da conversão para centavos
+MAX_VALOR_REAIS = centavos_para_decimal(MAX_VALOR_CENTAVOS)
+
+def _em_reais(centavos):
+    """Formata centavos como texto em reais com ponto decimal (ex: '1234.56')."""
+    return str(centavos_para_decimal(centavos or 0))
+
+def _ler_reais(valor):
+    """
+    Converte o valor recebido em reais, sem arredondar.
+
+    Números e textos sem vírgula usam ponto decimal ("1234.56"); textos com
+    vírgula seguem o formato dos formulários ("R$ 1.234,56"). Assim "12.50"
+    vale doze reais e cinquenta, e não mil duzentos e cinquenta.
+
+    Raises:
+        ValueError: Se não for um número finito com no máximo duas casas decimais
+    """
+    if isinstance(valor, bool) or not isinstance(valor, (int, float, str)):
+        raise ValueError(valor)
+    texto = str(valor).replace('R$', '').strip()
+    if ',' in texto:
+        texto = texto.replace('.', '').replace(',', '.')
+    try:
+        reais = Decimal(texto)
+    except InvalidOperation:
+        raise ValueError(valor) from None
+    if not reais.is_finite() or reais.normalize().as_tuple().exponent < -2:
+        raise ValueError(valor)
+    return reais
+
+def _validar_valor(registro, campo, erros, permitir_zero=False):
+    """Valida um campo monetário e retorna o valor em centavos (ou None)."""
+    if registro.get(campo) is None:
+        erros[campo] = "Campo obrigatório"
+        return None
+    try:
+        reais = _ler_reais(registro[campo])
+    except ValueError:
+        erros[campo] = "Valor inválido. Use um número com até duas casas, como 1234.56 ou '1.234,56'"
+        return None
+    if reais < 0 and permitir_zero:
+        erros[campo] = "O valor não pode ser negativo"
+        return None
+    if reais <= 0 and not permitir_zero:
+        erros[campo] = "O valor deve ser maior que zero"
+        return None
+    if reais > MAX_VALOR_REAIS:
+        erros[campo] = "Valor acima do máximo permitido"
+        return None
+    return int(reais.scaleb(2))
+
+def _validar_texto(registro, campo, validar, erros, obrigatorio=True):
+    """Valida um campo de texto com ``validar`` e o retorna sem espaços nas pontas."""
+    texto = registro.get(campo)
+    if texto is None or (isinstance(texto, str) and not texto.strip()):
+        if obrigatorio:
+            erros[campo] = "Campo obrigatório"
+        return ''
+    if not isinstance(texto, str):
+        erros[campo] = "Esperado um texto"
+        return ''
+    valido, erro = validar(texto)
+    if not valido:
+        erros[campo] = erro
+    return texto.strip()
+
+def _ler_data(texto):
+    """Lê uma data em AAAA-MM-DD ou dd/mm/aaaa, sem restringir datas futuras."""
+    formato = "%d/%m/%Y" if '/' in texto else "%Y-%m-%d"
+    return datetime.strptime(texto, formato).date()
+
+def _validar_data_meta(registro, campo, erros):
+    texto = registro.get(campo)
+    if not isinstance(texto, str) or not texto.strip():
+        erros[campo] = "Campo obrigatório"
+        return None
+    try:
+        return _ler_data(texto.strip())
+    except ValueError:
+        erros[campo] = "Data inválida. Use o formato dd/mm/aaaa"
+        return None
+
+def validar_transacao(registro):
+    """
+    Valida uma transação recebida pela API.
+
+    Returns:
+        Tuple[Optional[tuple], dict]: (tipo, valor em centavos, data,
+        descricao, categoria) e os erros por campo; os dados só valem sem erros
+    """
+    erros = {}
+    tipo = registro.get('tipo')
+    if tipo not in TIPOS_TRANSACAO:
+        erros['tipo'] = "Tipo deve ser 'Receita' ou 'Despesa'"
+    valor = _validar_valor(registro, 'valor', erros)
+    data = registro.get('data')
+    if not isinstance(data, str) or not data.strip():
+        erros['data'] = "Campo obrigatório"
+    else:
+        valida, data, erro = validar_data(data.strip())
+        if not valida:
+            erros['data'] = erro
+    categoria = _validar_texto(registro, 'categoria', validar_categoria, erros)
+    descricao = _validar_texto(registro, 'descricao', validar_descricao, erros, obrigatorio=False)
+    if erros:
+        return None, erros
+    return (tipo, valor, data.strftime("%Y-%m-%d"), descricao, categoria), erros
+
+def validar_orcamento(registro):
+    """
+    Valida um orçamento recebido pela API.
+
+    Returns:
+        Tuple[Optional[tuple], dict]: (categoria, valor_limite em centavos,
+        mes, ano) e os erros por campo
+    """
+    erros = {}
+    categoria = _validar_texto(registro, 'categoria', validar_categoria, erros)
+    valor_limite = _validar_valor(registro, 'valor_limite', erros)
+    mes, ano = registro.get('mes'), registro.get('ano')
+    if isinstance(mes, bool) or not isinstance(mes, int) or not 1 <= mes <= 12:
+        erros['mes'] = "Mês deve ser um número de 1 a 12"
+    if isinstance(ano, bool) or not isinstance(ano, int) or not 1900 <= ano <= 9999:
+        erros['ano'] = "Ano deve ser um número com quatro dígitos"
+    if erros:
+        return None, erros
+    return (categoria, valor_limite, mes, ano), erros
+
+def validar_meta(registro):
+    """
+    Valida uma meta recebida pela API.
+
+    Returns:
+        Tuple[Optional[tuple], dict]: (descricao, valor_alvo, valor_atual,
+        data_inicio, data_fim) e os erros por campo
+    """
+    erros = {}
+    descricao = _validar_texto(registro, 'descricao', validar_descricao, erros)
+    valor_alvo = _validar_valor(registro, 'valor_alvo', erros)
+    valor_atual = 0
+    if registro.get('valor_atual') is not None:
+        valor_atual = _validar_valor(registro, 'valor_atual', erros, permitir_zero=True)
+    data_inicio = _validar_data_meta(registro, 'data_inicio', erros)
+    data_fim = _validar_data_meta(registro, 'data_fim', erros)
+    if data_inicio and data_fim and data_fim < data_inicio:
+        erros['data_fim'] = "A data final deve ser igual ou posterior à inicial"
+    if erros:
+        return None, erros
+    return (descricao, valor_alvo, valor_atual,
+            data_inicio.isoformat(), data_fim.isoformat()), erros
+
+def _gravar_orcamento(conn, dados):
+    # Um orçamento por categoria e mês: reenviar atualiza o limite
+    return conn.execute('''
+        INSERT INTO orcamentos (categoria, valor_limite, mes, ano)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (categoria, mes, ano) DO UPDATE SET valor_limite = excluded.valor_limite
+        RETURNING id
+    ''', dados).fetchone()[0]
+
+def _inserir_meta(conn, dados):
+    return conn.execute('''
+        INSERT INTO metas (descricao, valor_alvo, valor_atual, data_inicio, data_fim)
+        VALUES (?, ?, ?, ?, ?)
+    ''', dados).lastrowid
+
+def gravar_lote(registros, validar, gravar, atomico=False):
+    """
+    Valida ``registros`` e grava os válidos com ``gravar``.
+
+    Args:
+        registros (list): Objetos recebidos
+        validar (Callable[[dict], tuple]): Retorna (dados, erros) de um registro
+        gravar (Callable[[list, bool], list]): Grava a lista de dados válidos
+            (no modo atômico se o segundo argumento for verdadeiro) e retorna,
+            para cada um, o id, a exceção que o recusou ou None se foi desfeito
+            pelo erro de outro (ver ``gravar_linhas``)
+        atomico (bool): Grava tudo ou nada
+
+    Returns:
+        Tuple[List[dict], List[tuple]]: Resultado de cada registro, na ordem
+        recebida, e os dados gravados
+    """
+    resultados = [None] * len(registros)
+    validos = []
+    for indice, registro in enumerate(registros):
+        if isinstance(registro, dict):
+            dados, erros = validar(registro)
+        else:
+            dados, erros = None, {'registro': "Esperado um objeto JSON"}
+        if erros:
+            resultados[indice] = {'indice': indice, 'ok': False, 'erros': erros}
+        else:
+            validos.append((indice, dados))
+
+    gravados = []
+    if validos and (not atomico or len(validos) == len(registros)):
+        ids = gravar([dados for _, dados in validos], atomico)
+        for (indice, dados), id in zip(validos, ids):
+            if isinstance(id, Exception):
+                resultados[indice] = {'indice': indice, 'ok': False, 'erros': {'registro': str(id)}}
+            elif id is not None:
+                resultados[indice] = {'indice': indice, 'ok': True, 'id': id}
+                gravados.append(dados)
+
+    for indice, _ in validos:
+        if resultados[indice] is None:
+            resultados[indice] = {'indice': indice, 'ok': False,
+                                  'erros': {'lote': "Não gravado: o lote tem registros inválidos"}}
+    return resultados, gravados
+
+def registrar_api(app, conexao, gravar_transacoes, conexao_leitura=None, cache=None,
+                  prefixo='/api'):
+    """
+    Expõe a API JSON em um app Flask.
+
+    Args:
+        app (flask.Flask): App onde as rotas são registradas
+        conexao (Callable[[], ContextManager[sqlite3.Connection]]): Empresta
+            uma conexão de escrita (ex: ``DatabaseManager.conexao``), usada
+            para orçamentos e metas
+        gravar_transacoes (Callable[[list, bool], list]): Grava as transações
+            validadas, com a assinatura de ``DatabaseManager.add_transacoes_lote``,
+            que também atualiza cache, métricas e sugestões
+        conexao_leitura (Optional[Callable]): Idem a ``conexao``, para os GET
+            (padrão: ``conexao``)
+        cache (Optional[CacheResultados]): Invalidado depois de gravar
+            orçamentos ou metas
+        prefixo (str): Início do caminho das rotas
+    """
+    from flask import jsonify, request
+
+    conexao_leitura = conexao_leitura or conexao
+
+    def consultar(query, params=()):
+        with conexao_leitura() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            try:
+                return cursor.execute(query, params).fetchall()
+            finally:
+                cursor.close()
+
+    def ler_registros(lista_obrigatoria):
+        """Retorna a lista de registros do corpo, ou uma resposta de erro."""
+        corpo = request.get_json(silent=True)
+        if isinstance(corpo, dict) and not lista_obrigatoria:
+            corpo = [corpo]
+        if not isinstance(corpo, list):
+            esperado = "uma lista" if lista_obrigatoria else "um objeto ou uma lista"
+            return None, (jsonify({'erro': f"O corpo deve ser JSON com {esperado} de registros"}), 400)
+        if len(corpo) > MAX_REGISTROS_LOTE:
+            return None, (jsonify({'erro': f"No máximo {MAX_REGISTROS_LOTE} registros por requisição"}), 413)
+        return corpo, None
+
+    def gravar_com(gravar_linha):
+        """Gravação de orçamentos e metas pela conexão de escrita."""
+        def gravar(linhas, atomico):
+            with conexao() as conn:
+                resultados = gravar_linhas(conn, gravar_linha, linhas, atomico)
+            if cache is not None and any(isinstance(r, int) for r in resultados):
+                cache.invalidar()
+            return resultados
+        return gravar
+
+    def responder_lote(validar, gravar, lista_obrigatoria=False):
+        registros, erro = ler_registros(lista_obrigatoria)
+        if erro:
+            return erro
+        atomico = request.args.get('atomico', '').lower() in ('1', 'true', 'sim')
+        resultados, gravados = gravar_lote(registros, validar, gravar, atomico)
+        rejeitados = len(registros) - len(gravados)
+        status = 201 if not rejeitados else 200 if gravados else 422
+        return jsonify({'gravados': len(gravados), 'rejeitados': rejeitados,
+                        'resultados': resultados}), status
+
+    def listar_transacoes():
+        clausula, params = filtros_transacoes(**ler_filtros(request.args))
+        cursor = decodificar_cursor(request.args.get('cursor'))
+        limite = ler_limite(request.args.get('limite'))
+        query = f'''
+            SELECT id, data, tipo, valor, categoria, descricao
+            FROM transacoes
+            WHERE 1=1{clausula}
+        '''
+        if cursor:
+            query += ' AND (data, id) < (?, ?)'
+            params.extend(cursor)
+        # Uma linha a mais indica se existe próxima página
+        query += ' ORDER BY data DESC, id DESC LIMIT ?'
+        params.append(limite + 1)
+        linhas = consultar(query, params)
+        proximo = None
+        if len(linhas) > limite:
+            linhas = linhas[:limite]
+            proximo = codificar_cursor(linhas[-1][1], linhas[-1][0])
+        transacoes = [
+            {'id': id, 'data': data, 'tipo': tipo, 'valor': _em_reais(valor),
+             'categoria': categoria, 'descricao': descricao}
+            for id, data, tipo, valor, categoria, descricao in linhas
+        ]
+        return jsonify({'transacoes': transacoes, 'proximo_cursor': proximo})
+
+    def criar_transacoes():
+        return responder_lote(validar_transacao, gravar_transacoes)
+
+    def criar_transacoes_lote():
+        return responder_lote(validar_transacao, gravar_transacoes, lista_obrigatoria=True)
+
+    def listar_orcamentos():
+        hoje = date.today()
+        mes = request.args.get('mes', type=int) or hoje.month
+        ano = request.args.get('ano', type=int) or hoje.year
+        linhas = consultar('''
+            SELECT o.id, o.categoria, o.valor_limite,
+                   COALESCE(r.total, 0) as valor_atual
+            FROM orcamentos o
+            LEFT JOIN resumo_mensal r
+                ON r.ano = o.ano AND r.mes = o.mes
+                AND r.tipo = 'Despesa' AND r.categoria = o.categoria
+            WHERE o.mes = ? AND o.ano = ?
+        ''', (mes, ano))
+        orcamentos = [
+            {'id': id, 'categoria': categoria, 'mes': mes, 'ano': ano,
+             'valor_limite': _em_reais(limite), 'valor_atual': _em_reais(atual)}
+            for id, categoria, limite, atual in linhas
+        ]
+        return jsonify({'orcamentos': orcamentos})
+
+    def criar_orcamentos():
+        return responder_lote(validar_orcamento, gravar_com(_gravar_orcamento))
+
+    def listar_metas():
+        linhas = consultar('''
+            SELECT id, descricao, valor_alvo, valor_atual, data_inicio, data_fim,
+                   CASE
+                       WHEN valor_atual >= valor_alvo THEN 'Concluída'
+                       ELSE 'Em Andamento'
+                   END as status
+            FROM metas
+            ORDER BY data_fim ASC
+        ''')
+        metas = [
+            {'id': id, 'descricao': descricao, 'valor_alvo': _em_reais(alvo),
+             'valor_atual': _em_reais(atual), 'data_inicio': inicio, 'data_fim': fim,
+             'status': status}
+            for id, descricao, alvo, atual, inicio, fim, status in linhas
+        ]
+        return jsonify({'metas': metas})
+
+    def criar_metas():
+        return responder_lote(validar_meta, gravar_com(_inserir_meta))
+
+    for regra, endpoint, view, metodos in (
+        ('/transacoes', 'api_listar_transacoes', listar_transacoes, ['GET']),
+        ('/transacoes', 'api_criar_transacoes', criar_transacoes, ['POST']),
+        ('/transacoes/batch', 'api_criar_transacoes_lote', criar_transacoes_lote, ['POST']),
+        ('/orcamentos', 'api_listar_orcamentos', listar_orcamentos, ['GET']),
+        ('/orcamentos', 'api_criar_orcamentos', criar_orcamentos, ['POST']),
+        ('/metas', 'api_listar_metas', listar_metas, ['GET']),
+        ('/metas', 'api_criar_metas', criar_metas, ['POST']),
+    ):
+        app.add_url_rule(prefixo + regra, endpoint, view, methods=metodos)
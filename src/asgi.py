@@ -0,0 +1,185 @@
+"""
+Adaptador ASGI para os apps Flask, sem dependências além do próprio Flask.
+
+``AppAsgi`` recebe as requisições de um servidor ASGI (ex: uvicorn). Rotas
+registradas com ``rota`` são corrotinas executadas no loop de eventos, com o
+contexto de requisição do Flask ativo (``request``, ``url_for`` e templates
+funcionam normalmente). As demais são repassadas às views WSGI do app em um
+executor de tamanho fixo, com a resposta enviada em blocos à medida que é
+produzida. Assim um único processo mantém muitos clientes abertos com um
+número limitado de threads.
+"""
+
+import asyncio
+import io
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def _cabecalhos_asgi(cabecalhos):
+    return [(nome.lower().encode('latin-1'), str(valor).encode('latin-1'))
+            for nome, valor in cabecalhos]
+
+def montar_environ(scope, corpo):
+    """Converte o escopo HTTP do ASGI em um environ WSGI (PEP 3333)."""
+    servidor = scope.get('server') or ('localhost', 80)
+    cliente = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(servidor[0]),
+        'SERVER_PORT': str(servidor[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': cliente[0],
+        'REMOTE_PORT': str(cliente[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(corpo),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for nome, valor in scope.get('headers', []):
+        nome = nome.decode('latin-1').upper().replace('-', '_')
+        valor = valor.decode('latin-1')
+        if nome in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            chave = nome
+        else:
+            chave = f'HTTP_{nome}'
+        environ[chave] = f"{environ[chave]},{valor}" if chave in environ else valor
+    # O corpo já foi lido por inteiro (inclusive quando veio em chunks)
+    environ['CONTENT_LENGTH'] = str(len(corpo))
+    return environ
+
+async def _ler_corpo(receive):
+    partes = []
+    while True:
+        mensagem = await receive()
+        if mensagem['type'] == 'http.disconnect':
+            break
+        partes.append(mensagem.get('body', b''))
+        if not mensagem.get('more_body', False):
+            break
+    return b''.join(partes)
+
+class AppAsgi:
+    """
+    Aplicação ASGI que atende as rotas de um app Flask.
+
+    Args:
+        app_wsgi (flask.Flask): App cujas views atendem as rotas não assíncronas
+        max_threads (int): Threads do executor das views WSGI
+        registro (Optional[RegistroMetricas]): Onde registrar a latência das
+            rotas assíncronas (as WSGI já são medidas pelo instrumentar_app)
+    """
+
+    def __init__(self, app_wsgi, max_threads=8, registro=None):
+        self.app_wsgi = app_wsgi
+        self.max_threads = max_threads
+        self.registro = registro
+        self._rotas = {}
+        self._ao_encerrar = []
+        self._executor = ThreadPoolExecutor(max_threads, thread_name_prefix='fin_assist_wsgi')
+
+    def rota(self, caminho, metodos=('GET',)):
+        """Registra uma corrotina sem argumentos para ``caminho``; o retorno é o de uma view Flask."""
+        def registrar(funcao):
+            for metodo in metodos:
+                self._rotas[(metodo, caminho)] = funcao
+            return funcao
+        return registrar
+
+    def ao_encerrar(self, funcao):
+        """Agenda ``funcao()`` para o encerramento do servidor (evento lifespan)."""
+        self._ao_encerrar.append(funcao)
+        return funcao
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for funcao in reversed(self._ao_encerrar):
+            try:
+                funcao()
+            except Exception as e:
+                logging.error(f"Erro ao encerrar o app ASGI: {e}")
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            corpo = await _ler_corpo(receive)
+            environ = montar_environ(scope, corpo)
+            rota = self._rotas.get((scope['method'], scope['path']))
+            if rota is not None:
+                await self._atender_rota(rota, environ, send)
+            else:
+                await self._atender_wsgi(environ, send)
+        else:
+            raise NotImplementedError(f"Tipo de escopo ASGI não suportado: {scope['type']}")
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(None, self.close)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _atender_rota(self, rota, environ, send):
+        inicio = time.perf_counter()
+        with self.app_wsgi.request_context(environ) as contexto:
+            try:
+                resposta = self.app_wsgi.make_response(await rota())
+            except Exception as e:
+                logging.error(f"Erro na rota assíncrona {contexto.request.path}: {e}", exc_info=True)
+                resposta = self.app_wsgi.make_response(("Erro interno", 500))
+            corpo = resposta.get_data()
+            cabecalhos = list(resposta.headers.items())
+        await send({'type': 'http.response.start', 'status': resposta.status_code,
+                    'headers': _cabecalhos_asgi(cabecalhos)})
+        await send({'type': 'http.response.body', 'body': corpo})
+        if self.registro is not None:
+            self.registro.registrar_requisicao(
+                environ['PATH_INFO'], environ['REQUEST_METHOD'],
+                resposta.status_code, time.perf_counter() - inicio)
+
+    async def _atender_wsgi(self, environ, send):
+        loop = asyncio.get_running_loop()
+        inicio = {}
+
+        def start_response(status, cabecalhos, exc_info=None):
+            inicio['status'] = int(status.split(' ', 1)[0])
+            inicio['cabecalhos'] = cabecalhos
+            return inicio.setdefault('escritos', []).append
+
+        def iniciar():
+            resultado = self.app_wsgi(environ, start_response)
+            try:
+                iterador = iter(resultado)
+                # start_response pode ser chamado só ao produzir o primeiro bloco
+                return resultado, iterador, next(iterador, None)
+            except BaseException:
+                # O iterável precisa ser fechado mesmo assim (PEP 3333)
+                if hasattr(resultado, 'close'):
+                    resultado.close()
+                raise
+
+        resultado, iterador, bloco = await loop.run_in_executor(self._executor, iniciar)
+        try:
+            await send({'type': 'http.response.start', 'status': inicio['status'],
+                        'headers': _cabecalhos_asgi(inicio['cabecalhos'])})
+            for escrito in inicio.get('escritos', ()):
+                await send({'type': 'http.response.body', 'body': escrito, 'more_body': True})
+            while bloco is not None:
+                if bloco:
+                    await send({'type': 'http.response.body', 'body': bloco, 'more_body': True})
+                bloco = await loop.run_in_executor(self._executor, next, iterador, None)
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(resultado, 'close'):
+                await loop.run_in_executor(self._executor, resultado.close)
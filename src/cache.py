@@ -0,0 +1,101 @@
+"""
+Cache em memória de resultados calculados a partir do banco.
+
+Cada entrada é associada à versão dos dados no momento do cálculo. Toda
+escrita chama ``invalidar()``, que incrementa a versão, de modo que nenhuma
+leitura posterior encontra um resultado calculado antes da escrita.
+A versão é local ao processo: escritas feitas por outros processos no mesmo
+arquivo não são percebidas, por isso as chaves dos resultados incluem o
+contador de escritas do banco (``DatabaseManager.get_versao_dados``).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+class CacheResultados:
+    """
+    Cache LRU de resultados versionado pelas escritas no banco.
+    
+    Attributes:
+        max_itens (int): Número máximo de resultados mantidos
+        hits (int): Consultas atendidas pelo cache
+        misses (int): Consultas que precisaram recalcular o resultado
+    """
+
+    def __init__(self, max_itens: int = 128):
+        self.max_itens = max_itens
+        self.hits = 0
+        self.misses = 0
+        self._versao = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def versao(self) -> int:
+        """Versão atual dos dados."""
+        return self._versao
+
+    def invalidar(self):
+        """Registra uma escrita: incrementa a versão e descarta os resultados."""
+        with self._lock:
+            self._versao += 1
+            self._itens.clear()
+
+    def obter(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Retorna o resultado em cache para ``chave`` ou o calcula.
+        
+        Args:
+            chave (Hashable): Identificador do resultado (ex: rota e parâmetros)
+            calcular (Callable[[], Any]): Função que calcula o resultado
+            
+        Returns:
+            Any: Resultado em cache ou recém-calculado
+        """
+        versao, entrada = self._procurar(chave)
+        if entrada is not None:
+            return entrada[0]
+        resultado = calcular()
+        self._guardar(versao, chave, resultado)
+        return resultado
+
+    async def obter_async(self, chave: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        """Como ``obter``, para quando o cálculo é uma corrotina (``calcular()`` é aguardado)."""
+        versao, entrada = self._procurar(chave)
+        if entrada is not None:
+            return entrada[0]
+        resultado = await calcular()
+        self._guardar(versao, chave, resultado)
+        return resultado
+
+    def _procurar(self, chave):
+        """Retorna a versão atual e a entrada em cache (ou None), contando hit ou miss."""
+        with self._lock:
+            versao = self._versao
+            entrada = self._itens.get((versao, chave))
+            if entrada is not None:
+                self._itens.move_to_end((versao, chave))
+                self.hits += 1
+            else:
+                self.misses += 1
+            return versao, entrada
+
+    def _guardar(self, versao, chave, resultado):
+        with self._lock:
+            # Resultados calculados durante uma escrita já nascem obsoletos
+            if versao == self._versao:
+                self._itens[(versao, chave)] = (resultado,)
+                while len(self._itens) > self.max_itens:
+                    self._itens.popitem(last=False)
+
+    def estatisticas(self) -> dict:
+        """Retorna os contadores do cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'itens': len(self._itens),
+                'max_itens': self.max_itens,
+                'versao': self._versao
+            }
@@ -0,0 +1,154 @@
+"""
+Linha de comando do Fin Assist.
+
+Sem subcomando, inicia a aplicação desktop; os subcomandos executam tarefas
+de manutenção sobre o banco de dados.
+"""
+
+import argparse
+import logging
+import sys
+
+def cmd_reconstruir_resumo(args):
+    """Recalcula a tabela resumo_mensal de um banco existente."""
+    from .database import DatabaseManager
+
+    with DatabaseManager(args.db) as db:
+        db.reconstruir_resumo_mensal()
+    print(f"Resumo mensal reconstruído em {args.db}")
+    return 0
+
+def cmd_importar(args):
+    """Importa transações de um arquivo CSV."""
+    from .database import DatabaseManager
+    from .importador import importar_csv
+
+    with DatabaseManager(args.db) as db:
+        resultado = importar_csv(
+            db, args.arquivo,
+            arquivo_rejeitos=args.rejeitos,
+            tamanho_lote=args.lote,
+            delimitador=args.delimitador,
+            encoding=args.encoding
+        )
+    print(f"{resultado.importadas} transações importadas, "
+          f"{resultado.rejeitadas} rejeitadas em {resultado.segundos:.1f}s "
+          f"({resultado.linhas_por_segundo:.0f} linhas/s)")
+    return 0 if resultado.rejeitadas == 0 else 2
+
+def cmd_gerar_dados(args):
+    """Gera um banco com dados sintéticos determinísticos."""
+    from .gerador_dados import gerar_banco
+
+    resultado = gerar_banco(
+        args.db, args.transacoes,
+        anos=args.anos,
+        semente=args.semente,
+        data_final=args.ate,
+        esquema=args.esquema,
+        tamanho_lote=args.lote
+    )
+    print(f"{resultado.transacoes} transações, {resultado.orcamentos} orçamentos e "
+          f"{resultado.metas} metas gerados em {resultado.segundos:.1f}s "
+          f"({resultado.linhas_por_segundo:.0f} linhas/s)")
+    return 0
+
+def cmd_servir(args):
+    """Serve um dos apps web com vários processos e threads."""
+    from .servidor import servir
+
+    return servir(args.app, args.host, args.porta, args.workers, args.threads)
+
+def _data(valor):
+    """Converte AAAA-MM-DD para date (tipo de argumento do argparse)."""
+    from datetime import date
+
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida: {valor!r} (use AAAA-MM-DD)")
+
+def criar_parser():
+    """Cria o parser de argumentos com todos os subcomandos."""
+    parser = argparse.ArgumentParser(
+        prog="run.py",
+        description="Fin Assist - Assistente Financeiro Virtual"
+    )
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="mostra o tempo de cada fase até a primeira janela")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    reconstruir = subparsers.add_parser(
+        "reconstruir-resumo",
+        help="recalcula a tabela resumo_mensal a partir das transações"
+    )
+    reconstruir.add_argument("--db", default="fin_assist.db",
+                             help="arquivo do banco de dados")
+    reconstruir.set_defaults(func=cmd_reconstruir_resumo)
+
+    importar = subparsers.add_parser(
+        "importar",
+        help="importa transações de um extrato em CSV"
+    )
+    importar.add_argument("arquivo", help="arquivo CSV com as colunas data, tipo, valor, categoria, descricao")
+    importar.add_argument("--db", default="fin_assist.db",
+                          help="arquivo do banco de dados")
+    importar.add_argument("--rejeitos", default=None,
+                          help="arquivo para as linhas inválidas (padrão: <arquivo>.rejeitos.csv)")
+    importar.add_argument("--lote", type=int, default=5000,
+                          help="linhas gravadas por transação do banco")
+    importar.add_argument("--delimitador", default=None,
+                          help="delimitador do CSV (detectado automaticamente)")
+    importar.add_argument("--encoding", default="utf-8-sig",
+                          help="codificação do arquivo")
+    importar.set_defaults(func=cmd_importar)
+
+    gerar = subparsers.add_parser(
+        "gerar-dados",
+        help="preenche um banco com dados sintéticos determinísticos"
+    )
+    gerar.add_argument("--db", default="fin_assist.db",
+                       help="arquivo do banco de dados (criado se não existir)")
+    gerar.add_argument("--transacoes", type=int, default=100_000,
+                       help="número aproximado de transações")
+    gerar.add_argument("--anos", type=int, default=3,
+                       help="anos cobertos pelas transações")
+    gerar.add_argument("--semente", type=int, default=42,
+                       help="semente do gerador; a mesma semente gera os mesmos dados")
+    gerar.add_argument("--ate", type=_data, default=None,
+                       help="última data gerada, AAAA-MM-DD (padrão: hoje)")
+    gerar.add_argument("--esquema", choices=("database", "sql"), default="database",
+                       help="cria as tabelas pelo DatabaseManager ou pelo schema.sql")
+    gerar.add_argument("--lote", type=int, default=50_000,
+                       help="linhas por chamada de executemany")
+    gerar.set_defaults(func=cmd_gerar_dados)
+
+    servidor = subparsers.add_parser(
+        "servir",
+        help="serve um app web com processos pré-criados (pre-fork) e threads"
+    )
+    servidor.add_argument("--app", choices=("app", "simple_app", "web_app"), default="app",
+                          help="app a servir (módulo na raiz do projeto)")
+    servidor.add_argument("--host", default="0.0.0.0",
+                          help="endereço de escuta")
+    servidor.add_argument("--porta", type=int, default=8000,
+                          help="porta de escuta")
+    servidor.add_argument("--workers", type=int, default=None,
+                          help="processos que atendem requisições (padrão: um por núcleo)")
+    servidor.add_argument("--threads", type=int, default=8,
+                          help="threads (e conexões ao banco) de cada processo")
+    servidor.set_defaults(func=cmd_servir)
+
+    return parser
+
+def main(argv=None):
+    """Ponto de entrada da linha de comando."""
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+
+    if args.comando is None:
+        from .main import main as iniciar_desktop
+        return iniciar_desktop(profile_startup=args.profile_startup)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(args.func(args))
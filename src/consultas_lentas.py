@@ -0,0 +1,253 @@
+"""
+Registro de consultas lentas com o plano de execução.
+
+Conexões abertas com ``factory=ConexaoRastreada`` medem cada comando, somando
+o tempo do ``execute`` e dos ``fetch*``; na iteração direta sobre o cursor só
+o ``execute`` (a busca da primeira linha) é medido, para não pesar em cada
+linha. Um comando que passa de ``limite_ms`` é gravado, com parâmetros,
+duração e a saída de ``EXPLAIN QUERY PLAN``, em um log rotativo próprio
+(``logs/consultas_lentas.log``). O plano só é calculado para comandos lentos,
+então o custo para os demais é o de poucas leituras de relógio.
+
+O limite padrão vem da variável de ambiente ``FIN_ASSIST_CONSULTA_LENTA_MS``
+(100 ms se ausente) e pode ser alterado com ``configurar``; zero ou negativo
+desliga o registro.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+LIMITE_PADRAO_MS = float(os.environ.get('FIN_ASSIST_CONSULTA_LENTA_MS', 100))
+ARQUIVO_PADRAO = Path('logs') / 'consultas_lentas.log'
+MAX_BYTES_PADRAO = 5 * 1024 * 1024
+BACKUPS_PADRAO = 5
+
+# Tamanho máximo da representação dos parâmetros no log
+MAX_PARAMETROS = 500
+
+# Comandos sem plano de execução
+SEM_PLANO = ('PRAGMA', 'CREATE', 'DROP', 'ALTER', 'BEGIN', 'COMMIT', 'END', 'ROLLBACK',
+             'SAVEPOINT', 'RELEASE', 'EXPLAIN', 'VACUUM', 'ANALYZE', 'ATTACH', 'DETACH', 'REINDEX')
+
+logger = logging.getLogger('fin_assist.consultas_lentas')
+logger.propagate = False
+
+_config = {
+    'limite': LIMITE_PADRAO_MS / 1000,
+    'arquivo': ARQUIVO_PADRAO,
+    'max_bytes': MAX_BYTES_PADRAO,
+    'backups': BACKUPS_PADRAO,
+}
+_lock = threading.Lock()
+_handler = None
+# Lista que recebe (query, parametros) de cada execute enquanto coletar() estiver ativo
+_coleta = None
+
+def configurar(limite_ms=None, arquivo=None, max_bytes=None, backups=None):
+    """
+    Altera o limite e o destino do registro de consultas lentas.
+
+    Args:
+        limite_ms (Optional[float]): Duração a partir da qual a consulta é
+            registrada; zero ou negativo desliga o registro
+        arquivo (Optional[str]): Arquivo do log rotativo
+        max_bytes (Optional[int]): Tamanho de cada arquivo antes da rotação
+        backups (Optional[int]): Arquivos antigos mantidos
+    """
+    global _handler
+    with _lock:
+        if limite_ms is not None:
+            _config['limite'] = limite_ms / 1000
+        for chave, valor in (('arquivo', arquivo), ('max_bytes', max_bytes), ('backups', backups)):
+            if valor is not None:
+                _config[chave] = Path(valor) if chave == 'arquivo' else valor
+                # O handler é recriado com a nova configuração no próximo registro
+                if _handler is not None:
+                    logger.removeHandler(_handler)
+                    _handler.close()
+                    _handler = None
+
+@contextmanager
+def coletar():
+    """
+    Reúne os comandos executados por conexões rastreadas durante o bloco ``with``.
+
+    Yields:
+        list: Pares (query, parametros), na ordem de execução
+    """
+    global _coleta
+    anterior, _coleta = _coleta, []
+    try:
+        yield _coleta
+    finally:
+        _coleta = anterior
+
+def limite_ms():
+    """Retorna o limite atual, em milissegundos."""
+    return _config['limite'] * 1000
+
+def _obter_logger():
+    """Cria o arquivo de log apenas quando a primeira consulta lenta aparece."""
+    global _handler
+    with _lock:
+        if _handler is None:
+            arquivo = _config['arquivo']
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            _handler = RotatingFileHandler(
+                arquivo, maxBytes=_config['max_bytes'],
+                backupCount=_config['backups'], encoding='utf-8'
+            )
+            _handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+            logger.addHandler(_handler)
+            logger.setLevel(logging.WARNING)
+    return logger
+
+def plano_consulta(conn, query, parametros=()):
+    """
+    Retorna a saída de EXPLAIN QUERY PLAN como linhas indentadas pela árvore.
+
+    Args:
+        conn (sqlite3.Connection): Conexão onde a consulta seria executada
+        query (str): Comando SQL
+        parametros: Parâmetros do comando
+
+    Returns:
+        List[str]: Uma linha por nó do plano (ex: 'SEARCH transacoes USING INDEX ...')
+    """
+    cursor = sqlite3.Cursor(conn)
+    cursor.row_factory = None
+    try:
+        linhas = cursor.execute(f"EXPLAIN QUERY PLAN {query}", parametros or ()).fetchall()
+    finally:
+        cursor.close()
+    profundidade = {0: -1}
+    plano = []
+    for id, pai, _, detalhe in linhas:
+        profundidade[id] = profundidade.get(pai, -1) + 1
+        plano.append('  ' * profundidade[id] + detalhe)
+    return plano
+
+def _registrar(conn, query, parametros, segundos, linhas_lote=None):
+    """Grava uma consulta lenta com o plano de execução, quando houver."""
+    sql = ' '.join(query.split())
+    entrada = [f"{segundos * 1000:.1f} ms: {sql}"]
+    if linhas_lote is not None:
+        entrada.append(f"  executemany com {linhas_lote} linhas")
+    elif parametros:
+        texto = repr(tuple(parametros) if isinstance(parametros, list) else parametros)
+        if len(texto) > MAX_PARAMETROS:
+            texto = texto[:MAX_PARAMETROS] + '...'
+        entrada.append(f"  parâmetros: {texto}")
+    if linhas_lote is None and not sql.upper().startswith(SEM_PLANO):
+        try:
+            entrada.append("  plano:")
+            entrada.extend(f"    {linha}" for linha in plano_consulta(conn, query, parametros))
+        except sqlite3.Error as e:
+            entrada[-1] = f"  plano indisponível: {e}"
+    _obter_logger().warning('\n'.join(entrada))
+
+class CursorRastreado(sqlite3.Cursor):
+    """Cursor que acumula o tempo do comando atual e registra se ele for lento."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._comando = None
+
+    def _iniciar(self, query, parametros, linhas_lote=None):
+        self._finalizar()
+        self._comando = [query, parametros, 0.0, linhas_lote]
+
+    def _somar(self, inicio):
+        if self._comando is not None:
+            self._comando[2] += time.perf_counter() - inicio
+
+    def _finalizar(self):
+        """Registra o comando atual se ele passou do limite."""
+        comando, self._comando = self._comando, None
+        if comando is None:
+            return
+        query, parametros, segundos, linhas_lote = comando
+        limite = _config['limite']
+        if 0 < limite <= segundos:
+            try:
+                _registrar(self.connection, query, parametros, segundos, linhas_lote)
+            except Exception as e:
+                logging.error(f"Erro ao registrar consulta lenta: {e}")
+
+    def execute(self, query, parametros=()):
+        if _coleta is not None:
+            _coleta.append((query, parametros))
+        self._iniciar(query, parametros)
+        inicio = time.perf_counter()
+        try:
+            super().execute(query, parametros)
+        finally:
+            self._somar(inicio)
+        if self.description is None:
+            # Comandos sem resultado terminam no execute
+            self._finalizar()
+        return self
+
+    def executemany(self, query, sequencia):
+        self._finalizar()
+        inicio = time.perf_counter()
+        try:
+            super().executemany(query, sequencia)
+        finally:
+            segundos = time.perf_counter() - inicio
+        self._comando = [query, (), segundos, self.rowcount]
+        self._finalizar()
+        return self
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        linha = super().fetchone()
+        self._somar(inicio)
+        if linha is None:
+            self._finalizar()
+        return linha
+
+    def fetchmany(self, size=None):
+        inicio = time.perf_counter()
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._somar(inicio)
+        if not linhas:
+            self._finalizar()
+        return linhas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        linhas = super().fetchall()
+        self._somar(inicio)
+        self._finalizar()
+        return linhas
+
+    def close(self):
+        self._finalizar()
+        super().close()
+
+    def __del__(self):
+        # Cursores iterados ou abandonados antes do fim também são avaliados
+        try:
+            self._finalizar()
+        except Exception:
+            pass
+
+class ConexaoRastreada(sqlite3.Connection):
+    """Conexão cujos cursores registram as consultas lentas (use como ``factory``)."""
+
+    def cursor(self, factory=CursorRastreado):
+        return super().cursor(factory)
+
+    # Connection.execute cria um sqlite3.Cursor comum, sem passar por cursor()
+    def execute(self, query, parametros=()):
+        return self.cursor().execute(query, parametros)
+
+    def executemany(self, query, sequencia):
+        return self.cursor().executemany(query, sequencia)
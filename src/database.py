@@ -1,23 +1,791 @@
+import os
 import sqlite3
 import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
+from .cache import CacheResultados
+from .consultas_lentas import ConexaoRastreada
+from .escrita_agrupada import FilaEscrita
+from .metricas import RegistroMetricas
+from .sugestoes import CONSULTA_DESCRICOES, IndiceSugestoes
+
+# PRAGMAs aplicados uma única vez em cada conexão do pool
+PRAGMAS_CONEXAO = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -20000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+)
+
+# Garantia extra das conexões abertas com mode=ro
+PRAGMAS_SOMENTE_LEITURA = (
+    "PRAGMA query_only = ON",
+)
+
+# Versão do esquema gravada em PRAGMA user_version
+#   1: valores monetários em centavos (INTEGER)
+#   2: índices de tipo e categoria terminando em (data, id), na ordem da listagem
+VERSAO_ESQUEMA = 2
+
+# Índices substituídos na versão 2
+INDICES_OBSOLETOS = ('idx_transacoes_tipo_data', 'idx_transacoes_categoria_tipo_data')
+
+# Colunas monetárias de cada tabela, armazenadas em centavos
+COLUNAS_MONETARIAS = {
+    'transacoes': ('valor',),
+    'orcamentos': ('valor_limite',),
+    'metas': ('valor_alvo', 'valor_atual'),
+}
+
+# Totais por mês/tipo/categoria mantidos pelos triggers de transacoes.
+# O ano e o mês vêm dos primeiros caracteres da data ISO (YYYY-MM-DD).
+RESUMO_MENSAL_DDL = (
+    '''
+    CREATE TABLE IF NOT EXISTS resumo_mensal (
+        ano INTEGER NOT NULL,
+        mes INTEGER NOT NULL,
+        tipo TEXT NOT NULL,
+        categoria TEXT NOT NULL,
+        total INTEGER NOT NULL DEFAULT 0,
+        contagem INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (ano, mes, tipo, categoria)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_resumo_mensal_insert
+    AFTER INSERT ON transacoes
+    BEGIN
+        INSERT INTO resumo_mensal (ano, mes, tipo, categoria, total, contagem)
+        VALUES (CAST(substr(NEW.data, 1, 4) AS INTEGER),
+                CAST(substr(NEW.data, 6, 2) AS INTEGER),
+                NEW.tipo, NEW.categoria, NEW.valor, 1)
+        ON CONFLICT (ano, mes, tipo, categoria)
+        DO UPDATE SET total = total + excluded.total,
+                      contagem = contagem + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_resumo_mensal_delete
+    AFTER DELETE ON transacoes
+    BEGIN
+        UPDATE resumo_mensal
+        SET total = total - OLD.valor, contagem = contagem - 1
+        WHERE ano = CAST(substr(OLD.data, 1, 4) AS INTEGER)
+        AND mes = CAST(substr(OLD.data, 6, 2) AS INTEGER)
+        AND tipo = OLD.tipo AND categoria = OLD.categoria;
+        DELETE FROM resumo_mensal
+        WHERE ano = CAST(substr(OLD.data, 1, 4) AS INTEGER)
+        AND mes = CAST(substr(OLD.data, 6, 2) AS INTEGER)
+        AND tipo = OLD.tipo AND categoria = OLD.categoria
+        AND contagem <= 0;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_resumo_mensal_update
+    AFTER UPDATE OF tipo, valor, data, categoria ON transacoes
+    BEGIN
+        UPDATE resumo_mensal
+        SET total = total - OLD.valor, contagem = contagem - 1
+        WHERE ano = CAST(substr(OLD.data, 1, 4) AS INTEGER)
+        AND mes = CAST(substr(OLD.data, 6, 2) AS INTEGER)
+        AND tipo = OLD.tipo AND categoria = OLD.categoria;
+        DELETE FROM resumo_mensal
+        WHERE ano = CAST(substr(OLD.data, 1, 4) AS INTEGER)
+        AND mes = CAST(substr(OLD.data, 6, 2) AS INTEGER)
+        AND tipo = OLD.tipo AND categoria = OLD.categoria
+        AND contagem <= 0;
+        INSERT INTO resumo_mensal (ano, mes, tipo, categoria, total, contagem)
+        VALUES (CAST(substr(NEW.data, 1, 4) AS INTEGER),
+                CAST(substr(NEW.data, 6, 2) AS INTEGER),
+                NEW.tipo, NEW.categoria, NEW.valor, 1)
+        ON CONFLICT (ano, mes, tipo, categoria)
+        DO UPDATE SET total = total + excluded.total,
+                      contagem = contagem + 1;
+    END
+    ''',
+)
+
+# Índice de texto completo das descrições (FTS5 com conteúdo externo: só o
+# índice invertido é guardado, o texto continua em transacoes). Os triggers
+# mantêm o índice em dia; prefix='2 3' acelera buscas pelo início da palavra.
+BUSCA_DDL = (
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS transacoes_fts USING fts5(
+        descricao,
+        content = 'transacoes',
+        content_rowid = 'id',
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_transacoes_fts_insert
+    AFTER INSERT ON transacoes
+    BEGIN
+        INSERT INTO transacoes_fts (rowid, descricao) VALUES (NEW.id, NEW.descricao);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_transacoes_fts_delete
+    AFTER DELETE ON transacoes
+    BEGIN
+        INSERT INTO transacoes_fts (transacoes_fts, rowid, descricao)
+        VALUES ('delete', OLD.id, OLD.descricao);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_transacoes_fts_update
+    AFTER UPDATE OF descricao ON transacoes
+    BEGIN
+        INSERT INTO transacoes_fts (transacoes_fts, rowid, descricao)
+        VALUES ('delete', OLD.id, OLD.descricao);
+        INSERT INTO transacoes_fts (rowid, descricao) VALUES (NEW.id, NEW.descricao);
+    END
+    ''',
+)
+
+# Contador global de escritas, usado para validar páginas em cache (ETag)
+# sem consultar os dados: todo INSERT, UPDATE ou DELETE nestas tabelas, feito
+# por qualquer conexão ou processo, incrementa a versão e registra o momento.
+TABELAS_VERSIONADAS = ('transacoes', 'orcamentos', 'metas', 'categorias')
+
+REGISTRAR_ALTERACAO = '''
+    UPDATE versao_dados
+    SET versao = versao + 1, alterado_em = CAST(strftime('%s', 'now') AS INTEGER)
+    WHERE id = 1
+'''
+
+VERSAO_DADOS_DDL = (
+    '''
+    CREATE TABLE IF NOT EXISTS versao_dados (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        versao INTEGER NOT NULL,
+        alterado_em INTEGER NOT NULL
+    )
+    ''',
+    '''
+    INSERT OR IGNORE INTO versao_dados (id, versao, alterado_em)
+    VALUES (1, 0, CAST(strftime('%s', 'now') AS INTEGER))
+    ''',
+) + tuple(
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{operacao.lower()}
+    AFTER {operacao} ON {tabela}
+    BEGIN
+        {REGISTRAR_ALTERACAO.strip()};
+    END
+    '''
+    for tabela in TABELAS_VERSIONADAS
+    for operacao in ('INSERT', 'UPDATE', 'DELETE')
+)
+
+def _consultar(conn, query, parameters=()):
+    """Executa uma consulta retornando tuplas, qualquer que seja o row_factory da conexão."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(query, parameters)
+
+def _migrar_para_centavos(conn, tabela, colunas):
+    """
+    Recria ``tabela`` trocando as colunas REAL em reais por INTEGER em centavos.
+
+    Segue o procedimento de ALTER TABLE genérico do SQLite: a nova tabela é
+    criada a partir do SQL original, os dados são copiados convertidos e a
+    tabela antiga é substituída. Índices e triggers são recriados pelo
+    chamador.
+    """
+    sql = _consultar(
+        conn, "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (tabela,)
+    ).fetchone()[0]
+    temporaria = f"{tabela}_centavos"
+    for coluna in colunas:
+        sql = re.sub(rf'\b{coluna}\s+REAL\b', f'{coluna} INTEGER', sql, flags=re.IGNORECASE)
+    sql = re.sub(rf'^\s*CREATE TABLE\s+(IF NOT EXISTS\s+)?{tabela}\b',
+                 f'CREATE TABLE {temporaria}', sql, flags=re.IGNORECASE)
+    conn.execute(sql)
+
+    nomes = [linha[1] for linha in _consultar(conn, f"PRAGMA table_info({tabela})")]
+    selecao = [
+        f"CAST(ROUND({nome} * 100) AS INTEGER)" if nome in colunas else nome
+        for nome in nomes
+    ]
+    conn.execute(
+        f"INSERT INTO {temporaria} ({', '.join(nomes)}) "
+        f"SELECT {', '.join(selecao)} FROM {tabela}"
+    )
+    conn.execute(f"DROP TABLE {tabela}")
+    conn.execute(f"ALTER TABLE {temporaria} RENAME TO {tabela}")
+
+def migrar_esquema(conn):
+    """
+    Atualiza bancos criados por versões anteriores até ``VERSAO_ESQUEMA``.
+
+    Deve ser chamada depois da criação das tabelas e antes da criação de
+    índices e triggers, que são descartados quando uma tabela é recriada.
+    O chamador é responsável pelo commit.
+    """
+    versao = _consultar(conn, "PRAGMA user_version").fetchone()[0]
+    if versao >= VERSAO_ESQUEMA:
+        return
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    if versao < 1:
+        for tabela, colunas in COLUNAS_MONETARIAS.items():
+            tipos = {linha[1]: linha[2].upper()
+                     for linha in _consultar(conn, f"PRAGMA table_info({tabela})")}
+            reais = tuple(c for c in colunas if tipos.get(c) == 'REAL')
+            if reais:
+                logging.info(f"Migrando {tabela} para valores em centavos")
+                _migrar_para_centavos(conn, tabela, reais)
+        # O resumo guardava totais em reais; é recriado a partir das transações
+        conn.execute("DROP TABLE IF EXISTS resumo_mensal")
+    if versao < 2:
+        # Recriados por atualizar_esquema com as novas colunas
+        for indice in INDICES_OBSOLETOS:
+            conn.execute(f"DROP INDEX IF EXISTS {indice}")
+    conn.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+# Índices para os filtros por tipo, categoria e período. Todos terminam em
+# (data, id) para que a listagem (ORDER BY data DESC, id DESC) saia na ordem
+# do índice, sem ordenação temporária; os totais vêm de resumo_mensal e não
+# precisam de valor no índice (ver benchmarks/planos.py)
+INDICES_DDL = (
+    '''
+    CREATE INDEX IF NOT EXISTS idx_transacoes_tipo_data_id
+    ON transacoes (tipo, data, id)
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_transacoes_categoria_data_id
+    ON transacoes (categoria, data, id)
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_transacoes_data_id
+    ON transacoes (data DESC, id DESC)
+    ''',
+)
+
+def reconstruir_resumo_mensal(conn):
+    """Recalcula toda a tabela resumo_mensal a partir de transacoes."""
+    conn.execute("DELETE FROM resumo_mensal")
+    conn.execute('''
+        INSERT INTO resumo_mensal (ano, mes, tipo, categoria, total, contagem)
+        SELECT CAST(substr(data, 1, 4) AS INTEGER),
+               CAST(substr(data, 6, 2) AS INTEGER),
+               tipo, categoria, SUM(valor), COUNT(*)
+        FROM transacoes
+        GROUP BY 1, 2, 3, 4
+    ''')
+    registrar_alteracao(conn)
+
+def garantir_resumo_mensal(conn):
+    """
+    Cria a tabela resumo_mensal e seus triggers caso ainda não existam.
+
+    Em bancos criados antes da tabela, o resumo é preenchido a partir das
+    transações já existentes. O chamador é responsável pelo commit.
+    """
+    existia = _consultar(
+        conn, "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'resumo_mensal'"
+    ).fetchone()
+    for comando in RESUMO_MENSAL_DDL:
+        conn.execute(comando)
+    if not existia:
+        reconstruir_resumo_mensal(conn)
+
+def reconstruir_busca(conn):
+    """Recria todo o índice de texto completo a partir de transacoes."""
+    conn.execute("INSERT INTO transacoes_fts (transacoes_fts) VALUES ('rebuild')")
+
+def garantir_busca(conn):
+    """
+    Cria o índice de texto completo e seus triggers caso ainda não existam.
+
+    Em bancos criados antes do índice, as descrições existentes são
+    indexadas. O chamador é responsável pelo commit.
+    """
+    existia = _consultar(
+        conn, "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transacoes_fts'"
+    ).fetchone()
+    for comando in BUSCA_DDL:
+        conn.execute(comando)
+    if not existia:
+        reconstruir_busca(conn)
+
+def garantir_versao_dados(conn):
+    """Cria a tabela versao_dados e seus triggers caso ainda não existam."""
+    for comando in VERSAO_DADOS_DDL:
+        conn.execute(comando)
+
+def registrar_alteracao(conn):
+    """
+    Incrementa a versão dos dados sem passar pelos triggers, para escritas
+    feitas com eles desativados ou em tabelas derivadas (ex: resumo_mensal).
+    """
+    conn.execute(REGISTRAR_ALTERACAO)
+
+def versao_dados(conn):
+    """
+    Retorna a versão atual dos dados.
+
+    Returns:
+        Tuple[int, int]: (versão, momento da última escrita em segundos Unix)
+    """
+    return tuple(_consultar(conn, "SELECT versao, alterado_em FROM versao_dados WHERE id = 1").fetchone())
+
+def expressao_busca(texto):
+    """
+    Converte o texto digitado em uma expressão FTS5 segura.
+
+    Cada palavra vira um termo entre aspas com busca por prefixo, e todos
+    precisam aparecer na descrição: 'mercado ext' -> '"mercado"* "ext"*'.
+    Operadores e aspas digitados pelo usuário são tratados como texto.
+
+    Returns:
+        Optional[str]: Expressão para MATCH, ou None se não houver palavras
+    """
+    palavras = re.findall(r'\w+', texto or '')
+    if not palavras:
+        return None
+    return ' '.join(f'"{palavra}"*' for palavra in palavras)
+
+# Calcular o bm25 custa uma chamada por documento encontrado; termos muito
+# comuns chegam a dezenas de milhares de linhas. A ordenação por relevância
+# considera só as ocorrências mais recentes, o que mantém a busca em poucos
+# milissegundos em qualquer tamanho de banco
+MAX_CANDIDATOS_BUSCA = 2000
+
+INSERIR_TRANSACAO = '''
+    INSERT INTO transacoes (tipo, valor, data, descricao, categoria)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+def gravar_linhas(conn, gravar, linhas, atomico=False):
+    """
+    Grava cada linha com ``gravar(conn, linha)`` em uma única transação do banco.
+
+    Um erro em uma linha (ex: restrição violada) desfaz só o comando dela e
+    as demais seguem; com ``atomico`` o primeiro erro desfaz todas.
+
+    Args:
+        conn (sqlite3.Connection): Conexão de escrita
+        gravar (Callable[[Connection, tuple], int]): Grava uma linha e retorna o id
+        linhas (Sequence[tuple]): Linhas a gravar
+        atomico (bool): Grava tudo ou nada
+
+    Returns:
+        list: Para cada linha, o id gravado ou a exceção que a recusou; no
+        modo atômico, None nas linhas desfeitas pelo erro de outra
+    """
+    resultados = []
+    with conn:
+        for indice, linha in enumerate(linhas):
+            try:
+                resultados.append(gravar(conn, linha))
+            except (sqlite3.Error, OverflowError) as e:
+                if atomico:
+                    conn.rollback()
+                    resultados = [None] * len(linhas)
+                    resultados[indice] = e
+                    return resultados
+                if not conn.in_transaction and any(
+                        not isinstance(r, Exception) for r in resultados):
+                    # O SQLite desfez a transação inteira (ex: disco cheio)
+                    raise
+                resultados.append(e)
+    return resultados
+
+def _inserir_transacao(conn, transacao):
+    return conn.execute(INSERIR_TRANSACAO, transacao).lastrowid
+
+def inserir_transacoes(conn, transacoes, atomico=False):
+    """
+    Insere transações (tipo, valor em centavos, data, descricao, categoria)
+    com ``gravar_linhas``, retornando o resultado de cada uma.
+    """
+    return gravar_linhas(conn, _inserir_transacao, transacoes, atomico)
+
+def consulta_busca(colunas, clausula=''):
+    """
+    Monta a consulta de busca textual ordenada por relevância.
+
+    Os parâmetros são, em ordem: a expressão de expressao_busca, os dos
+    filtros de ``clausula``, MAX_CANDIDATOS_BUSCA e o limite de linhas.
+
+    Args:
+        colunas (str): Colunas de transacoes retornadas, separadas por vírgula
+        clausula (str): Condições de filtros_transacoes
+    """
+    return f'''
+        SELECT {colunas}
+        FROM (
+            SELECT t.*, transacoes_fts.rank AS relevancia
+            FROM transacoes_fts
+            JOIN transacoes t ON t.id = transacoes_fts.rowid
+            WHERE transacoes_fts MATCH ?{clausula}
+            ORDER BY transacoes_fts.rowid DESC
+            LIMIT ?
+        )
+        ORDER BY relevancia, data DESC, id DESC
+        LIMIT ?
+    '''
+
+def filtros_transacoes(tipo=None, categoria=None, data_inicio=None, data_fim=None):
+    """
+    Monta a cláusula WHERE dos filtros da listagem de transações.
+
+    Returns:
+        Tuple[str, list]: Condições iniciadas por ' AND ' e seus parâmetros
+    """
+    clausula = ''
+    params = []
+    if tipo:
+        clausula += ' AND tipo = ?'
+        params.append(tipo)
+    if categoria:
+        clausula += ' AND categoria = ?'
+        params.append(categoria)
+    if data_inicio:
+        clausula += ' AND data >= ?'
+        params.append(data_inicio)
+    if data_fim:
+        clausula += ' AND data <= ?'
+        params.append(data_fim)
+    return clausula, params
+
+def iterar_consulta(conn, query, parameters=(), tamanho_lote=1000):
+    """Executa uma consulta e produz as linhas em blocos de ``fetchmany``."""
+    cursor = conn.execute(query, parameters)
+    try:
+        while True:
+            linhas = cursor.fetchmany(tamanho_lote)
+            if not linhas:
+                break
+            yield from linhas
+    finally:
+        cursor.close()
+
+# Tabelas, índices e triggers criados por init_database e atualizar_esquema
+OBJETOS_ESQUEMA = frozenset({
+    'transacoes', 'orcamentos', 'metas', 'categorias', 'resumo_mensal',
+    'idx_transacoes_tipo_data_id', 'idx_transacoes_categoria_data_id',
+    'idx_transacoes_data_id',
+    'trg_resumo_mensal_insert', 'trg_resumo_mensal_delete', 'trg_resumo_mensal_update',
+    'transacoes_fts',
+    'trg_transacoes_fts_insert', 'trg_transacoes_fts_delete', 'trg_transacoes_fts_update',
+    'versao_dados',
+    *(f'trg_versao_{tabela}_{operacao}' for tabela in TABELAS_VERSIONADAS
+      for operacao in ('insert', 'update', 'delete')),
+})
+
+def esquema_atualizado(conn):
+    """
+    Indica se o banco já está na versão atual com todos os objetos criados.
+
+    Custa duas leituras do catálogo, contra as dezenas de comandos DDL da
+    inicialização completa.
+    """
+    versao = _consultar(conn, "PRAGMA user_version").fetchone()[0]
+    if versao != VERSAO_ESQUEMA:
+        return False
+    nomes = {linha[0] for linha in _consultar(conn, "SELECT name FROM sqlite_master")}
+    return OBJETOS_ESQUEMA <= nomes
+
+def atualizar_esquema(conn):
+    """
+    Aplica migrações pendentes e garante índices, versão dos dados, resumo
+    mensal, busca e triggers.
+
+    Supõe que as tabelas principais já existem. O chamador é responsável
+    pelo commit.
+    """
+    migrar_esquema(conn)
+    for comando in INDICES_DDL:
+        conn.execute(comando)
+    garantir_versao_dados(conn)
+    garantir_resumo_mensal(conn)
+    garantir_busca(conn)
+
+def abrir_conexao(db_file, somente_leitura=False):
+    """
+    Abre uma conexão rastreada com os PRAGMAs do pool.
+
+    Args:
+        db_file (str): Caminho do arquivo SQLite
+        somente_leitura (bool): Abre com ``mode=ro``; o arquivo precisa existir
+            e o modo de journal (WAL) já deve ter sido definido por uma
+            conexão de escrita
+
+    Returns:
+        sqlite3.Connection: Conexão utilizável por qualquer thread
+    """
+    if somente_leitura:
+        uri = f"{Path(db_file).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, factory=ConexaoRastreada)
+        # O journal_mode é gravado no arquivo e não pode ser alterado aqui
+        pragmas = tuple(p for p in PRAGMAS_CONEXAO if 'journal_mode' not in p) + PRAGMAS_SOMENTE_LEITURA
+    else:
+        conn = sqlite3.connect(db_file, check_same_thread=False, factory=ConexaoRastreada)
+        pragmas = PRAGMAS_CONEXAO
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+class PoolConexoes:
+    """
+    Conexões reaproveitadas entre as requisições de um processo web.
+
+    Há dois grupos: somente leitura (rotas GET) e leitura e escrita. Uma
+    conexão devolvida continua aberta, com o esquema e o cache de páginas
+    já carregados, até ``tamanho`` por grupo; as excedentes são fechadas.
+    O pool pertence ao processo que o usa: depois de um fork o filho
+    descarta as conexões herdadas (sem fechá-las, pois são do pai) e abre
+    as suas.
+
+    Args:
+        db_file (str): Caminho do arquivo SQLite
+        tamanho (int): Conexões livres mantidas por grupo (ex: threads do worker)
+        limite (Optional[int]): Máximo de conexões abertas por grupo, fora as
+            reservadas; acima dele ``emprestar`` espera uma ser devolvida
+        timeout (float): Segundos de espera por uma conexão livre quando o
+            limite foi atingido
+    """
+
+    def __init__(self, db_file, tamanho=8, limite=None, timeout=30.0):
+        self.db_file = db_file
+        self.tamanho = tamanho
+        self.limite = limite
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self._pid = os.getpid()
+        self._livres = {True: queue.LifoQueue(), False: queue.LifoQueue()}
+        # Conexão -> somente_leitura, para todas as abertas por este processo
+        self._abertas = {}
+        self._quantidade = {True: 0, False: 0}
+        self._reservadas = []
+        self._fechado = False
+
+    def _verificar_processo(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reiniciar()
+        if self._fechado:
+            raise sqlite3.ProgrammingError("PoolConexoes já foi fechado")
+
+    def emprestar(self, somente_leitura=False):
+        """
+        Retorna uma conexão livre do grupo pedido, abrindo uma nova se preciso.
+
+        Raises:
+            sqlite3.OperationalError: Se o limite foi atingido e nenhuma
+                conexão foi devolvida em ``timeout`` segundos
+        """
+        self._verificar_processo()
+        livres = self._livres[somente_leitura]
+        try:
+            return livres.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            abrir = self.limite is None or self._quantidade[somente_leitura] < self.limite
+            if abrir:
+                self._quantidade[somente_leitura] += 1
+        if not abrir:
+            try:
+                return livres.get(timeout=self.timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError("Tempo esgotado aguardando conexão livre no pool")
+        try:
+            conn = abrir_conexao(self.db_file, somente_leitura)
+        except BaseException:
+            with self._lock:
+                self._quantidade[somente_leitura] -= 1
+            raise
+        with self._lock:
+            self._abertas[conn] = somente_leitura
+        return conn
+
+    def reservar(self, somente_leitura=False):
+        """
+        Abre uma conexão exclusiva de quem a pede (ex: uma thread de vida
+        longa). Ela não conta para o limite e não volta ao pool, mas é
+        fechada pelo ``close``.
+        """
+        self._verificar_processo()
+        conn = abrir_conexao(self.db_file, somente_leitura)
+        with self._lock:
+            self._reservadas.append(conn)
+        return conn
+
+    def devolver(self, conn):
+        """Desfaz o que não foi confirmado e guarda a conexão (ou a fecha, se sobrar)."""
+        with self._lock:
+            somente_leitura = self._abertas.get(conn)
+            if somente_leitura is None:
+                # Herdada de antes de um fork ou já fechada pelo close()
+                return
+            guardar = not self._fechado and self._livres[somente_leitura].qsize() < self.tamanho
+            if not guardar:
+                del self._abertas[conn]
+                self._quantidade[somente_leitura] -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao devolver conexão: {e}")
+            with self._lock:
+                if guardar and self._abertas.pop(conn, None) is not None:
+                    self._quantidade[somente_leitura] -= 1
+            guardar = False
+        if guardar:
+            self._livres[somente_leitura].put(conn)
+        else:
+            conn.close()
+
+    @contextmanager
+    def conexao(self, somente_leitura=False):
+        """Empresta uma conexão durante o bloco ``with``."""
+        conn = self.emprestar(somente_leitura)
+        try:
+            yield conn
+        finally:
+            self.devolver(conn)
+
+    def aquecer(self, quantidade):
+        """
+        Abre ``quantidade`` conexões de leitura e uma de escrita antes da
+        primeira requisição, já com o esquema carregado.
+        """
+        conexoes = [self.emprestar(True) for _ in range(quantidade)]
+        conexoes.append(self.emprestar(False))
+        for conn in conexoes:
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            self.devolver(conn)
+
+    def close(self):
+        """Fecha todas as conexões abertas por este processo, inclusive as reservadas."""
+        with self._lock:
+            self._fechado = True
+            conexoes = list(self._abertas) + self._reservadas if self._pid == os.getpid() else []
+            self._abertas, self._reservadas = {}, []
+        for conn in conexoes:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logging.error(f"Erro ao fechar conexão: {e}")
+
 class DatabaseManager:
-    def __init__(self, db_file="fin_assist.db"):
-        """Inicializa o gerenciador de banco de dados."""
+    def __init__(self, db_file="fin_assist.db", pool_size=5, pool_timeout=30.0):
+        """
+        Inicializa o gerenciador de banco de dados.
+
+        Args:
+            db_file (str): Caminho do arquivo SQLite
+            pool_size (int): Número máximo de conexões abertas simultaneamente
+            pool_timeout (float): Segundos de espera por uma conexão livre
+        """
         self.db_file = db_file
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self._pool = PoolConexoes(db_file, pool_size, limite=pool_size, timeout=pool_timeout)
+        self._fechado = False
+        # Conexões fixas por thread (reservar_conexao), fora do limite do pool
+        self._reservadas = threading.local()
+        # Resultados derivados do banco, invalidados a cada escrita
+        self.cache = CacheResultados()
+        # Duração e linhas de cada consulta feita por execute_query
+        self.metricas = RegistroMetricas()
+        # Descrições já usadas, para o autocompletar dos formulários
+        self.sugestoes = IndiceSugestoes(lambda: self.fetch_all(CONSULTA_DESCRICOES))
+        # Gravação agrupada de add_transacao, ligada por ativar_escrita_agrupada
+        self.escrita = None
         self._ensure_db_directory()
         self.init_database()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _ensure_db_directory(self):
         """Garante que o diretório do banco de dados existe."""
         db_dir = Path(self.db_file).parent
         db_dir.mkdir(parents=True, exist_ok=True)
 
+    def _abrir_conexao(self):
+        """Abre uma nova conexão já configurada com os PRAGMAs do pool."""
+        return abrir_conexao(self.db_file)
+
+    @contextmanager
+    def conexao(self):
+        """
+        Empresta uma conexão do pool durante o bloco ``with``.
+
+        Conexões são abertas sob demanda até ``pool_size``; depois disso a
+        chamada aguarda até ``pool_timeout`` segundos por uma conexão livre.
+        """
+        if self._fechado:
+            raise sqlite3.ProgrammingError("DatabaseManager já foi fechado")
+
+        reservada = getattr(self._reservadas, 'conn', None)
+        # Uma conexão reservada antes de um fork pertence ao processo pai
+        if reservada is not None and self._reservadas.pid == os.getpid():
+            try:
+                yield reservada
+            finally:
+                if reservada.in_transaction:
+                    reservada.rollback()
+            return
+
+        with self._pool.conexao() as conn:
+            yield conn
+
+    def reservar_conexao(self):
+        """
+        Abre uma conexão exclusiva da thread atual, usada por ``conexao()``
+        em todas as chamadas dessa thread até ``close()``.
+
+        Feito para threads de vida longa e em número limitado, como as de um
+        executor: cada uma mantém sua conexão aberta (e o cache de páginas do
+        SQLite aquecido) sem disputar o pool.
+        """
+        if getattr(self._reservadas, 'conn', None) is None or self._reservadas.pid != os.getpid():
+            self._reservadas.conn = self._pool.reservar()
+            self._reservadas.pid = os.getpid()
+
+    def close(self):
+        """Grava as transações enfileiradas e fecha todas as conexões do pool e as reservadas."""
+        if self.escrita is not None:
+            self.escrita.close()
+        self._fechado = True
+        self._pool.close()
+
     def init_database(self):
-        """Inicializa o banco de dados e cria as tabelas necessárias."""
+        """
+        Inicializa o banco de dados e cria as tabelas necessárias.
+
+        Bancos que já estão na versão atual do esquema não executam DDL.
+        """
         try:
-            with sqlite3.connect(self.db_file) as conn:
+            with self.conexao() as conn:
+                if esquema_atualizado(conn):
+                    logging.info("Banco de dados já inicializado")
+                    return
+                
                 cursor = conn.cursor()
                 
                 # Criar tabelas necessárias
@@ -25,7 +793,7 @@ class DatabaseManager:
                     CREATE TABLE IF NOT EXISTS transacoes (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         tipo TEXT NOT NULL,
-                        valor REAL NOT NULL,
+                        valor INTEGER NOT NULL,
                         data TEXT NOT NULL,
                         descricao TEXT,
                         categoria TEXT NOT NULL
@@ -37,7 +805,7 @@ class DatabaseManager:
                     CREATE TABLE IF NOT EXISTS orcamentos (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         categoria TEXT NOT NULL,
-                        valor_limite REAL NOT NULL,
+                        valor_limite INTEGER NOT NULL,
                         mes INTEGER NOT NULL,
                         ano INTEGER NOT NULL,
                         UNIQUE(categoria, mes, ano)
@@ -49,8 +817,8 @@ class DatabaseManager:
                     CREATE TABLE IF NOT EXISTS metas (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         descricao TEXT NOT NULL,
-                        valor_alvo REAL NOT NULL,
-                        valor_atual REAL DEFAULT 0,
+                        valor_alvo INTEGER NOT NULL,
+                        valor_atual INTEGER DEFAULT 0,
                         data_inicio TEXT NOT NULL,
                         data_fim TEXT NOT NULL,
                         status TEXT DEFAULT 'Em Andamento'
@@ -81,6 +849,9 @@ class DatabaseManager:
                     ]
                     cursor.executemany('INSERT INTO categorias (nome) VALUES (?)', categorias_padrao)
                 
+                # Migrações, índices e resumo mensal
+                atualizar_esquema(conn)
+                
                 conn.commit()
                 logging.info("Banco de dados inicializado com sucesso!")
                 
@@ -88,55 +859,282 @@ class DatabaseManager:
             logging.error(f"Erro ao inicializar o banco de dados: {e}")
             raise
 
-    def execute_query(self, query, parameters=None):
-        """Executa uma query SQL com parâmetros opcionais."""
+    def execute_query(self, query, parameters=None, fetch=None):
+        """
+        Executa uma query SQL com parâmetros opcionais.
+
+        Args:
+            query (str): Comando SQL
+            parameters: Parâmetros do comando
+            fetch (Optional[str]): 'all' ou 'one' para ler o resultado enquanto
+                a conexão ainda está emprestada do pool
+
+        Returns:
+            As linhas lidas quando ``fetch`` é informado; caso contrário o cursor
+            (válido apenas para lastrowid/rowcount). Sem ``fetch`` o comando é
+            tratado como escrita e invalida ``self.cache``.
+        """
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-                if parameters:
-                    cursor.execute(query, parameters)
-                else:
-                    cursor.execute(query)
-                conn.commit()
-                return cursor
+            with self.conexao() as conn:
+                inicio = time.perf_counter()
+                with conn:
+                    cursor = conn.cursor()
+                    if parameters:
+                        cursor.execute(query, parameters)
+                    else:
+                        cursor.execute(query)
+                    if fetch == 'all':
+                        resultado = cursor.fetchall()
+                        linhas = len(resultado)
+                    elif fetch == 'one':
+                        resultado = cursor.fetchone()
+                        linhas = 0 if resultado is None else 1
+                    else:
+                        resultado = cursor
+                        linhas = cursor.rowcount
+                self.metricas.registrar_consulta(query, time.perf_counter() - inicio, linhas)
+            if fetch is None:
+                self.cache.invalidar()
+            return resultado
         except sqlite3.Error as e:
             logging.error(f"Erro ao executar query: {e}")
             raise
 
     def fetch_all(self, query, parameters=None):
         """Executa uma query SELECT e retorna todos os resultados."""
-        cursor = self.execute_query(query, parameters)
-        return cursor.fetchall()
+        return self.execute_query(query, parameters, fetch='all')
 
     def fetch_one(self, query, parameters=None):
         """Executa uma query SELECT e retorna um resultado."""
-        cursor = self.execute_query(query, parameters)
-        return cursor.fetchone()
+        return self.execute_query(query, parameters, fetch='one')
 
     def insert(self, query, parameters=None):
         """Insere dados no banco e retorna o ID do último registro."""
         cursor = self.execute_query(query, parameters)
         return cursor.lastrowid
 
+    def get_versao_dados(self):
+        """
+        Retorna o contador de escritas do banco (tabela versao_dados).
+
+        Ao contrário de ``cache.versao``, muda também com escritas de outros
+        processos no mesmo arquivo (workers do servidor, importador, app
+        desktop), por isso entra na chave dos resultados em cache.
+        """
+        with self.conexao() as conn:
+            return versao_dados(conn)[0]
+
     def get_categorias(self):
         """Retorna todas as categorias cadastradas."""
         return self.fetch_all("SELECT nome FROM categorias ORDER BY nome")
 
+    def ativar_escrita_agrupada(self, max_lote=256, max_latencia=0.005, max_pendentes=10_000):
+        """
+        Passa ``add_transacao`` a gravar em lotes (group commit) por uma
+        thread dedicada, com um commit para até ``max_lote`` transações.
+
+        Cada chamada de ``add_transacao`` continua retornando o id só depois
+        do commit; ``enfileirar_transacao`` retorna um future e não espera.
+        Chamadas concorrentes dividem o mesmo commit; uma chamada isolada
+        espera a mais até a duração de um commit, limitada a ``max_latencia``.
+
+        Args:
+            max_lote (int): Máximo de transações por commit
+            max_latencia (float): Segundos que uma transação espera pelo commit do lote
+            max_pendentes (int): Transações na fila antes de ``enfileirar_transacao`` bloquear
+
+        Returns:
+            FilaEscrita: A fila criada (ou a já ativa)
+
+        Raises:
+            sqlite3.Error: Se a conexão da fila não puder ser aberta
+        """
+        if self.escrita is None:
+            self.escrita = FilaEscrita(
+                self._abrir_conexao, INSERIR_TRANSACAO, max_lote, max_latencia,
+                max_pendentes, ao_gravar=self._transacoes_gravadas
+            )
+        return self.escrita
+
+    def _transacoes_gravadas(self, transacoes, segundos):
+        """Atualiza métricas, cache e sugestões depois de gravar um lote de transações."""
+        self.metricas.registrar_consulta(INSERIR_TRANSACAO, segundos, len(transacoes))
+        self.cache.invalidar()
+        for _, _, data, descricao, categoria in transacoes:
+            self.sugestoes.registrar(descricao, categoria, data)
+
+    def enfileirar_transacao(self, tipo, valor, data, descricao, categoria):
+        """
+        Adiciona uma transação sem esperar o commit (valor em centavos).
+
+        Returns:
+            concurrent.futures.Future: Resolvido com o id da transação quando
+            ela estiver gravada. Sem ``ativar_escrita_agrupada`` a transação é
+            gravada na hora e o future já vem resolvido.
+        """
+        if self.escrita is not None:
+            return self.escrita.enviar((tipo, valor, data, descricao, categoria))
+        futuro = Future()
+        try:
+            futuro.set_result(self.add_transacao(tipo, valor, data, descricao, categoria))
+        except sqlite3.Error as e:
+            futuro.set_exception(e)
+        return futuro
+
     def add_transacao(self, tipo, valor, data, descricao, categoria):
-        """Adiciona uma nova transação ao banco de dados."""
+        """Adiciona uma nova transação ao banco de dados (valor em centavos)."""
+        if self.escrita is not None:
+            return self.escrita.enviar((tipo, valor, data, descricao, categoria)).result()
+        id = self.insert(INSERIR_TRANSACAO, (tipo, valor, data, descricao, categoria))
+        self.sugestoes.registrar(descricao, categoria, data)
+        return id
+
+    def add_transacoes(self, transacoes):
+        """
+        Adiciona várias transações em uma única transação do banco.
+
+        Args:
+            transacoes (Iterable[tuple]): Tuplas (tipo, valor, data, descricao, categoria),
+                com o valor em centavos
+
+        Returns:
+            int: Número de transações inseridas
+        """
+        try:
+            query = INSERIR_TRANSACAO
+            # As linhas são percorridas de novo para atualizar as sugestões
+            if self.sugestoes.carregado:
+                transacoes = list(transacoes)
+            with self.conexao() as conn:
+                inicio = time.perf_counter()
+                with conn:
+                    cursor = conn.executemany(query, transacoes)
+                self.metricas.registrar_consulta(query, time.perf_counter() - inicio, cursor.rowcount)
+            self.cache.invalidar()
+            if isinstance(transacoes, list):
+                for _, _, data, descricao, categoria in transacoes:
+                    self.sugestoes.registrar(descricao, categoria, data)
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao inserir transações em lote: {e}")
+            raise
+
+    def add_transacoes_lote(self, transacoes, atomico=False):
+        """
+        Adiciona transações isolando os erros por linha, como na API JSON.
+
+        Com ``ativar_escrita_agrupada`` (e fora do modo atômico) as linhas vão
+        para a fila de escrita e dividem os commits com as demais chamadas;
+        caso contrário são gravadas em uma única transação do banco.
+
+        Args:
+            transacoes (Sequence[tuple]): Tuplas (tipo, valor, data, descricao,
+                categoria), com o valor em centavos
+            atomico (bool): Grava todas ou nenhuma
+
+        Returns:
+            list: Para cada transação, o id gravado ou a exceção que a recusou;
+            no modo atômico, None nas desfeitas pelo erro de outra
+        """
+        if self.escrita is not None and not atomico:
+            futuros = [self.escrita.enviar(transacao) for transacao in transacoes]
+            resultados = []
+            for futuro in futuros:
+                try:
+                    resultados.append(futuro.result())
+                except (sqlite3.Error, OverflowError) as e:
+                    resultados.append(e)
+            return resultados
+
+        transacoes = list(transacoes)
+        with self.conexao() as conn:
+            inicio = time.perf_counter()
+            resultados = inserir_transacoes(conn, transacoes, atomico)
+            segundos = time.perf_counter() - inicio
+        gravadas = [transacao for transacao, resultado in zip(transacoes, resultados)
+                    if isinstance(resultado, int)]
+        if gravadas:
+            self._transacoes_gravadas(gravadas, segundos)
+        return resultados
+
+    def get_transacoes(self, after=None, limit=None):
+        """
+        Retorna as transações ordenadas por data e id, da mais recente.
+
+        Args:
+            after (Optional[Tuple[str, int]]): Par (data, id) da última linha
+                da página anterior; a consulta continua a partir dele
+            limit (Optional[int]): Máximo de linhas retornadas; None retorna todas
+        """
         query = '''
-            INSERT INTO transacoes (tipo, valor, data, descricao, categoria)
-            VALUES (?, ?, ?, ?, ?)
+            SELECT id, tipo, valor, data, descricao, categoria
+            FROM transacoes
         '''
-        return self.insert(query, (tipo, valor, data, descricao, categoria))
+        params = []
+        if after is not None:
+            query += ' WHERE (data, id) < (?, ?)'
+            params.extend(after)
+        query += ' ORDER BY data DESC, id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        return self.fetch_all(query, params)
 
-    def get_transacoes(self):
-        """Retorna todas as transações ordenadas por data."""
-        return self.fetch_all('''
-            SELECT id, tipo, valor, data, descricao, categoria
+    def get_pagina_transacoes(self, after=None, limit=50):
+        """
+        Retorna uma página de transações e o cursor da página seguinte.
+
+        Returns:
+            Tuple[list, Optional[Tuple[str, int]]]: Linhas da página e o par
+            (data, id) para buscar a próxima, ou None se for a última
+        """
+        transacoes = self.get_transacoes(after=after, limit=limit + 1)
+        if len(transacoes) <= limit:
+            return transacoes, None
+        transacoes = transacoes[:limit]
+        ultima = transacoes[-1]
+        return transacoes, (ultima[3], ultima[0])
+
+    def iter_transacoes(self, tipo=None, categoria=None, data_inicio=None,
+                        data_fim=None, tamanho_lote=1000):
+        """
+        Percorre as transações filtradas sem carregar o resultado inteiro.
+
+        A conexão fica emprestada do pool até o gerador ser esgotado ou fechado.
+
+        Yields:
+            tuple: (id, data, tipo, valor, categoria, descricao)
+        """
+        clausula, params = filtros_transacoes(tipo, categoria, data_inicio, data_fim)
+        query = f'''
+            SELECT id, data, tipo, valor, categoria, descricao
             FROM transacoes
-            ORDER BY data DESC
-        ''')
+            WHERE 1=1{clausula}
+            ORDER BY data DESC, id DESC
+        '''
+        with self.conexao() as conn:
+            yield from iterar_consulta(conn, query, params, tamanho_lote)
+
+    def search_transacoes(self, query, filters=None, limit=50):
+        """
+        Busca transações pelo texto da descrição, das mais relevantes (bm25).
+
+        Args:
+            query (str): Palavras digitadas; cada uma casa por prefixo
+            filters (Optional[dict]): Filtros tipo, categoria, data_inicio e
+                data_fim, como em iter_transacoes
+            limit (int): Máximo de linhas retornadas
+
+        Returns:
+            list: Tuplas (id, tipo, valor, data, descricao, categoria)
+        """
+        expressao = expressao_busca(query)
+        if expressao is None:
+            return []
+        clausula, params = filtros_transacoes(**(filters or {}))
+        return self.fetch_all(consulta_busca(
+            'id, tipo, valor, data, descricao, categoria', clausula
+        ), [expressao, *params, MAX_CANDIDATOS_BUSCA, limit])
 
     def update_transacao(self, id, tipo, valor, data, descricao, categoria):
         """Atualiza uma transação existente."""
@@ -153,31 +1151,22 @@ class DatabaseManager:
 
     def get_resumo_financeiro(self):
         """Retorna o resumo financeiro (total de receitas e despesas)."""
-        receitas = self.fetch_one('''
-            SELECT COALESCE(SUM(valor), 0)
-            FROM transacoes
-            WHERE tipo = 'Receita'
-        ''')[0]
-        
-        despesas = self.fetch_one('''
-            SELECT COALESCE(SUM(valor), 0)
-            FROM transacoes
-            WHERE tipo = 'Despesa'
-        ''')[0]
+        totais = dict(self.fetch_all('''
+            SELECT tipo, COALESCE(SUM(total), 0)
+            FROM resumo_mensal
+            GROUP BY tipo
+        '''))
+        receitas = totais.get('Receita', 0)
+        despesas = totais.get('Despesa', 0)
         
         # Buscar resumo por categoria do mês atual
-        from datetime import datetime
-        mes_atual = datetime.now().month
-        ano_atual = datetime.now().year
+        agora = datetime.now()
         
         despesas_por_categoria = self.fetch_all('''
-            SELECT categoria, COALESCE(SUM(valor), 0) as total
-            FROM transacoes
-            WHERE tipo = 'Despesa'
-            AND strftime('%m', data) = ?
-            AND strftime('%Y', data) = ?
-            GROUP BY categoria
-        ''', (f"{mes_atual:02d}", str(ano_atual)))
+            SELECT categoria, total
+            FROM resumo_mensal
+            WHERE ano = ? AND mes = ? AND tipo = 'Despesa'
+        ''', (agora.year, agora.month))
         
         return {
             'receitas': receitas,
@@ -186,9 +1175,35 @@ class DatabaseManager:
             'despesas_por_categoria': despesas_por_categoria
         }
 
+    def get_despesas_por_categoria(self):
+        """
+        Retorna o total de despesas de cada categoria, de todo o período.
+
+        A soma parte de resumo_mensal, então o custo acompanha o número de
+        meses e categorias e não o de transações.
+
+        Returns:
+            List[Tuple[str, int]]: Pares (categoria, total em centavos)
+        """
+        return self.fetch_all('''
+            SELECT categoria, SUM(total)
+            FROM resumo_mensal
+            WHERE tipo = 'Despesa'
+            GROUP BY categoria
+            HAVING SUM(total) <> 0
+        ''')
+
+    def reconstruir_resumo_mensal(self):
+        """Recalcula a tabela resumo_mensal a partir de todas as transações."""
+        with self.conexao() as conn:
+            with conn:
+                reconstruir_resumo_mensal(conn)
+        self.cache.invalidar()
+        logging.info("Resumo mensal reconstruído com sucesso!")
+
     # Métodos para Orçamentos
     def add_orcamento(self, categoria, valor_limite, mes, ano):
-        """Adiciona ou atualiza um orçamento."""
+        """Adiciona ou atualiza um orçamento (valor_limite em centavos)."""
         try:
             self.execute_query('''
                 INSERT INTO orcamentos (categoria, valor_limite, mes, ano)
@@ -210,17 +1225,13 @@ class DatabaseManager:
 
         return self.fetch_all('''
             SELECT o.id, o.categoria, o.valor_limite,
-                   COALESCE((
-                       SELECT SUM(t.valor)
-                       FROM transacoes t
-                       WHERE t.categoria = o.categoria
-                       AND strftime('%m', t.data) = ?
-                       AND strftime('%Y', t.data) = ?
-                       AND t.tipo = 'Despesa'
-                   ), 0) as valor_atual
+                   COALESCE(r.total, 0) as valor_atual
             FROM orcamentos o
+            LEFT JOIN resumo_mensal r
+                ON r.ano = o.ano AND r.mes = o.mes
+                AND r.tipo = 'Despesa' AND r.categoria = o.categoria
             WHERE o.mes = ? AND o.ano = ?
-        ''', (f"{mes:02d}", str(ano), mes, ano))
+        ''', (mes, ano))
 
     def delete_orcamento(self, id):
         """Remove um orçamento."""
@@ -228,7 +1239,7 @@ class DatabaseManager:
 
     # Métodos para Metas
     def add_meta(self, descricao, valor_alvo, data_inicio, data_fim):
-        """Adiciona uma nova meta."""
+        """Adiciona uma nova meta (valor_alvo em centavos)."""
         return self.insert('''
             INSERT INTO metas (descricao, valor_alvo, data_inicio, data_fim)
             VALUES (?, ?, ?, ?)
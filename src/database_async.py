@@ -0,0 +1,93 @@
+"""
+Acesso ao banco para código asyncio (ex: app_asgi.py).
+
+As chamadas do DatabaseManager rodam em um ThreadPoolExecutor de tamanho
+fixo. Cada thread do executor reserva uma conexão própria ao iniciar
+(``DatabaseManager.reservar_conexao``) e a mantém até o fechamento, de modo
+que o loop de eventos nunca espera pelo SQLite e threads e conexões ficam
+limitadas a ``max_workers``.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from .database import DatabaseManager
+
+# Métodos do DatabaseManager disponíveis como corrotinas. iter_transacoes fica
+# de fora: o gerador prenderia a conexão de um worker entre as chamadas.
+# add_transacao é definido na classe, por causa da escrita agrupada.
+METODOS_ASSINCRONOS = (
+    'get_versao_dados', 'get_categorias', 'add_transacoes', 'add_transacoes_lote',
+    'get_transacoes', 'get_pagina_transacoes', 'search_transacoes', 'update_transacao',
+    'delete_transacao',
+    'get_resumo_financeiro', 'get_despesas_por_categoria', 'reconstruir_resumo_mensal',
+    'add_orcamento', 'get_orcamentos', 'delete_orcamento',
+    'add_meta', 'get_metas', 'update_meta', 'delete_meta', 'atualizar_progresso_meta',
+    'fetch_all', 'fetch_one', 'insert',
+)
+
+class AsyncDatabaseManager:
+    """
+    Versão assíncrona do DatabaseManager.
+
+    Cada método de ``METODOS_ASSINCRONOS`` aceita os mesmos argumentos do
+    original e retorna o mesmo resultado, aguardado com ``await``. Cache,
+    métricas e sugestões continuam em ``self.db``.
+
+    Args:
+        db (Optional[DatabaseManager]): Gerenciador a usar; sem ele um novo é
+            criado para ``db_file`` e fechado junto com este
+        max_workers (int): Threads (e conexões reservadas) do executor
+        db_file (str): Caminho do arquivo SQLite, quando ``db`` não é informado
+    """
+
+    def __init__(self, db=None, max_workers=4, db_file="fin_assist.db"):
+        self._proprio = db is None
+        self.db = DatabaseManager(db_file) if db is None else db
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='fin_assist_db',
+            initializer=self.db.reservar_conexao
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def executar(self, funcao, *args, **kwargs):
+        """Executa ``funcao(*args, **kwargs)`` no executor do banco."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(funcao, *args, **kwargs))
+
+    async def add_transacao(self, tipo, valor, data, descricao, categoria):
+        """
+        Versão assíncrona de DatabaseManager.add_transacao.
+
+        Com a escrita agrupada ativa (``ativar_escrita_agrupada``) aguarda o
+        commit do lote sem ocupar uma thread do executor, de modo que o lote
+        não fica limitado a ``max_workers`` transações.
+        """
+        if self.db.escrita is None:
+            return await self.executar(self.db.add_transacao, tipo, valor, data, descricao, categoria)
+        return await asyncio.wrap_future(
+            self.db.enfileirar_transacao(tipo, valor, data, descricao, categoria))
+
+    def close(self):
+        """Aguarda as chamadas em andamento e fecha o executor (e o banco, se próprio)."""
+        self._executor.shutdown(wait=True)
+        if self._proprio:
+            self.db.close()
+
+def _metodo_assincrono(nome):
+    async def metodo(self, *args, **kwargs):
+        return await self.executar(getattr(self.db, nome), *args, **kwargs)
+    metodo.__name__ = metodo.__qualname__ = nome
+    metodo.__doc__ = f"Versão assíncrona de DatabaseManager.{nome}."
+    return metodo
+
+for _nome in METODOS_ASSINCRONOS:
+    setattr(AsyncDatabaseManager, _nome, _metodo_assincrono(_nome))
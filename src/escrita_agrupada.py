@@ -0,0 +1,219 @@
+"""
+Gravação agrupada (group commit) de inserções frequentes.
+
+Em vez de cada chamada abrir e confirmar a própria transação, as linhas são
+colocadas em uma fila e uma única thread as grava em lotes. O lote é fechado
+ao atingir ``max_lote`` linhas ou, com a fila vazia, quando a linha mais
+antiga já esperou o tempo do último commit ou ``max_latencia`` segundos (o
+que for menor); todas as linhas do lote são confirmadas em um só commit,
+enquanto as que chegam nesse meio tempo formam o próximo lote. Quem envia
+recebe um ``concurrent.futures.Future`` que é resolvido com o id da linha
+depois do commit:
+
+    fila = FilaEscrita(abrir_conexao, "INSERT INTO t (a, b) VALUES (?, ?)")
+    futuro = fila.enviar((1, 2))
+    id = futuro.result()   # a linha já está no banco
+
+A conexão da fila usa ``PRAGMA synchronous = FULL``: com um fsync por lote,
+e não por linha, uma linha confirmada sobrevive também a quedas de energia.
+A janela em que uma linha aceita ainda não está gravada é limitada a
+``max_latencia`` mais a duração de um commit.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# Marca o fim da fila no close()
+_FIM = object()
+
+class FilaEscrita:
+    """
+    Fila de inserções gravadas em lotes por uma thread dedicada.
+
+    Args:
+        abrir_conexao (Callable[[], sqlite3.Connection]): Abre a conexão de
+            escrita usada pela thread (com ``check_same_thread=False``); é
+            chamado no construtor, que propaga o erro se ela não abrir
+        query (str): INSERT executado para cada linha enviada
+        max_lote (int): Máximo de linhas confirmadas em um commit
+        max_latencia (float): Segundos que uma linha pode esperar pelo commit
+            do seu lote, além da duração do próprio commit
+        max_pendentes (int): Linhas aguardando gravação; ``enviar`` bloqueia
+            quando a fila está cheia
+        ao_gravar (Optional[Callable[[list, float], None]]): Chamado depois de
+            cada commit, antes de resolver os futures, com os parâmetros das
+            linhas gravadas e a duração do lote em segundos
+        sincronismo (str): Valor de ``PRAGMA synchronous`` da conexão
+    """
+
+    def __init__(self, abrir_conexao, query, max_lote=256, max_latencia=0.005,
+                 max_pendentes=10_000, ao_gravar=None, sincronismo='FULL'):
+        if max_lote < 1:
+            raise ValueError("max_lote deve ser ao menos 1")
+        self.query = query
+        self.max_lote = max_lote
+        self.max_latencia = max_latencia
+        self.ao_gravar = ao_gravar
+        self._conn = abrir_conexao()
+        try:
+            self._conn.execute(f"PRAGMA synchronous = {sincronismo}")
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+        self._fila = queue.Queue(maxsize=max_pendentes)
+        self._lock = threading.Lock()
+        self._fechada = False
+        # Erro que encerrou a thread; recusa novos envios
+        self._erro = None
+        self._lotes = 0
+        self._linhas = 0
+        self._thread = threading.Thread(target=self._executar, name='fin_assist_escrita', daemon=True)
+        self._thread.start()
+
+    def enviar(self, parametros):
+        """
+        Coloca uma linha na fila.
+
+        Returns:
+            Future: Resolvido com o id da linha após o commit, ou com a exceção
+            do SQLite se a linha (ou o commit do lote) falhar. Cancelar o
+            future antes do lote ser gravado descarta a linha.
+        """
+        with self._lock:
+            if self._fechada:
+                raise RuntimeError("Fila de escrita já foi encerrada") from self._erro
+        futuro = Future()
+        # O put fica fora do lock: com a fila cheia ele espera a thread, que
+        # também usa o lock ao gravar
+        self._fila.put((parametros, futuro, time.monotonic()))
+        with self._lock:
+            fechada = self._fechada
+        if fechada:
+            # A fila foi encerrada (close() ou erro da thread) entre a
+            # verificação e o put, e a linha pode ter ficado depois do _FIM:
+            # depois que a thread termina, ninguém mais lê a fila
+            self._thread.join()
+            self._descartar_pendentes(
+                self._erro or RuntimeError("Fila de escrita encerrada antes da gravação"))
+        return futuro
+
+    def estatisticas(self):
+        """Retorna lotes e linhas gravados e linhas aguardando."""
+        with self._lock:
+            lotes, linhas = self._lotes, self._linhas
+        return {
+            'lotes': lotes,
+            'linhas': linhas,
+            'media_por_lote': linhas / lotes if lotes else 0.0,
+            'pendentes': self._fila.qsize(),
+        }
+
+    def close(self):
+        """Grava as linhas já enviadas e encerra a thread."""
+        with self._lock:
+            if self._fechada:
+                return
+            self._fechada = True
+        self._fila.put(_FIM)
+        self._thread.join()
+        # Só sobra algo se a thread terminou com erro
+        self._descartar_pendentes(RuntimeError("Fila de escrita encerrada antes da gravação"))
+
+    def _descartar_pendentes(self, erro):
+        """Resolve com ``erro`` os futures que ainda estão na fila."""
+        while True:
+            try:
+                item = self._fila.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _FIM and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(erro)
+
+    def _executar(self):
+        conn = self._conn
+        try:
+            fim = False
+            duracao_commit = self.max_latencia
+            while not fim:
+                item = self._fila.get()
+                if item is _FIM:
+                    break
+                lote = [item]
+                # Esperar por mais linhas só compensa enquanto custa menos que
+                # outro commit; o prazo conta do envio da linha mais antiga
+                prazo = item[2] + min(self.max_latencia, duracao_commit)
+                while len(lote) < self.max_lote:
+                    try:
+                        item = self._fila.get_nowait()
+                    except queue.Empty:
+                        try:
+                            item = self._fila.get(timeout=max(0.0, prazo - time.monotonic()))
+                        except queue.Empty:
+                            break
+                    if item is _FIM:
+                        fim = True
+                        break
+                    lote.append(item)
+                inicio = time.perf_counter()
+                try:
+                    self._gravar(conn, lote)
+                except BaseException as e:
+                    for _, futuro, _ in lote:
+                        if not futuro.done():
+                            futuro.set_exception(e)
+                    raise
+                duracao_commit = time.perf_counter() - inicio
+        except BaseException as e:
+            logging.error(f"Fila de escrita interrompida: {e}", exc_info=True)
+            with self._lock:
+                self._fechada = True
+                self._erro = e
+            self._descartar_pendentes(e)
+        finally:
+            conn.close()
+
+    def _gravar(self, conn, lote):
+        # Linhas cujo future foi cancelado não são gravadas
+        lote = [item for item in lote if item[1].set_running_or_notify_cancel()]
+        if not lote:
+            return
+        inicio = time.perf_counter()
+        resultados = []
+        try:
+            with conn:
+                for parametros, _, _ in lote:
+                    try:
+                        resultados.append(conn.execute(self.query, parametros).lastrowid)
+                    except (sqlite3.Error, OverflowError) as e:
+                        if not conn.in_transaction and any(
+                                not isinstance(r, Exception) for r in resultados):
+                            # O SQLite desfez a transação inteira (ex: disco
+                            # cheio): as linhas anteriores também se perderam
+                            raise
+                        # Desfaz só este comando; as outras linhas do lote seguem
+                        resultados.append(e)
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao gravar lote de {len(lote)} linhas: {e}")
+            for _, futuro, _ in lote:
+                futuro.set_exception(e)
+            return
+
+        gravados = [parametros for (parametros, _, _), resultado in zip(lote, resultados)
+                    if not isinstance(resultado, Exception)]
+        with self._lock:
+            self._lotes += 1
+            self._linhas += len(gravados)
+        if gravados and self.ao_gravar is not None:
+            try:
+                self.ao_gravar(gravados, time.perf_counter() - inicio)
+            except Exception as e:
+                logging.error(f"Erro após gravar lote: {e}", exc_info=True)
+        for (_, futuro, _), resultado in zip(lote, resultados):
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
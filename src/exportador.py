@@ -0,0 +1,73 @@
+"""
+Exportação de transações em CSV e JSON lines.
+
+Os geradores deste módulo transformam linhas do banco em blocos de texto
+prontos para uma resposta em streaming, sem acumular o resultado completo.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, Sequence
+
+from .utils import centavos_para_decimal
+
+COLUNAS_EXPORTACAO = ('id', 'data', 'tipo', 'valor', 'categoria', 'descricao')
+INDICE_VALOR = COLUNAS_EXPORTACAO.index('valor')
+FILTROS = ('tipo', 'categoria', 'data_inicio', 'data_fim')
+
+def ler_filtros(args) -> dict:
+    """Extrai de ``request.args`` os filtros aceitos pela listagem de transações."""
+    return {filtro: args.get(filtro) or None for filtro in FILTROS}
+
+def _em_reais(linha: Sequence) -> list:
+    """Copia a linha convertendo o valor de centavos para reais."""
+    linha = list(linha)
+    linha[INDICE_VALOR] = centavos_para_decimal(linha[INDICE_VALOR])
+    return linha
+
+def gerar_csv(linhas: Iterable[Sequence], linhas_por_bloco: int = 500) -> Iterator[str]:
+    """
+    Converte linhas em blocos de texto CSV, começando pelo cabeçalho.
+    
+    Args:
+        linhas (Iterable[Sequence]): Linhas na ordem de ``COLUNAS_EXPORTACAO``,
+            com o valor em centavos (exportado em reais, ex: 1234.56)
+        linhas_por_bloco (int): Linhas agrupadas em cada bloco produzido
+        
+    Yields:
+        str: Trecho do arquivo CSV
+    """
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUNAS_EXPORTACAO)
+    for numero, linha in enumerate(linhas, start=1):
+        escritor.writerow(_em_reais(linha))
+        if numero % linhas_por_bloco == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def gerar_jsonl(linhas: Iterable[Sequence], linhas_por_bloco: int = 500) -> Iterator[str]:
+    """
+    Converte linhas em blocos de JSON lines (um objeto por linha).
+    
+    Args:
+        linhas (Iterable[Sequence]): Linhas na ordem de ``COLUNAS_EXPORTACAO``,
+            com o valor em centavos (exportado em reais, ex: 1234.56)
+        linhas_por_bloco (int): Linhas agrupadas em cada bloco produzido
+        
+    Yields:
+        str: Trecho do arquivo JSON lines
+    """
+    bloco = []
+    for linha in linhas:
+        registro = dict(zip(COLUNAS_EXPORTACAO, linha))
+        registro['valor'] = float(centavos_para_decimal(registro['valor']))
+        bloco.append(json.dumps(registro, ensure_ascii=False))
+        if len(bloco) >= linhas_por_bloco:
+            yield '\n'.join(bloco) + '\n'
+            bloco.clear()
+    if bloco:
+        yield '\n'.join(bloco) + '\n'
@@ -1,32 +1,47 @@
-import matplotlib
-matplotlib.use('Agg')  # Usar backend não-interativo
-
 from PyQt5.QtWidgets import (
-    QMainWindow, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton, QLineEdit, QComboBox, QTableWidget,
-    QTableWidgetItem, QMessageBox, QDateEdit, QTextEdit, QFrame,
-    QGridLayout, QSpacerItem, QSizePolicy
+    QMainWindow, QWidget, QTabWidget, QVBoxLayout,
+    QLabel, QPushButton, QLineEdit, QComboBox, QTableView,
+    QMessageBox, QDateEdit, QTextEdit, QFrame, QAbstractItemView,
+    QGridLayout, QSpacerItem, QSizePolicy, QDialog, QDialogButtonBox, QCompleter
 )
-from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtCore import Qt, QDate, QStringListModel, QThreadPool
 from PyQt5.QtGui import QFont, QColor, QPalette
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from datetime import datetime
 import logging
+import time
 
 from .database import DatabaseManager
-from .models import Transacao, ResumoFinanceiro
-from .utils import (
-    validar_valor, validar_data, formatar_valor_monetario,
-    formatar_data, validar_descricao, gerar_cor_categoria
-)
+from .historico import TransacoesTableModel, AcoesDelegate, linha_transacao
+from .models import ResumoFinanceiro
+from .tarefas import Tarefa
+from .utils import validar_valor, validar_data, validar_descricao
 
 class FinAssistWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db = DatabaseManager()
+        # Consultas rodam fora da thread da interface
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._geracao = 0
+        self._tarefas = set()
+        # Totais exibidos, mantidos por deltas após cada alteração
+        self._totais = None
+        self._despesas_por_categoria = None
+        # Gráficos (e o matplotlib) só são carregados quando há dados para exibir
+        self.graficos = None
         self.setup_ui()
         self.carregar_dados()
+        # Índice do autocompletar da descrição, montado fora da thread da interface
+        self._tarefa_sugestoes = Tarefa(0, self.db.sugestoes.carregar)
+        self.pool.start(self._tarefa_sugestoes)
+
+    def closeEvent(self, event):
+        """Aguarda as consultas pendentes e fecha as conexões do banco."""
+        self._cancelar_tarefas()
+        self.pool.waitForDone(5000)
+        self.db.close()
+        super().closeEvent(event)
 
     def setup_ui(self):
         """Configura a interface do usuário."""
@@ -64,31 +79,31 @@ class FinAssistWindow(QMainWindow):
         
         # Receitas
         receitas_label = QLabel("Receitas:")
-        self.receitas_valor = QLabel("R$ 0,00")
+        self.receitas_valor = QLabel("Carregando...")
         self.receitas_valor.setStyleSheet(valor_style + "color: #2ecc71;")
         resumo_layout.addWidget(receitas_label, 0, 0)
         resumo_layout.addWidget(self.receitas_valor, 0, 1)
         
         # Despesas
         despesas_label = QLabel("Despesas:")
-        self.despesas_valor = QLabel("R$ 0,00")
+        self.despesas_valor = QLabel("Carregando...")
         self.despesas_valor.setStyleSheet(valor_style + "color: #e74c3c;")
         resumo_layout.addWidget(despesas_label, 1, 0)
         resumo_layout.addWidget(self.despesas_valor, 1, 1)
         
         # Saldo
         saldo_label = QLabel("Saldo:")
-        self.saldo_valor = QLabel("R$ 0,00")
+        self.saldo_valor = QLabel("Carregando...")
         self.saldo_valor.setStyleSheet(valor_style)
         resumo_layout.addWidget(saldo_label, 2, 0)
         resumo_layout.addWidget(self.saldo_valor, 2, 1)
         
         layout.addWidget(resumo_frame)
         
-        # Gráfico
-        self.figura = plt.figure(figsize=(8, 6))
-        self.canvas = FigureCanvas(self.figura)
-        layout.addWidget(self.canvas)
+        # Gráfico, criado em _obter_graficos
+        self.grafico_dashboard = QLabel("Carregando gráfico...")
+        self.grafico_dashboard.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.grafico_dashboard, 1)
         
         self.tabs.addTab(tab, "Dashboard")
 
@@ -125,10 +140,18 @@ class FinAssistWindow(QMainWindow):
         self.categoria_combo.addItems([cat[0] for cat in self.db.get_categorias()])
         form_layout.addWidget(self.categoria_combo, 3, 1)
         
-        # Descrição
+        # Descrição, com sugestões das descrições já usadas
         form_layout.addWidget(QLabel("Descrição:"), 4, 0)
-        self.descricao_edit = QTextEdit()
-        self.descricao_edit.setMaximumHeight(100)
+        self.descricao_edit = QLineEdit()
+        self.descricao_edit.setPlaceholderText("Descrição da transação")
+        self._categorias_sugeridas = {}
+        self.sugestoes_model = QStringListModel(self)
+        self.completer = QCompleter(self.sugestoes_model, self)
+        # A filtragem (sem caixa e acentos) já é feita pelo índice
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.activated[str].connect(self.aplicar_sugestao)
+        self.descricao_edit.setCompleter(self.completer)
+        self.descricao_edit.textEdited.connect(self.atualizar_sugestoes)
         form_layout.addWidget(self.descricao_edit, 4, 1)
         
         layout.addLayout(form_layout)
@@ -143,17 +166,45 @@ class FinAssistWindow(QMainWindow):
         
         self.tabs.addTab(tab, "Nova Transação")
 
+    def atualizar_sugestoes(self, texto):
+        """Mostra as descrições já usadas que começam pelo texto digitado."""
+        # Enquanto o índice é montado em segundo plano, o campo funciona sem sugestões
+        if not self.db.sugestoes.carregado:
+            return
+        sugestoes = self.db.sugestoes.sugerir(texto, 8)
+        self._categorias_sugeridas = {s['descricao']: s['categoria'] for s in sugestoes}
+        self.sugestoes_model.setStringList(list(self._categorias_sugeridas))
+        if sugestoes:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def aplicar_sugestao(self, descricao):
+        """Seleciona a categoria usada por último com a descrição escolhida."""
+        indice = self.categoria_combo.findText(self._categorias_sugeridas.get(descricao, ''))
+        if indice >= 0:
+            self.categoria_combo.setCurrentIndex(indice)
+
     def setup_historico_tab(self):
         """Configura a aba de Histórico."""
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
-        # Tabela de transações
-        self.tabela = QTableWidget()
-        self.tabela.setColumnCount(6)
-        self.tabela.setHorizontalHeaderLabels([
-            "Data", "Tipo", "Valor", "Categoria", "Descrição", "Ações"
-        ])
+        # Tabela de transações, carregada sob demanda
+        self.historico_model = TransacoesTableModel(self.db, parent=self)
+        self.acoes_delegate = AcoesDelegate(self)
+        self.acoes_delegate.editar_clicado.connect(
+            lambda row: self.editar_transacao(self.historico_model.transacao(row)))
+        self.acoes_delegate.excluir_clicado.connect(
+            lambda row: self.excluir_transacao(self.historico_model.transacao(row)))
+        
+        self.tabela = QTableView()
+        self.tabela.setModel(self.historico_model)
+        self.tabela.setItemDelegateForColumn(
+            TransacoesTableModel.COLUNA_ACOES, self.acoes_delegate)
+        self.tabela.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabela.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabela.verticalHeader().setDefaultSectionSize(30)
         self.tabela.horizontalHeader().setStretchLastSection(True)
         
         layout.addWidget(self.tabela)
@@ -165,23 +216,63 @@ class FinAssistWindow(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
-        # Gráfico de gastos por categoria
-        self.figura_relatorio = plt.figure(figsize=(8, 6))
-        self.canvas_relatorio = FigureCanvas(self.figura_relatorio)
-        layout.addWidget(self.canvas_relatorio)
+        # Gráfico de gastos por categoria, criado em _obter_graficos
+        self.grafico_relatorio = QLabel("Carregando gráfico...")
+        self.grafico_relatorio.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.grafico_relatorio, 1)
         
         self.tabs.addTab(tab, "Relatórios")
 
     def carregar_dados(self):
-        """Carrega e atualiza todos os dados na interface."""
-        self.atualizar_resumo()
+        """
+        Agenda o carregamento de todos os dados da interface.
+
+        As consultas rodam no pool de threads e cada resultado é aplicado
+        quando chega; um novo carregamento cancela os anteriores.
+        """
+        self._cancelar_tarefas()
+        self._geracao += 1
+        self._agendar(self.db.get_resumo_financeiro, self.atualizar_resumo)
+        self._agendar(self._calcular_despesas_por_categoria, self.atualizar_graficos)
         self.atualizar_historico()
-        self.atualizar_graficos()
 
-    def atualizar_resumo(self):
-        """Atualiza o resumo financeiro."""
-        resumo = self.db.get_resumo_financeiro()
-        resumo = ResumoFinanceiro.from_dict(resumo)
+    def _agendar(self, funcao, ao_concluir):
+        """Executa ``funcao`` no pool e entrega o resultado para ``ao_concluir``."""
+        tarefa = Tarefa(self._geracao, funcao)
+        tarefa.sinais.concluida.connect(ao_concluir)
+        tarefa.sinais.falhou.connect(self._carregamento_falhou)
+        tarefa.sinais.finalizada.connect(self._tarefa_finalizada)
+        self._tarefas.add(tarefa)
+        self.pool.start(tarefa)
+
+    def _cancelar_tarefas(self):
+        """Cancela as tarefas pendentes; as que já estão rodando descartam o resultado."""
+        for tarefa in list(self._tarefas):
+            tarefa.cancelar()
+            if self.pool.tryTake(tarefa):
+                self._tarefas.discard(tarefa)
+
+    def _tarefa_finalizada(self, tarefa):
+        """Libera a referência da tarefa depois que ela terminou de rodar."""
+        self._tarefas.discard(tarefa)
+
+    def _carregamento_falhou(self, geracao, erro):
+        """Informa falhas do carregamento atual."""
+        if geracao == self._geracao:
+            QMessageBox.critical(self, "Erro", f"Erro ao carregar os dados: {erro}")
+
+    def atualizar_resumo(self, geracao, resumo):
+        """Guarda os totais carregados e atualiza o resumo financeiro."""
+        if geracao != self._geracao:
+            return
+        self._totais = {'Receita': resumo['receitas'], 'Despesa': resumo['despesas']}
+        self._exibir_resumo()
+
+    def _exibir_resumo(self):
+        """Mostra os totais em cache nos rótulos do resumo."""
+        receitas = self._totais['Receita']
+        despesas = self._totais['Despesa']
+        resumo = ResumoFinanceiro(receitas, despesas, receitas - despesas)
         
         self.receitas_valor.setText(resumo.receitas_formatado)
         self.despesas_valor.setText(resumo.despesas_formatado)
@@ -195,109 +286,121 @@ class FinAssistWindow(QMainWindow):
 
     def atualizar_historico(self):
         """Atualiza a tabela de histórico."""
-        transacoes = self.db.get_transacoes()
-        self.tabela.setRowCount(len(transacoes))
-        
-        for i, trans in enumerate(transacoes):
-            transacao = Transacao.from_dict({
-                'id': trans[0],
-                'tipo': trans[1],
-                'valor': trans[2],
-                'data': trans[3],
-                'descricao': trans[4],
-                'categoria': trans[5]
-            })
-            
-            self.tabela.setItem(i, 0, QTableWidgetItem(transacao.data_formatada))
-            self.tabela.setItem(i, 1, QTableWidgetItem(transacao.tipo))
-            self.tabela.setItem(i, 2, QTableWidgetItem(transacao.valor_formatado))
-            self.tabela.setItem(i, 3, QTableWidgetItem(transacao.categoria))
-            self.tabela.setItem(i, 4, QTableWidgetItem(transacao.descricao))
-            
-            # Botões de ação
-            acoes_widget = QWidget()
-            acoes_layout = QHBoxLayout(acoes_widget)
-            
-            editar_btn = QPushButton("Editar")
-            editar_btn.clicked.connect(lambda checked, t=transacao: self.editar_transacao(t))
-            
-            excluir_btn = QPushButton("Excluir")
-            excluir_btn.clicked.connect(lambda checked, t=transacao: self.excluir_transacao(t))
-            
-            acoes_layout.addWidget(editar_btn)
-            acoes_layout.addWidget(excluir_btn)
-            acoes_layout.setContentsMargins(0, 0, 0, 0)
-            
-            self.tabela.setCellWidget(i, 5, acoes_widget)
-
-    def atualizar_graficos(self):
-        """Atualiza os gráficos do dashboard e relatórios."""
-        # Limpa as figuras
-        self.figura.clear()
-        self.figura_relatorio.clear()
-        
-        # Obtém dados para os gráficos
-        transacoes = self.db.get_transacoes()
-        categorias = {}
-        
-        for trans in transacoes:
-            if trans[1] == 'Despesa':  # Apenas despesas
-                categoria = trans[5]
-                valor = trans[2]
-                categorias[categoria] = categorias.get(categoria, 0) + valor
-        
-        if categorias:
-            # Gráfico do Dashboard (Pizza)
-            ax = self.figura.add_subplot(111)
-            valores = list(categorias.values())
-            labels = list(categorias.keys())
-            cores = [gerar_cor_categoria(cat) for cat in labels]
-            
-            ax.pie(valores, labels=labels, colors=cores, autopct='%1.1f%%')
-            ax.set_title('Distribuição de Despesas por Categoria')
-            
-            # Gráfico de Relatórios (Barras)
-            ax2 = self.figura_relatorio.add_subplot(111)
-            ax2.bar(labels, valores, color=cores)
-            ax2.set_title('Despesas por Categoria')
-            ax2.set_xlabel('Categorias')
-            ax2.set_ylabel('Valor (R$)')
-            plt.xticks(rotation=45)
+        self.historico_model.recarregar()
+
+    def _calcular_despesas_por_categoria(self):
+        """Busca as despesas por categoria (executado em segundo plano)."""
+        return dict(self.db.get_despesas_por_categoria())
+
+    def atualizar_graficos(self, geracao, categorias):
+        """Guarda as despesas por categoria carregadas e redesenha os gráficos."""
+        if geracao != self._geracao:
+            return
+        self._despesas_por_categoria = dict(categorias)
+        self._desenhar_graficos()
+
+    def _obter_graficos(self):
+        """Importa o matplotlib e cria os gráficos no primeiro uso."""
+        if self.graficos is None:
+            inicio = time.perf_counter()
+            from .graficos import GraficosDespesas
             
-            self.figura_relatorio.tight_layout()
+            self.graficos = GraficosDespesas(parent=self)
+            for espaco, canvas in ((self.grafico_dashboard, self.graficos.canvas_pizza),
+                                   (self.grafico_relatorio, self.graficos.canvas_barras)):
+                espaco.parentWidget().layout().replaceWidget(espaco, canvas)
+                espaco.deleteLater()
+            self.grafico_dashboard = self.graficos.canvas_pizza
+            self.grafico_relatorio = self.graficos.canvas_barras
+            logging.info(f"Gráficos carregados em {time.perf_counter() - inicio:.3f}s")
+        return self.graficos
+
+    def _desenhar_graficos(self):
+        """Envia as despesas por categoria em cache para os gráficos."""
+        self._obter_graficos().atualizar(self._despesas_por_categoria)
+
+    def _aplicar_delta(self, removida=None, inserida=None):
+        """
+        Reflete a alteração de uma transação sem recarregar a interface.
+
+        Ajusta os totais e as despesas por categoria em cache e o modelo do
+        histórico, redesenhando os gráficos apenas se alguma despesa mudou.
+        Enquanto um carregamento estiver em andamento o resultado dele pode
+        ou não incluir a alteração, então os dados são recarregados.
+
+        Args:
+            removida (Optional[tuple]): Linha antiga, no formato de get_transacoes()
+            inserida (Optional[tuple]): Linha nova, no formato de get_transacoes()
+        """
+        if self._tarefas or self._totais is None or self._despesas_por_categoria is None:
+            self.carregar_dados()
+            return
+        
+        despesas_mudaram = False
+        for linha, sinal in ((removida, -1), (inserida, 1)):
+            if linha is None:
+                continue
+            tipo, valor, categoria = linha[1], linha[2], linha[5]
+            self._totais[tipo] += sinal * valor
+            if tipo == 'Despesa':
+                total = self._despesas_por_categoria.get(categoria, 0) + sinal * valor
+                if total:
+                    self._despesas_por_categoria[categoria] = total
+                else:
+                    self._despesas_por_categoria.pop(categoria, None)
+                despesas_mudaram = True
+        
+        if removida is not None and inserida is not None:
+            self.historico_model.substituir_linha(removida, inserida)
+        elif removida is not None:
+            self.historico_model.remover_linha(removida[3], removida[0])
+        elif inserida is not None:
+            self.historico_model.inserir_linha(inserida)
+        
+        self._exibir_resumo()
+        if despesas_mudaram:
+            self._desenhar_graficos()
+
+    def _validar_campos(self, valor, data, descricao, parent=None):
+        """
+        Valida os campos de uma transação, avisando o usuário em caso de erro.
+
+        Returns:
+            Optional[int]: Valor em centavos, ou None se algum campo for inválido
+        """
+        parent = parent or self
+        valido, valor_centavos, erro = validar_valor(valor)
+        if not valido:
+            QMessageBox.warning(parent, "Erro", erro)
+            return None
         
-        # Atualiza os canvas
-        self.canvas.draw()
-        self.canvas_relatorio.draw()
+        valido, _, erro = validar_data(data)
+        if not valido:
+            QMessageBox.warning(parent, "Erro", erro)
+            return None
+        
+        valido, erro = validar_descricao(descricao)
+        if not valido:
+            QMessageBox.warning(parent, "Erro", erro)
+            return None
+        return valor_centavos
 
     def salvar_transacao(self):
         """Salva uma nova transação."""
-        # Validação dos dados
         tipo = self.tipo_combo.currentText()
         valor = self.valor_edit.text()
         data = self.data_edit.date().toString("yyyy-MM-dd")
         categoria = self.categoria_combo.currentText()
-        descricao = self.descricao_edit.toPlainText()
+        descricao = self.descricao_edit.text()
         
         # Validações
-        valido, valor_float, erro = validar_valor(valor)
-        if not valido:
-            QMessageBox.warning(self, "Erro", erro)
-            return
-        
-        valido, _, erro = validar_data(data)
-        if not valido:
-            QMessageBox.warning(self, "Erro", erro)
-            return
-        
-        valido, erro = validar_descricao(descricao)
-        if not valido:
-            QMessageBox.warning(self, "Erro", erro)
+        valor_centavos = self._validar_campos(valor, data, descricao)
+        if valor_centavos is None:
             return
         
         try:
             # Salva no banco de dados
-            self.db.add_transacao(tipo, valor_float, data, descricao, categoria)
+            id = self.db.add_transacao(tipo, valor_centavos, data, descricao, categoria)
             
             # Limpa o formulário
             self.valor_edit.clear()
@@ -305,7 +408,7 @@ class FinAssistWindow(QMainWindow):
             self.descricao_edit.clear()
             
             # Atualiza a interface
-            self.carregar_dados()
+            self._aplicar_delta(inserida=(id, tipo, valor_centavos, data, descricao, categoria))
             
             QMessageBox.information(self, "Sucesso", "Transação salva com sucesso!")
             
@@ -315,8 +418,29 @@ class FinAssistWindow(QMainWindow):
 
     def editar_transacao(self, transacao):
         """Abre o formulário para editar uma transação."""
-        # TODO: Implementar edição de transação
-        pass
+        dialogo = EditarTransacaoDialog(
+            transacao,
+            [self.categoria_combo.itemText(i) for i in range(self.categoria_combo.count())],
+            self
+        )
+        while dialogo.exec_() == QDialog.Accepted:
+            tipo, valor, data, categoria, descricao = dialogo.valores()
+            valor_centavos = self._validar_campos(valor, data, descricao, dialogo)
+            if valor_centavos is None:
+                continue
+            
+            try:
+                self.db.update_transacao(
+                    transacao.id, tipo, valor_centavos, data, descricao, categoria)
+                self._aplicar_delta(
+                    removida=linha_transacao(transacao),
+                    inserida=(transacao.id, tipo, valor_centavos, data, descricao, categoria)
+                )
+                QMessageBox.information(self, "Sucesso", "Transação atualizada com sucesso!")
+            except Exception as e:
+                logging.error(f"Erro ao atualizar transação: {e}")
+                QMessageBox.critical(self, "Erro", "Erro ao atualizar a transação.")
+            break
 
     def excluir_transacao(self, transacao):
         """Exclui uma transação após confirmação."""
@@ -333,8 +457,61 @@ class FinAssistWindow(QMainWindow):
         if resposta == QMessageBox.Yes:
             try:
                 self.db.delete_transacao(transacao.id)
-                self.carregar_dados()
+                self._aplicar_delta(removida=linha_transacao(transacao))
                 QMessageBox.information(self, "Sucesso", "Transação excluída com sucesso!")
             except Exception as e:
                 logging.error(f"Erro ao excluir transação: {e}")
                 QMessageBox.critical(self, "Erro", "Erro ao excluir a transação.")
+
+class EditarTransacaoDialog(QDialog):
+    """Formulário de edição de uma transação existente."""
+
+    def __init__(self, transacao, categorias, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Editar Transação")
+        layout = QGridLayout(self)
+        
+        layout.addWidget(QLabel("Tipo:"), 0, 0)
+        self.tipo_combo = QComboBox()
+        self.tipo_combo.addItems(["Receita", "Despesa"])
+        self.tipo_combo.setCurrentText(transacao.tipo)
+        layout.addWidget(self.tipo_combo, 0, 1)
+        
+        layout.addWidget(QLabel("Valor (R$):"), 1, 0)
+        self.valor_edit = QLineEdit(f"{transacao.valor // 100},{transacao.valor % 100:02d}")
+        layout.addWidget(self.valor_edit, 1, 1)
+        
+        layout.addWidget(QLabel("Data:"), 2, 0)
+        self.data_edit = QDateEdit()
+        self.data_edit.setCalendarPopup(True)
+        self.data_edit.setDate(QDate(transacao.data.year, transacao.data.month, transacao.data.day))
+        layout.addWidget(self.data_edit, 2, 1)
+        
+        layout.addWidget(QLabel("Categoria:"), 3, 0)
+        self.categoria_combo = QComboBox()
+        self.categoria_combo.addItems(categorias)
+        if transacao.categoria not in categorias:
+            self.categoria_combo.addItem(transacao.categoria)
+        self.categoria_combo.setCurrentText(transacao.categoria)
+        layout.addWidget(self.categoria_combo, 3, 1)
+        
+        layout.addWidget(QLabel("Descrição:"), 4, 0)
+        self.descricao_edit = QTextEdit()
+        self.descricao_edit.setPlainText(transacao.descricao or "")
+        self.descricao_edit.setMaximumHeight(100)
+        layout.addWidget(self.descricao_edit, 4, 1)
+        
+        botoes = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
+        botoes.accepted.connect(self.accept)
+        botoes.rejected.connect(self.reject)
+        layout.addWidget(botoes, 5, 0, 1, 2)
+
+    def valores(self):
+        """Retorna (tipo, valor digitado, data, categoria, descricao)."""
+        return (
+            self.tipo_combo.currentText(),
+            self.valor_edit.text(),
+            self.data_edit.date().toString("yyyy-MM-dd"),
+            self.categoria_combo.currentText(),
+            self.descricao_edit.toPlainText()
+        )
@@ -0,0 +1,357 @@
+"""
+Geração de bancos sintéticos para testes, benchmarks e reprodução de escala.
+
+Os dados seguem o esquema real (``DatabaseManager.init_database`` ou
+``schema.sql``) e são determinísticos: a mesma semente e a mesma data final
+produzem o mesmo banco. As despesas variam por categoria ao longo do ano, os
+salários entram todo mês e as descrições têm distribuição assimétrica (poucas
+muito frequentes e uma cauda longa de descrições raras).
+
+Durante a carga os índices e os triggers do resumo mensal são removidos; tudo
+é gravado em lotes de ``executemany`` em uma única transação e, no fim, os
+índices são recriados e o resumo mensal é calculado de uma vez.
+"""
+
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .database import (
+    DatabaseManager, PRAGMAS_CONEXAO, atualizar_esquema, reconstruir_busca,
+    reconstruir_resumo_mensal
+)
+
+ARQUIVO_ESQUEMA = Path(__file__).resolve().parent.parent / 'schema.sql'
+
+# Participação de cada categoria nas despesas, valor mediano (centavos) e
+# fator sazonal de janeiro a dezembro
+CATEGORIAS_DESPESA = {
+    'Alimentação': (0.38, 4_500, (1.0, 0.95, 1.0, 1.0, 1.0, 0.95, 1.0, 1.0, 0.95, 1.0, 1.05, 1.35)),
+    'Transporte': (0.22, 3_000, (0.9, 1.0, 1.05, 1.0, 1.0, 1.0, 1.15, 1.0, 1.0, 1.0, 1.0, 1.05)),
+    'Moradia': (0.06, 95_000, (1.0,) * 12),
+    'Lazer': (0.14, 8_000, (1.3, 1.4, 0.9, 0.9, 0.85, 0.9, 1.25, 0.9, 0.85, 0.9, 1.0, 1.5)),
+    'Saúde': (0.07, 12_000, (1.1, 1.0, 1.0, 1.05, 1.1, 1.15, 1.1, 1.05, 1.0, 0.95, 0.95, 0.9)),
+    'Educação': (0.05, 35_000, (1.9, 1.6, 1.0, 0.8, 0.8, 0.8, 1.3, 1.0, 0.8, 0.8, 0.7, 0.5)),
+    'Outros': (0.08, 6_000, (0.9, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.1, 1.4)),
+}
+
+# Descrições mais comuns de cada categoria, da mais para a menos frequente
+DESCRICOES = {
+    'Alimentação': ('Supermercado', 'Padaria', 'iFood', 'Restaurante', 'Feira', 'Açougue',
+                    'Lanchonete', 'Cafeteria', 'Hortifruti', 'Mercadinho'),
+    'Transporte': ('Uber', 'Combustível', 'Metrô', 'Ônibus', '99', 'Estacionamento',
+                   'Pedágio', 'Oficina'),
+    'Moradia': ('Aluguel', 'Condomínio', 'Energia elétrica', 'Água', 'Internet', 'Gás', 'IPTU'),
+    'Lazer': ('Cinema', 'Streaming', 'Bar', 'Show', 'Viagem', 'Livraria', 'Jogos'),
+    'Saúde': ('Farmácia', 'Consulta', 'Plano de saúde', 'Exames', 'Dentista', 'Academia'),
+    'Educação': ('Mensalidade escolar', 'Curso online', 'Material escolar', 'Livros', 'Idiomas'),
+    'Outros': ('Presente', 'Doação', 'Tarifa bancária', 'Assinatura', 'Pet shop', 'Vestuário'),
+    'Salário': ('Salário', 'Décimo terceiro'),
+    'Investimentos': ('Rendimento CDB', 'Dividendos', 'Tesouro Direto', 'Juros poupança'),
+}
+
+# Fração das descrições que ganha um complemento raro (estabelecimento, parcela...)
+FRACAO_CAUDA = 0.3
+
+@dataclass
+class ResultadoGeracao:
+    """
+    Estatísticas de uma geração de dados.
+
+    Attributes:
+        transacoes (int): Transações gravadas
+        orcamentos (int): Orçamentos gravados
+        metas (int): Metas gravadas
+        segundos (float): Duração total da geração
+    """
+    transacoes: int = 0
+    orcamentos: int = 0
+    metas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        """Retorna a vazão da geração em transações por segundo."""
+        if self.segundos <= 0:
+            return 0.0
+        return self.transacoes / self.segundos
+
+def _primeiro_dia(fim: date, anos: int) -> date:
+    """Primeiro dia do período de ``anos`` anos que termina no mês de ``fim``."""
+    if fim.month == 12:
+        return date(fim.year - anos + 1, 1, 1)
+    return date(fim.year - anos, fim.month + 1, 1)
+
+def _meses(inicio: date, fim: date) -> Iterator[tuple]:
+    """Produz (ano, mes) de ``inicio`` até ``fim``, inclusive."""
+    ano, mes = inicio.year, inicio.month
+    while (ano, mes) <= (fim.year, fim.month):
+        yield ano, mes
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+
+def _dias_do_mes(ano: int, mes: int, inicio: date, fim: date) -> tuple:
+    """Primeiro e último dia de (ano, mes) limitados ao intervalo gerado."""
+    primeiro = date(ano, mes, 1)
+    proximo = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return max(primeiro, inicio), min(proximo - timedelta(days=1), fim)
+
+def _pesos_acumulados(quantidade: int) -> list:
+    """Pesos acumulados de uma distribuição de Zipf com ``quantidade`` itens."""
+    acumulado, total = [], 0.0
+    for posicao in range(1, quantidade + 1):
+        total += 1 / posicao
+        acumulado.append(total)
+    return acumulado
+
+def _descricao(aleatorio: random.Random, categoria: str, pesos: dict) -> str:
+    """Sorteia uma descrição: as primeiras da lista saem com mais frequência."""
+    descricao = aleatorio.choices(DESCRICOES[categoria], cum_weights=pesos[categoria])[0]
+    if aleatorio.random() < FRACAO_CAUDA:
+        # Complementos com distribuição de Pareto: alguns repetem muito, a maioria é rara
+        descricao = f"{descricao} {int(aleatorio.paretovariate(1.2))}"
+    return descricao
+
+def gerar_transacoes(transacoes: int, anos: int = 3, semente: int = 42,
+                     data_final: Optional[date] = None) -> Iterator[tuple]:
+    """
+    Produz transações sintéticas em ordem de mês, sem guardá-las em memória.
+
+    Cada mês tem um salário no dia 5 (com reajuste anual e décimo terceiro em
+    dezembro) e rendimentos de investimento; o restante das ``transacoes`` é
+    dividido entre despesas conforme a participação e a sazonalidade de cada
+    categoria.
+
+    Args:
+        transacoes (int): Número aproximado de transações a gerar
+        anos (int): Anos cobertos, terminando em ``data_final``
+        semente (int): Semente do gerador pseudoaleatório
+        data_final (Optional[date]): Última data gerada; hoje se omitida
+
+    Yields:
+        tuple: (tipo, valor em centavos, data, descricao, categoria)
+    """
+    aleatorio = random.Random(semente)
+    fim = data_final or date.today()
+    inicio = _primeiro_dia(fim, anos)
+    meses = list(_meses(inicio, fim))
+
+    pesos = {categoria: _pesos_acumulados(len(descricoes))
+             for categoria, descricoes in DESCRICOES.items()}
+    categorias = list(CATEGORIAS_DESPESA)
+    peso_mes = [sum(participacao * sazonal[mes - 1]
+                    for participacao, _, sazonal in CATEGORIAS_DESPESA.values())
+                for _, mes in meses]
+    receitas_por_mes = 2
+    despesas = max(0, transacoes - receitas_por_mes * len(meses))
+    soma_pesos = sum(peso_mes)
+
+    salario = 650_000
+    gerados = 0.0
+    for indice, (ano, mes) in enumerate(meses):
+        primeiro, ultimo = _dias_do_mes(ano, mes, inicio, fim)
+        dias = (ultimo - primeiro).days
+
+        # Receitas recorrentes
+        if indice and mes == 1:
+            salario = salario * (100 + aleatorio.randint(3, 8)) // 100
+        dia_salario = date(ano, mes, min(5, ultimo.day))
+        yield ('Receita', salario, dia_salario.isoformat(), 'Salário', 'Salário')
+        if mes == 12:
+            yield ('Receita', salario, ultimo.isoformat(), 'Décimo terceiro', 'Salário')
+        yield ('Receita', aleatorio.randint(5_000, 80_000), ultimo.isoformat(),
+               _descricao(aleatorio, 'Investimentos', pesos), 'Investimentos')
+
+        # Despesas do mês, com a cota proporcional ao peso sazonal
+        gerados += despesas * peso_mes[indice] / soma_pesos
+        quantidade = int(gerados)
+        gerados -= quantidade
+        pesos_categorias = []
+        total = 0.0
+        for categoria in categorias:
+            participacao, _, sazonal = CATEGORIAS_DESPESA[categoria]
+            total += participacao * sazonal[mes - 1]
+            pesos_categorias.append(total)
+        for categoria in aleatorio.choices(categorias, cum_weights=pesos_categorias, k=quantidade):
+            mediana = CATEGORIAS_DESPESA[categoria][1]
+            valor = max(1, int(mediana * aleatorio.lognormvariate(0, 0.6)))
+            data = primeiro + timedelta(days=aleatorio.randint(0, dias))
+            yield ('Despesa', valor, data.isoformat(),
+                   _descricao(aleatorio, categoria, pesos), categoria)
+
+def _orcamentos(transacoes: int, anos: int, data_final: date) -> Iterator[tuple]:
+    """Orçamentos mensais de cada categoria de despesa, com folga sobre o esperado."""
+    meses = list(_meses(_primeiro_dia(data_final, anos), data_final))
+    por_mes = max(0, transacoes - 2 * len(meses)) / max(1, len(meses))
+    for ano, mes in meses:
+        for categoria, (participacao, mediana, sazonal) in CATEGORIAS_DESPESA.items():
+            esperado = por_mes * participacao * sazonal[mes - 1] * mediana * 1.2
+            # Limite arredondado para dezenas de reais
+            yield (categoria, max(1_000, int(esperado) // 1_000 * 1_000), mes, ano)
+
+def _metas(semente: int, data_final: date) -> list:
+    """Metas de poupança com prazos e progresso variados."""
+    aleatorio = random.Random(semente)
+    descricoes = ('Reserva de emergência', 'Viagem de férias', 'Troca do carro',
+                  'Entrada do apartamento', 'Curso de especialização')
+    metas = []
+    for descricao in descricoes:
+        inicio = data_final - timedelta(days=aleatorio.randint(30, 720))
+        fim = data_final + timedelta(days=aleatorio.randint(-60, 1_080))
+        fim = max(fim, inicio)
+        alvo = aleatorio.randint(10, 500) * 100_000
+        metas.append((descricao, alvo, alvo * aleatorio.randint(0, 100) // 100,
+                      inicio.isoformat(), fim.isoformat()))
+    return metas
+
+def _criar_esquema(caminho: str, esquema: str) -> None:
+    """Cria as tabelas pelo DatabaseManager ou pelo schema.sql do app Flask."""
+    if esquema == 'database':
+        DatabaseManager(caminho).close()
+    elif esquema == 'sql':
+        conn = sqlite3.connect(caminho)
+        try:
+            conn.executescript(ARQUIVO_ESQUEMA.read_text(encoding='utf-8'))
+            atualizar_esquema(conn)
+            conn.commit()
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"Esquema desconhecido: {esquema!r} (use 'database' ou 'sql')")
+
+def gerar_banco(caminho: str, transacoes: int, anos: int = 3, semente: int = 42,
+                data_final: Optional[date] = None, esquema: str = 'database',
+                tamanho_lote: int = 50_000) -> ResultadoGeracao:
+    """
+    Preenche um banco com dados sintéticos determinísticos.
+
+    Args:
+        caminho (str): Arquivo SQLite; criado com o esquema real se não existir
+        transacoes (int): Número aproximado de transações
+        anos (int): Anos cobertos pelas transações
+        semente (int): Semente do gerador pseudoaleatório
+        data_final (Optional[date]): Última data gerada; hoje se omitida
+        esquema (str): 'database' (DatabaseManager) ou 'sql' (schema.sql)
+        tamanho_lote (int): Linhas por chamada de ``executemany``
+
+    Returns:
+        ResultadoGeracao: Estatísticas da geração
+    """
+    data_final = data_final or date.today()
+    resultado = ResultadoGeracao()
+    inicio = time.perf_counter()
+    _criar_esquema(str(caminho), esquema)
+
+    conn = sqlite3.connect(str(caminho))
+    try:
+        for pragma in PRAGMAS_CONEXAO:
+            conn.execute(pragma)
+        conn.execute("BEGIN")
+        # Sem índices e triggers a carga é bem mais rápida; atualizar_esquema
+        # os recria no fim
+        objetos = conn.execute('''
+            SELECT type, name FROM sqlite_master
+            WHERE tbl_name = 'transacoes' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+        ''').fetchall()
+        for tipo, nome in objetos:
+            conn.execute(f"DROP {tipo.upper()} {nome}")
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO categorias (nome) VALUES (?)",
+            [(categoria,) for categoria in DESCRICOES]
+        )
+
+        lote = []
+        for transacao in gerar_transacoes(transacoes, anos, semente, data_final):
+            lote.append(transacao)
+            if len(lote) >= tamanho_lote:
+                conn.executemany('''
+                    INSERT INTO transacoes (tipo, valor, data, descricao, categoria)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', lote)
+                resultado.transacoes += len(lote)
+                lote.clear()
+                logging.info(
+                    f"{resultado.transacoes} transações geradas "
+                    f"({resultado.transacoes / (time.perf_counter() - inicio):.0f} linhas/s)"
+                )
+        if lote:
+            conn.executemany('''
+                INSERT INTO transacoes (tipo, valor, data, descricao, categoria)
+                VALUES (?, ?, ?, ?, ?)
+            ''', lote)
+            resultado.transacoes += len(lote)
+
+        cursor = conn.executemany('''
+            INSERT OR REPLACE INTO orcamentos (categoria, valor_limite, mes, ano)
+            VALUES (?, ?, ?, ?)
+        ''', _orcamentos(transacoes, anos, data_final))
+        resultado.orcamentos = cursor.rowcount
+        cursor = conn.executemany('''
+            INSERT INTO metas (descricao, valor_alvo, valor_atual, data_inicio, data_fim)
+            VALUES (?, ?, ?, ?, ?)
+        ''', _metas(semente, data_final))
+        resultado.metas = cursor.rowcount
+
+        atualizar_esquema(conn)
+        reconstruir_resumo_mensal(conn)
+        reconstruir_busca(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+    resultado.segundos = time.perf_counter() - inicio
+    logging.info(
+        f"Geração concluída: {resultado.transacoes} transações, {resultado.orcamentos} "
+        f"orçamentos e {resultado.metas} metas em {resultado.segundos:.1f}s"
+    )
+    return resultado
+
+def banco_sintetico(diretorio: str, transacoes: int, anos: int = 3, semente: int = 42,
+                    data_final: Optional[date] = None, esquema: str = 'database') -> Path:
+    """
+    Retorna um banco sintético com os parâmetros pedidos, gerando-o na primeira vez.
+
+    O arquivo é nomeado pelos parâmetros e reaproveitado nas chamadas
+    seguintes, o que o torna adequado como fixture de testes e benchmarks.
+
+    Returns:
+        Path: Caminho do arquivo SQLite
+    """
+    data_final = data_final or date.today()
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / (f"sintetico_{esquema}_{transacoes}_{anos}a_s{semente}_"
+                           f"{data_final:%Y%m%d}.db")
+    if not caminho.exists():
+        temporario = caminho.with_suffix('.tmp')
+        for sufixo in ('', '-wal', '-shm'):
+            Path(f"{temporario}{sufixo}").unlink(missing_ok=True)
+        gerar_banco(temporario, transacoes, anos, semente, data_final, esquema)
+        os.replace(temporario, caminho)
+    return caminho
+
+@contextmanager
+def banco_temporario(transacoes: int = 1_000, **opcoes) -> Iterator[DatabaseManager]:
+    """
+    Fornece um DatabaseManager sobre um banco sintético descartável.
+
+    Exemplo (fixture do pytest)::
+
+        @pytest.fixture
+        def db():
+            with banco_temporario(10_000, semente=1) as db:
+                yield db
+    """
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = Path(diretorio) / 'fin_assist.db'
+        gerar_banco(caminho, transacoes, **opcoes)
+        with DatabaseManager(str(caminho)) as db:
+            yield db
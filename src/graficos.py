@@ -0,0 +1,131 @@
+"""
+Gráficos de despesas por categoria da interface desktop.
+
+Os eixos, fatias, barras e rótulos são criados uma única vez e depois só
+têm os dados alterados. Uma série igual à já desenhada é ignorada, e
+atualizações em sequência rápida são agrupadas em um único redesenho.
+"""
+
+import math
+import time
+
+from PyQt5.QtCore import QTimer
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+from .utils import gerar_cor_categoria
+
+class GraficosDespesas:
+    """
+    Gráfico de pizza (Dashboard) e de barras (Relatórios) das despesas por categoria.
+
+    Attributes:
+        canvas_pizza (FigureCanvas): Widget do gráfico de pizza
+        canvas_barras (FigureCanvas): Widget do gráfico de barras
+        intervalo_ms (int): Intervalo mínimo entre dois redesenhos
+    """
+
+    # Distâncias dos rótulos usadas por Axes.pie
+    DISTANCIA_ROTULO = 1.1
+    DISTANCIA_PERCENTUAL = 0.6
+
+    def __init__(self, intervalo_ms=250, parent=None):
+        self.figura_pizza = Figure(figsize=(8, 6))
+        self.canvas_pizza = FigureCanvas(self.figura_pizza)
+        self.figura_barras = Figure(figsize=(8, 6))
+        self.canvas_barras = FigureCanvas(self.figura_barras)
+        self.intervalo_ms = intervalo_ms
+
+        self._categorias = None   # categorias dos artistas atuais, em ordem
+        self._serie = None        # última série desenhada
+        self._pendente = None     # série aguardando o próximo redesenho
+        self._ultimo_desenho = 0.0
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._desenhar_pendente)
+
+    def atualizar(self, despesas_por_categoria):
+        """
+        Agenda o redesenho com as despesas por categoria (em centavos).
+
+        Séries iguais à desenhada não fazem nada; chamadas dentro do intervalo
+        mínimo são agrupadas e apenas a última série é desenhada.
+        """
+        serie = tuple(sorted(
+            (categoria, total) for categoria, total in despesas_por_categoria.items() if total
+        ))
+        if serie == self._serie:
+            self._pendente = None
+            self._timer.stop()
+            return
+        self._pendente = serie
+        decorrido = (time.monotonic() - self._ultimo_desenho) * 1000
+        if decorrido >= self.intervalo_ms:
+            self._desenhar_pendente()
+        elif not self._timer.isActive():
+            self._timer.start(int(self.intervalo_ms - decorrido))
+
+    def _desenhar_pendente(self):
+        serie, self._pendente = self._pendente, None
+        if serie is None or serie == self._serie:
+            return
+        self._ultimo_desenho = time.monotonic()
+        categorias = [categoria for categoria, _ in serie]
+        valores = [total / 100 for _, total in serie]  # em reais
+
+        if categorias != self._categorias:
+            self._criar_artistas(categorias, valores)
+        else:
+            self._atualizar_pizza(valores)
+            self._atualizar_barras(valores)
+        self._serie = serie
+        self.canvas_pizza.draw_idle()
+        self.canvas_barras.draw_idle()
+
+    def _criar_artistas(self, categorias, valores):
+        """Recria os gráficos; só acontece quando o conjunto de categorias muda."""
+        self.figura_pizza.clear()
+        self.figura_barras.clear()
+        self._categorias = categorias
+        if not categorias:
+            return
+        cores = [gerar_cor_categoria(categoria) for categoria in categorias]
+
+        ax = self.figura_pizza.add_subplot(111)
+        self._fatias, self._rotulos, self._percentuais = ax.pie(
+            valores, labels=categorias, colors=cores, autopct='%1.1f%%',
+            labeldistance=self.DISTANCIA_ROTULO, pctdistance=self.DISTANCIA_PERCENTUAL
+        )
+        ax.set_title('Distribuição de Despesas por Categoria')
+
+        self._eixo_barras = self.figura_barras.add_subplot(111)
+        self._barras = self._eixo_barras.bar(categorias, valores, color=cores)
+        self._eixo_barras.set_title('Despesas por Categoria')
+        self._eixo_barras.set_xlabel('Categorias')
+        self._eixo_barras.set_ylabel('Valor (R$)')
+        self._eixo_barras.tick_params(axis='x', labelrotation=45)
+        self.figura_barras.tight_layout()
+
+    def _atualizar_pizza(self, valores):
+        """Ajusta ângulos e rótulos das fatias existentes, como Axes.pie os posiciona."""
+        total = sum(valores)
+        angulo = 0.0
+        for fatia, rotulo, percentual, valor in zip(
+                self._fatias, self._rotulos, self._percentuais, valores):
+            fracao = valor / total if total else 0.0
+            inicio, angulo = angulo, angulo + 360 * fracao
+            fatia.set_theta1(inicio)
+            fatia.set_theta2(angulo)
+            meio = math.radians((inicio + angulo) / 2)
+            x, y = math.cos(meio), math.sin(meio)
+            rotulo.set_position((self.DISTANCIA_ROTULO * x, self.DISTANCIA_ROTULO * y))
+            rotulo.set_horizontalalignment('left' if x > 0 else 'right')
+            percentual.set_position((self.DISTANCIA_PERCENTUAL * x, self.DISTANCIA_PERCENTUAL * y))
+            percentual.set_text(f'{100 * fracao:1.1f}%')
+
+    def _atualizar_barras(self, valores):
+        """Altera a altura das barras existentes e reajusta a escala do eixo."""
+        for barra, valor in zip(self._barras, valores):
+            barra.set_height(valor)
+        self._eixo_barras.relim()
+        self._eixo_barras.autoscale_view(scalex=False)
@@ -0,0 +1,206 @@
+"""
+Modelo e delegate da aba Histórico.
+
+As transações são buscadas do banco em páginas (paginação por cursor) à
+medida que a tabela é rolada, e os botões de ação são desenhados pelo
+delegate em vez de criados como widgets, de modo que o custo da aba
+acompanha as linhas exibidas e não o total de transações.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from .models import Transacao
+from .utils import formatar_data, formatar_valor_monetario
+
+# Índices das colunas de DatabaseManager.get_transacoes()
+ID, TIPO, VALOR, DATA, DESCRICAO, CATEGORIA = range(6)
+
+def linha_transacao(transacao):
+    """Converte uma Transacao para a tupla no formato de get_transacoes()."""
+    dados = transacao.to_dict()
+    return (dados['id'], dados['tipo'], dados['valor'], dados['data'],
+            dados['descricao'], dados['categoria'])
+
+class TransacoesTableModel(QAbstractTableModel):
+    """Modelo de transações carregado sob demanda via canFetchMore/fetchMore."""
+
+    COLUNAS = ["Data", "Tipo", "Valor", "Categoria", "Descrição", "Ações"]
+    COLUNA_ACOES = 5
+
+    def __init__(self, db, tamanho_pagina=200, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.tamanho_pagina = tamanho_pagina
+        self._linhas = []
+        self._cursor = None
+        self._tem_mais = True
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._linhas)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.COLUNAS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUNAS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        linha = self._linhas[index.row()]
+        coluna = index.column()
+
+        if role == Qt.DisplayRole:
+            if coluna == 0:
+                return formatar_data(linha[DATA])
+            if coluna == 1:
+                return linha[TIPO]
+            if coluna == 2:
+                return formatar_valor_monetario(linha[VALOR])
+            if coluna == 3:
+                return linha[CATEGORIA]
+            if coluna == 4:
+                return linha[DESCRICAO]
+        elif role == Qt.ForegroundRole and coluna == 2:
+            return QColor("#2ecc71") if linha[TIPO] == 'Receita' else QColor("#e74c3c")
+        elif role == Qt.UserRole:
+            return linha
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._tem_mais
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._tem_mais:
+            return
+        pagina, self._cursor = self.db.get_pagina_transacoes(
+            after=self._cursor, limit=self.tamanho_pagina
+        )
+        self._tem_mais = self._cursor is not None
+        if pagina:
+            inicio = len(self._linhas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina) - 1)
+            self._linhas.extend(pagina)
+            self.endInsertRows()
+
+    def recarregar(self):
+        """Descarta as linhas carregadas; a view volta a buscar a primeira página."""
+        self.beginResetModel()
+        self._linhas = []
+        self._cursor = None
+        self._tem_mais = True
+        self.endResetModel()
+
+    def _posicao(self, data, id):
+        """Índice onde a chave (data, id) entra na ordem decrescente das linhas."""
+        chave = (data, id)
+        inicio, fim = 0, len(self._linhas)
+        while inicio < fim:
+            meio = (inicio + fim) // 2
+            linha = self._linhas[meio]
+            if (linha[DATA], linha[ID]) > chave:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio
+
+    def inserir_linha(self, linha):
+        """
+        Insere uma transação nova na posição ordenada, sem recarregar o modelo.
+
+        Se a linha cair depois da última carregada e ainda houver páginas a
+        buscar, ela não é inserida: o fetchMore seguinte a trará.
+        """
+        posicao = self._posicao(linha[DATA], linha[ID])
+        if posicao == len(self._linhas) and self._tem_mais:
+            return
+        self.beginInsertRows(QModelIndex(), posicao, posicao)
+        self._linhas.insert(posicao, tuple(linha))
+        self.endInsertRows()
+
+    def remover_linha(self, data, id):
+        """Remove a transação (data, id) se ela estiver carregada."""
+        posicao = self._posicao(data, id)
+        if posicao < len(self._linhas) and self._linhas[posicao][ID] == id:
+            self.beginRemoveRows(QModelIndex(), posicao, posicao)
+            del self._linhas[posicao]
+            self.endRemoveRows()
+
+    def substituir_linha(self, antiga, nova):
+        """Atualiza uma transação editada; muda de posição se a data mudou."""
+        posicao = self._posicao(antiga[DATA], antiga[ID])
+        carregada = posicao < len(self._linhas) and self._linhas[posicao][ID] == antiga[ID]
+        if carregada and antiga[DATA] == nova[DATA]:
+            self._linhas[posicao] = tuple(nova)
+            self.dataChanged.emit(
+                self.index(posicao, 0), self.index(posicao, self.COLUNA_ACOES - 1))
+            return
+        self.remover_linha(antiga[DATA], antiga[ID])
+        self.inserir_linha(nova)
+
+    def transacao(self, row):
+        """Cria a Transacao da linha ``row`` apenas quando ela é necessária."""
+        linha = self._linhas[row]
+        return Transacao.from_dict({
+            'id': linha[ID],
+            'tipo': linha[TIPO],
+            'valor': linha[VALOR],
+            'data': linha[DATA],
+            'descricao': linha[DESCRICAO],
+            'categoria': linha[CATEGORIA]
+        })
+
+class AcoesDelegate(QStyledItemDelegate):
+    """Desenha os botões Editar/Excluir da coluna de ações e trata os cliques."""
+
+    editar_clicado = pyqtSignal(int)
+    excluir_clicado = pyqtSignal(int)
+
+    BOTOES = ("Editar", "Excluir")
+    MARGEM = 2
+
+    def _retangulos(self, rect):
+        """Divide a célula em um retângulo por botão."""
+        largura = rect.width() // len(self.BOTOES)
+        return [
+            QRect(rect.x() + i * largura, rect.y(), largura, rect.height())
+            .adjusted(self.MARGEM, self.MARGEM, -self.MARGEM, -self.MARGEM)
+            for i in range(len(self.BOTOES))
+        ]
+
+    def paint(self, painter, option, index):
+        estilo = option.widget.style() if option.widget else QApplication.style()
+        for texto, rect in zip(self.BOTOES, self._retangulos(option.rect)):
+            botao = QStyleOptionButton()
+            botao.rect = rect
+            botao.text = texto
+            botao.state = QStyle.State_Enabled
+            estilo.drawControl(QStyle.CE_PushButton, botao, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        tamanho = super().sizeHint(option, index)
+        metricas = option.fontMetrics
+        largura = sum(metricas.horizontalAdvance(texto) + 24 for texto in self.BOTOES)
+        tamanho.setWidth(max(tamanho.width(), largura))
+        return tamanho
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            editar, excluir = self._retangulos(option.rect)
+            if editar.contains(event.pos()):
+                self.editar_clicado.emit(index.row())
+                return True
+            if excluir.contains(event.pos()):
+                self.excluir_clicado.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
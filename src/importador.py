@@ -0,0 +1,179 @@
+"""
+Importação de extratos bancários em CSV.
+
+O arquivo é lido linha a linha e as linhas válidas são gravadas em lotes
+com ``executemany``, de modo que o uso de memória não depende do tamanho do
+arquivo. Linhas inválidas são copiadas para um arquivo de rejeitos com o
+motivo da rejeição.
+"""
+
+import csv
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from .utils import validar_valor, validar_data, validar_descricao, validar_categoria
+
+COLUNAS = ('data', 'tipo', 'valor', 'categoria', 'descricao')
+TIPOS = {'receita': 'Receita', 'despesa': 'Despesa'}
+
+@dataclass
+class ResultadoImportacao:
+    """
+    Estatísticas de uma importação.
+    
+    Attributes:
+        lidas (int): Linhas de dados lidas do arquivo
+        importadas (int): Linhas gravadas no banco
+        rejeitadas (int): Linhas enviadas para o arquivo de rejeitos
+        segundos (float): Duração total da importação
+    """
+    lidas: int = 0
+    importadas: int = 0
+    rejeitadas: int = 0
+    segundos: float = 0.0
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        """Retorna a vazão da importação em linhas lidas por segundo."""
+        if self.segundos <= 0:
+            return 0.0
+        return self.lidas / self.segundos
+
+def _normalizar_coluna(nome: str) -> str:
+    """Normaliza o nome de uma coluna do cabeçalho (ex: 'Descrição' -> 'descricao')."""
+    nome = nome.strip().lower()
+    return nome.replace('ç', 'c').replace('ã', 'a').replace('á', 'a')
+
+def validar_linha(linha: dict) -> Tuple[Optional[tuple], Optional[str]]:
+    """
+    Valida uma linha do CSV com as mesmas regras dos formulários.
+    
+    Quando a coluna ``tipo`` está vazia, valores negativos são tratados como
+    despesa e positivos como receita, como nos extratos bancários.
+    
+    Args:
+        linha (dict): Linha com as colunas normalizadas
+        
+    Returns:
+        Tuple[Optional[tuple], Optional[str]]:
+            - Tupla (tipo, valor, data, descricao, categoria) se válida
+            - Mensagem de erro se inválida
+    """
+    valor = (linha.get('valor') or '').strip()
+    tipo = (linha.get('tipo') or '').strip().lower()
+    if not tipo:
+        tipo = 'despesa' if valor.startswith('-') else 'receita'
+    if tipo not in TIPOS:
+        return None, "Tipo deve ser 'Receita' ou 'Despesa'"
+    valor = valor.lstrip('-+')
+
+    valido, valor_centavos, erro = validar_valor(valor)
+    if not valido:
+        return None, erro
+
+    valido, data_obj, erro = validar_data((linha.get('data') or '').strip())
+    if not valido:
+        return None, erro
+
+    categoria = (linha.get('categoria') or '').strip() or 'Outros'
+    valido, erro = validar_categoria(categoria)
+    if not valido:
+        return None, erro
+
+    descricao = (linha.get('descricao') or '').strip()
+    valido, erro = validar_descricao(descricao)
+    if not valido:
+        return None, erro
+
+    return (TIPOS[tipo], valor_centavos, data_obj.strftime("%Y-%m-%d"), descricao, categoria), None
+
+def _detectar_delimitador(arquivo, padrao: str = ',') -> str:
+    """Detecta o delimitador (',' ou ';') pelas primeiras linhas do arquivo."""
+    amostra = arquivo.read(4096)
+    arquivo.seek(0)
+    try:
+        return csv.Sniffer().sniff(amostra, delimiters=',;\t').delimiter
+    except csv.Error:
+        return padrao
+
+def ler_linhas(arquivo, delimitador: Optional[str] = None) -> Iterator[Tuple[dict, List[str]]]:
+    """
+    Lê o CSV linha a linha.
+    
+    Yields:
+        Tuple[dict, List[str]]: Linha com colunas normalizadas e os campos originais
+    """
+    if delimitador is None:
+        delimitador = _detectar_delimitador(arquivo)
+    leitor = csv.reader(arquivo, delimiter=delimitador)
+    cabecalho = [_normalizar_coluna(c) for c in next(leitor, [])]
+    if 'valor' not in cabecalho or 'data' not in cabecalho:
+        raise ValueError("O arquivo deve conter ao menos as colunas 'data' e 'valor'")
+    for campos in leitor:
+        if not any(campo.strip() for campo in campos):
+            continue
+        yield dict(zip(cabecalho, campos)), campos
+
+def importar_csv(db, caminho: str, arquivo_rejeitos: Optional[str] = None,
+                 tamanho_lote: int = 5000, delimitador: Optional[str] = None,
+                 encoding: str = 'utf-8-sig') -> ResultadoImportacao:
+    """
+    Importa transações de um arquivo CSV.
+    
+    Args:
+        db (DatabaseManager): Banco de destino
+        caminho (str): Caminho do arquivo CSV
+        arquivo_rejeitos (Optional[str]): Arquivo onde gravar as linhas inválidas;
+            por padrão ``<caminho>.rejeitos.csv``. Removido se não houver rejeitos
+        tamanho_lote (int): Linhas gravadas por transação do banco
+        delimitador (Optional[str]): Delimitador do CSV; detectado se omitido
+        encoding (str): Codificação do arquivo
+        
+    Returns:
+        ResultadoImportacao: Estatísticas da importação
+    """
+    if arquivo_rejeitos is None:
+        arquivo_rejeitos = f"{caminho}.rejeitos.csv"
+
+    resultado = ResultadoImportacao()
+    inicio = time.perf_counter()
+    lote = []
+    escritor_rejeitos = None
+
+    with open(caminho, newline='', encoding=encoding) as arquivo, \
+            open(arquivo_rejeitos, 'w', newline='', encoding='utf-8') as rejeitos:
+        for numero, (linha, campos) in enumerate(ler_linhas(arquivo, delimitador), start=2):
+            resultado.lidas += 1
+            transacao, erro = validar_linha(linha)
+            if erro:
+                if escritor_rejeitos is None:
+                    escritor_rejeitos = csv.writer(rejeitos)
+                    escritor_rejeitos.writerow(['linha', 'erro', 'campos'])
+                escritor_rejeitos.writerow([numero, erro, *campos])
+                resultado.rejeitadas += 1
+                continue
+
+            lote.append(transacao)
+            if len(lote) >= tamanho_lote:
+                resultado.importadas += db.add_transacoes(lote)
+                lote.clear()
+                logging.info(
+                    f"{resultado.importadas} transações importadas "
+                    f"({resultado.lidas / (time.perf_counter() - inicio):.0f} linhas/s)"
+                )
+
+        if lote:
+            resultado.importadas += db.add_transacoes(lote)
+
+    if resultado.rejeitadas == 0:
+        os.remove(arquivo_rejeitos)
+
+    resultado.segundos = time.perf_counter() - inicio
+    logging.info(
+        f"Importação concluída: {resultado.importadas} importadas, "
+        f"{resultado.rejeitadas} rejeitadas, {resultado.linhas_por_segundo:.0f} linhas/s"
+    )
+    return resultado
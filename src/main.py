@@ -1,14 +1,40 @@
 import sys
 import logging
 import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QFont
-from .fin_assist_ui import FinAssistWindow
 
 # Configurar o backend Qt para usar offscreen
 os.environ["QT_QPA_PLATFORM"] = "offscreen"
 
+class PerfilInicializacao:
+    """Tempos de cada fase da inicialização, exibidos com --profile-startup."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.fases = []
+
+    @contextmanager
+    def fase(self, nome):
+        """Mede o bloco ``with`` e os módulos importados durante ele."""
+        modulos = len(sys.modules)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases.append((nome, time.perf_counter() - inicio, len(sys.modules) - modulos))
+
+    def relatorio(self):
+        """Monta a tabela de fases e o tempo total até a primeira janela."""
+        linhas = ["Inicialização do Fin Assist:"]
+        for nome, segundos, modulos in self.fases:
+            linhas.append(f"  {nome:<32} {segundos * 1000:8.1f} ms  {modulos:5d} módulos")
+        linhas.append(f"  {'até a primeira janela':<32} "
+                      f"{(time.perf_counter() - self.inicio) * 1000:8.1f} ms")
+        linhas.append(f"  matplotlib carregado: {'sim' if 'matplotlib' in sys.modules else 'não'}")
+        return "\n".join(linhas)
+
 def setup_logging():
     """Configura o sistema de logging da aplicação."""
     # Cria o diretório de logs se não existir
@@ -27,27 +53,51 @@ def setup_logging():
 
 def setup_font():
     """Configura a fonte padrão da aplicação."""
+    from PyQt5.QtGui import QFont
+    from PyQt5.QtWidgets import QApplication
+
     font = QFont()
     font.setFamily("Segoe UI")  # Fonte moderna e legível
     font.setPointSize(10)
     QApplication.setFont(font)
 
-def main():
-    """Função principal que inicia a aplicação."""
+def main(profile_startup=False):
+    """
+    Função principal que inicia a aplicação.
+
+    Args:
+        profile_startup (bool): Exibe o tempo de cada fase até a primeira janela
+    """
+    perfil = PerfilInicializacao()
     try:
         # Configura o logging
-        setup_logging()
+        with perfil.fase("logging"):
+            setup_logging()
         logging.info("Iniciando Fin Assist...")
         
-        # Cria a aplicação Qt
-        app = QApplication(sys.argv)
+        # PyQt5 e a janela são importados só aqui, e o matplotlib só quando
+        # o primeiro gráfico é desenhado
+        with perfil.fase("import PyQt5"):
+            from PyQt5.QtCore import QTimer
+            from PyQt5.QtWidgets import QApplication
+        with perfil.fase("import fin_assist_ui"):
+            from .fin_assist_ui import FinAssistWindow
         
-        # Configura a fonte padrão
-        setup_font()
+        # Cria a aplicação Qt
+        with perfil.fase("QApplication"):
+            app = QApplication(sys.argv)
+            # Configura a fonte padrão
+            setup_font()
         
         # Cria e exibe a janela principal
-        window = FinAssistWindow()
-        window.show()
+        with perfil.fase("FinAssistWindow"):
+            window = FinAssistWindow()
+        with perfil.fase("show"):
+            window.show()
+        
+        if profile_startup:
+            # Executa quando o loop de eventos processa a primeira janela
+            QTimer.singleShot(0, lambda: print(perfil.relatorio(), flush=True))
         
         # Inicia o loop de eventos
         sys.exit(app.exec_())
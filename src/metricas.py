@@ -0,0 +1,198 @@
+"""
+Métricas de latência das rotas e das consultas SQL, no formato do Prometheus.
+
+As medições ficam em memória em histogramas de buckets fixos e contadores,
+protegidos por um único lock; registrar uma observação custa uma busca
+binária e algumas somas, o que permite deixar a coleta sempre ligada.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# Limites dos buckets, em segundos
+BUCKETS_REQUISICAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTA = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Consultas distintas rotuladas individualmente; as demais vão para 'outras'
+MAX_CONSULTAS = 500
+
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+class Histograma:
+    """Contagem de observações por bucket, com soma e total."""
+
+    __slots__ = ('limites', 'contagens', 'soma', 'total')
+
+    def __init__(self, limites):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)  # o último é o +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+def _escapar(valor):
+    """Escapa um valor de rótulo conforme o formato de texto do Prometheus."""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _rotulos(nomes, valores, extra=''):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+def _formatar_numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class RegistroMetricas:
+    """
+    Métricas de requisições HTTP e de consultas ao banco.
+
+    Attributes:
+        requisicoes (dict): Histograma de latência por (rota, método)
+        status (dict): Contagem de respostas por (rota, método, status)
+        em_andamento (int): Requisições sendo atendidas no momento
+        consultas (dict): Histograma de duração por consulta normalizada
+        linhas (dict): Linhas lidas ou alteradas por consulta normalizada
+    """
+
+    def __init__(self, prefixo='fin_assist'):
+        self.prefixo = prefixo
+        self._lock = threading.Lock()
+        self.requisicoes = {}
+        self.status = {}
+        self.em_andamento = 0
+        self.consultas = {}
+        self.linhas = {}
+        self._nomes_consultas = {}
+
+    def iniciar_requisicao(self):
+        with self._lock:
+            self.em_andamento += 1
+
+    def finalizar_requisicao(self):
+        with self._lock:
+            self.em_andamento -= 1
+
+    def registrar_requisicao(self, rota, metodo, status, segundos):
+        """Registra a latência e o status de uma resposta."""
+        chave = (rota, metodo)
+        with self._lock:
+            histograma = self.requisicoes.get(chave)
+            if histograma is None:
+                histograma = self.requisicoes[chave] = Histograma(BUCKETS_REQUISICAO)
+            histograma.observar(segundos)
+            chave_status = (rota, metodo, str(status))
+            self.status[chave_status] = self.status.get(chave_status, 0) + 1
+
+    def _nome_consulta(self, query):
+        """Normaliza os espaços do SQL; o resultado é guardado por texto original."""
+        nome = self._nomes_consultas.get(query)
+        if nome is None:
+            nome = ' '.join(query.split())
+            if len(self._nomes_consultas) >= MAX_CONSULTAS:
+                return 'outras'
+            self._nomes_consultas[query] = nome
+        return nome
+
+    def registrar_consulta(self, query, segundos, linhas):
+        """Registra a duração de uma consulta e o número de linhas envolvidas."""
+        with self._lock:
+            nome = self._nome_consulta(query)
+            histograma = self.consultas.get(nome)
+            if histograma is None:
+                histograma = self.consultas[nome] = Histograma(BUCKETS_CONSULTA)
+            histograma.observar(segundos)
+            if linhas is not None and linhas >= 0:
+                self.linhas[nome] = self.linhas.get(nome, 0) + linhas
+
+    def _histogramas(self, linhas, nome, ajuda, nomes_rotulos, histogramas):
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} histogram')
+        for valores, histograma in sorted(histogramas.items()):
+            if not isinstance(valores, tuple):
+                valores = (valores,)
+            acumulado = 0
+            for limite, contagem in zip(histograma.limites, histograma.contagens):
+                acumulado += contagem
+                rotulos = _rotulos(nomes_rotulos, valores, f'le="{limite}"')
+                linhas.append(f'{nome}_bucket{rotulos} {acumulado}')
+            rotulos = _rotulos(nomes_rotulos, valores, 'le="+Inf"')
+            linhas.append(f'{nome}_bucket{rotulos} {histograma.total}')
+            rotulos = _rotulos(nomes_rotulos, valores)
+            linhas.append(f'{nome}_sum{rotulos} {_formatar_numero(histograma.soma)}')
+            linhas.append(f'{nome}_count{rotulos} {histograma.total}')
+
+    def _contadores(self, linhas, nome, ajuda, tipo, nomes_rotulos, valores_por_chave):
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} {tipo}')
+        for valores, valor in sorted(valores_por_chave.items()):
+            if not isinstance(valores, tuple):
+                valores = (valores,)
+            linhas.append(f'{nome}{_rotulos(nomes_rotulos, valores)} {_formatar_numero(valor)}')
+
+    def exportar(self):
+        """Retorna todas as métricas no formato de texto do Prometheus."""
+        p = self.prefixo
+        linhas = []
+        with self._lock:
+            self._histogramas(
+                linhas, f'{p}_requisicao_duracao_segundos',
+                'Latência das requisições HTTP por rota.',
+                ('rota', 'metodo'), self.requisicoes)
+            self._contadores(
+                linhas, f'{p}_requisicoes_total',
+                'Respostas HTTP por rota e status.', 'counter',
+                ('rota', 'metodo', 'status'), self.status)
+            self._contadores(
+                linhas, f'{p}_requisicoes_em_andamento',
+                'Requisições HTTP sendo atendidas.', 'gauge',
+                (), {(): self.em_andamento})
+            self._histogramas(
+                linhas, f'{p}_consulta_duracao_segundos',
+                'Duração das consultas SQL feitas pelo DatabaseManager.',
+                ('consulta',), self.consultas)
+            self._contadores(
+                linhas, f'{p}_consulta_linhas_total',
+                'Linhas lidas ou alteradas por consulta SQL.', 'counter',
+                ('consulta',), self.linhas)
+        return '\n'.join(linhas) + '\n'
+
+def instrumentar_app(app, registro, rota_metricas='/metrics'):
+    """
+    Mede todas as requisições de um app Flask e expõe ``rota_metricas``.
+
+    A latência é registrada pela regra da rota (ex: '/atualizar_meta/<int:id>'),
+    de modo que o número de séries não cresce com os parâmetros da URL.
+    """
+    from flask import Response, g, request
+
+    @app.before_request
+    def _iniciar_medicao():
+        g._inicio_metricas = time.perf_counter()
+        registro.iniciar_requisicao()
+
+    @app.after_request
+    def _registrar_medicao(resposta):
+        inicio = g.pop('_inicio_metricas', None)
+        if inicio is not None:
+            rota = request.url_rule.rule if request.url_rule else '<sem rota>'
+            registro.registrar_requisicao(
+                rota, request.method, resposta.status_code, time.perf_counter() - inicio)
+            registro.finalizar_requisicao()
+        return resposta
+
+    @app.teardown_request
+    def _finalizar_medicao(erro):
+        # Requisições que terminaram sem passar pelo after_request
+        if g.pop('_inicio_metricas', None) is not None:
+            registro.finalizar_requisicao()
+
+    def metricas():
+        return Response(registro.exportar(), content_type=TIPO_CONTEUDO)
+
+    app.add_url_rule(rota_metricas, 'metricas', metricas)
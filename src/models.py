@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from .utils import formatar_valor_monetario
+
 @dataclass
 class Transacao:
     """
@@ -9,14 +11,14 @@ class Transacao:
     
     Attributes:
         tipo (str): Tipo da transação ('Receita' ou 'Despesa')
-        valor (float): Valor da transação
+        valor (int): Valor da transação em centavos
         data (datetime): Data da transação
         categoria (str): Categoria da transação
         descricao (str): Descrição opcional da transação
         id (Optional[int]): ID único da transação no banco de dados
     """
     tipo: str
-    valor: float
+    valor: int
     data: datetime
     categoria: str
     descricao: str = ""
@@ -44,7 +46,7 @@ class Transacao:
     @property
     def valor_formatado(self) -> str:
         """Retorna o valor formatado como moeda brasileira."""
-        return f"R$ {self.valor:,.2f}"
+        return formatar_valor_monetario(self.valor)
 
     def to_dict(self) -> dict:
         """Converte a transação para um dicionário."""
@@ -62,7 +64,7 @@ class Transacao:
         """Cria uma instância de Transacao a partir de um dicionário."""
         return cls(
             tipo=data['tipo'],
-            valor=float(data['valor']),
+            valor=int(data['valor']),
             data=data['data'],
             categoria=data['categoria'],
             descricao=data.get('descricao', ''),
@@ -75,34 +77,34 @@ class ResumoFinanceiro:
     Classe que representa um resumo financeiro.
     
     Attributes:
-        receitas (float): Total de receitas
-        despesas (float): Total de despesas
-        saldo (float): Saldo (receitas - despesas)
+        receitas (int): Total de receitas em centavos
+        despesas (int): Total de despesas em centavos
+        saldo (int): Saldo (receitas - despesas) em centavos
     """
-    receitas: float
-    despesas: float
-    saldo: float
+    receitas: int
+    despesas: int
+    saldo: int
 
     @property
     def receitas_formatado(self) -> str:
         """Retorna o total de receitas formatado como moeda brasileira."""
-        return f"R$ {self.receitas:,.2f}"
+        return formatar_valor_monetario(self.receitas)
 
     @property
     def despesas_formatado(self) -> str:
         """Retorna o total de despesas formatado como moeda brasileira."""
-        return f"R$ {self.despesas:,.2f}"
+        return formatar_valor_monetario(self.despesas)
 
     @property
     def saldo_formatado(self) -> str:
         """Retorna o saldo formatado como moeda brasileira."""
-        return f"R$ {self.saldo:,.2f}"
+        return formatar_valor_monetario(self.saldo)
 
     @classmethod
     def from_dict(cls, data: dict) -> 'ResumoFinanceiro':
         """Cria uma instância de ResumoFinanceiro a partir de um dicionário."""
         return cls(
-            receitas=float(data['receitas']),
-            despesas=float(data['despesas']),
-            saldo=float(data['saldo'])
+            receitas=int(data['receitas']),
+            despesas=int(data['despesas']),
+            saldo=int(data['saldo'])
         )
@@ -0,0 +1,223 @@
+"""
+Servidor web de produção com processos pré-criados (pre-fork).
+
+O processo mestre abre o socket e cria ``workers`` processos filhos, que
+aceitam conexões do mesmo socket. Cada worker importa o app depois do fork,
+de modo que conexões SQLite, caches e índices são dele, e atende as
+requisições com um número fixo de threads, que mantêm suas conexões abertas
+entre uma requisição e outra. O mestre só supervisiona: recria workers que
+terminarem e, ao receber SIGINT ou SIGTERM, encerra todos, que terminam as
+requisições em andamento antes de sair:
+
+    python run.py servir --workers 4 --threads 8 --porta 8000
+
+Requer ``os.fork`` (Linux, macOS); no Windows use o servidor de
+desenvolvimento de cada app.
+"""
+
+import importlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+# Segundos que um worker tem para concluir as requisições ao ser encerrado
+TEMPO_ENCERRAMENTO = 30
+
+class ManipuladorHTTP(WSGIRequestHandler):
+    """Handler HTTP/1.1 que fecha conexões keep-alive ociosas."""
+
+    protocol_version = "HTTP/1.1"
+    # Conexões ociosas prendem uma thread do worker até o cliente fechá-las
+    timeout = 2
+
+class ServidorWSGI(BaseWSGIServer):
+    """
+    Servidor WSGI que atende cada conexão em um ThreadPoolExecutor de
+    tamanho fixo, em vez de uma thread nova por conexão.
+
+    Args:
+        app: Aplicação WSGI
+        host (str): Endereço do socket (define a família IPv4/IPv6)
+        fd (int): Descritor do socket já aberto pelo processo mestre
+        threads (int): Conexões atendidas simultaneamente
+        inicializar_thread (Optional[Callable]): Chamado uma vez em cada thread
+            (ex: ``DatabaseManager.reservar_conexao``)
+    """
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, app, host, fd, threads=8, inicializar_thread=None):
+        super().__init__(host, 0, app, handler=ManipuladorHTTP, fd=fd)
+        self._executor = ThreadPoolExecutor(
+            threads, thread_name_prefix='fin_assist_http', initializer=inicializar_thread)
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address):
+        # Mesmo tratamento do socketserver.ThreadingMixIn
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        # Aguarda as requisições já aceitas
+        if hasattr(self, '_executor'):
+            self._executor.shutdown(wait=True)
+
+def carregar_app(nome):
+    """
+    Importa o app ``nome`` no processo atual.
+
+    Returns:
+        tuple: (app WSGI, função de inicialização de cada thread ou None)
+    """
+    modulo = importlib.import_module(nome)
+    db = getattr(modulo, 'db', None)
+    # Apps com DatabaseManager global: cada thread fica com uma conexão reservada
+    return modulo.app, db.reservar_conexao if db is not None else None
+
+def criar_socket(host, porta, fila=1024):
+    """Abre o socket de escuta compartilhado pelos workers."""
+    familia = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(familia, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, porta))
+    sock.listen(fila)
+    sock.set_inheritable(True)
+    return sock
+
+def _sair(signum, frame):
+    raise SystemExit(0)
+
+class Mestre:
+    """
+    Processo supervisor dos workers.
+
+    Args:
+        app (str): Módulo do app: 'app', 'simple_app' ou 'web_app'
+        host (str): Endereço de escuta
+        porta (int): Porta de escuta
+        workers (int): Processos filhos
+        threads (int): Threads de cada worker
+    """
+
+    def __init__(self, app, host='0.0.0.0', porta=8000, workers=2, threads=8):
+        self.app = app
+        self.host = host
+        self.porta = porta
+        self.workers = workers
+        self.threads = threads
+        self.socket = None
+        self._filhos = {}
+        self._parar = False
+        self._pid = os.getpid()
+
+    def executar(self):
+        """Abre o socket, cria os workers e os supervisiona até ser interrompido."""
+        self.socket = criar_socket(self.host, self.porta)
+        logging.info(f"Servindo {self.app} em http://{self.host}:{self.socket.getsockname()[1]} "
+                     f"com {self.workers} workers x {self.threads} threads")
+        signal.signal(signal.SIGINT, self._ao_sinal)
+        signal.signal(signal.SIGTERM, self._ao_sinal)
+        try:
+            while not self._parar:
+                while len(self._filhos) < self.workers and not self._parar:
+                    self._criar_worker()
+                self._recolher_workers()
+                time.sleep(0.2)
+        finally:
+            # Um worker que sai pela exceção SystemExit passa por aqui também
+            if os.getpid() == self._pid:
+                self._encerrar_workers()
+                self.socket.close()
+        return 0
+
+    def _ao_sinal(self, signum, frame):
+        self._parar = True
+
+    def _criar_worker(self):
+        pid = os.fork()
+        if pid:
+            self._filhos[pid] = time.monotonic()
+            return
+        # Processo filho: nunca volta ao laço do mestre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, _sair)
+        codigo = 1
+        try:
+            codigo = self._executar_worker()
+        except SystemExit as e:
+            codigo = e.code or 0
+        except BaseException:
+            logging.exception(f"Worker {os.getpid()} falhou")
+        sys.exit(codigo)
+
+    def _executar_worker(self):
+        app, inicializar_thread = carregar_app(self.app)
+        servidor = ServidorWSGI(app, self.host, self.socket.fileno(), self.threads, inicializar_thread)
+        self.socket.close()
+        logging.info(f"Worker {os.getpid()} pronto")
+        try:
+            servidor.serve_forever()
+        finally:
+            servidor.server_close()
+        return 0
+
+    def _recolher_workers(self):
+        """Retira da lista os workers que terminaram, para serem recriados."""
+        while self._filhos:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._filhos.clear()
+                return
+            if pid == 0:
+                return
+            inicio = self._filhos.pop(pid, None)
+            if not self._parar:
+                logging.warning(f"Worker {pid} terminou (status {status}); criando outro")
+                if inicio is not None and time.monotonic() - inicio < 1:
+                    # Evita recriar em laço um worker que falha ao iniciar
+                    time.sleep(1)
+
+    def _encerrar_workers(self):
+        for pid in list(self._filhos):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._filhos.pop(pid, None)
+        limite = time.monotonic() + TEMPO_ENCERRAMENTO
+        while self._filhos and time.monotonic() < limite:
+            self._recolher_workers()
+            time.sleep(0.1)
+        for pid in list(self._filhos):
+            logging.warning(f"Worker {pid} não terminou a tempo; forçando")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._filhos.clear()
+
+def servir(app='app', host='0.0.0.0', porta=8000, workers=None, threads=8):
+    """
+    Serve ``app`` com ``workers`` processos (padrão: um por núcleo) de ``threads`` threads.
+
+    Returns:
+        int: Código de saída do processo mestre
+    """
+    if not hasattr(os, 'fork'):
+        raise RuntimeError("O servidor pre-fork requer os.fork (Linux ou macOS)")
+    workers = workers or os.cpu_count() or 1
+    # Lido pelo create_app do app.py em cada worker: uma conexão de leitura por thread
+    os.environ['FIN_ASSIST_CONEXOES'] = str(threads)
+    return Mestre(app, host, porta, workers, threads).executar()
@@ -0,0 +1,237 @@
+"""
+Sugestões de descrição para os formulários de nova transação.
+
+As descrições já usadas ficam em memória em uma lista ordenada pela forma
+normalizada (sem acentos, minúsculas), de modo que as que começam por um
+prefixo formam uma faixa contígua encontrada com ``bisect``. Cada descrição
+tem um peso que combina frequência e uso recente. As melhores de cada prefixo
+curto (calculadas na carga) ou já consultado ficam guardadas; como os pesos
+só aumentam, cada nova transação atualiza essas listas sem invalidá-las.
+"""
+
+import heapq
+import math
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from datetime import date
+
+# Dias para que o uso de uma descrição passe a valer metade
+MEIA_VIDA_DIAS = 90
+
+# Maior número de sugestões por consulta
+MAX_SUGESTOES = 20
+
+# Prefixos com resultado guardado antes de o cache ser esvaziado
+MAX_PREFIXOS = 4096
+
+# Prefixos que abrangem mais descrições que isto têm as melhores calculadas
+# já na carga; nos demais a consulta ordena no máximo essa quantidade
+MAX_FAIXA = 256
+
+# Agrupa por descrição exata; a fusão das variações de caixa e acento é feita em Python
+CONSULTA_DESCRICOES = '''
+    SELECT descricao, categoria, COUNT(*), MAX(data)
+    FROM transacoes
+    WHERE descricao IS NOT NULL AND descricao <> ''
+    GROUP BY descricao, categoria
+'''
+
+_FIM_PREFIXO = chr(0x10FFFF)
+
+def normalizar(texto):
+    """Forma usada na comparação: sem acentos, em minúsculas e com espaços simples."""
+    decomposto = unicodedata.normalize('NFKD', texto or '')
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(sem_acentos.casefold().split())
+
+def _dia(data):
+    """Número do dia de uma data ISO (YYYY-MM-DD); datas inválidas contam como antigas."""
+    try:
+        return date.fromisoformat(str(data)[:10]).toordinal()
+    except ValueError:
+        return 0
+
+class Entrada:
+    """Uma descrição distinta com o uso acumulado."""
+
+    __slots__ = ('texto', 'categoria', 'contagem', 'ultimo_dia', 'peso')
+
+    def __init__(self, texto, categoria, contagem, ultimo_dia):
+        self.texto = texto
+        self.categoria = categoria
+        self.contagem = contagem
+        self.ultimo_dia = ultimo_dia
+        self.peso = 0.0
+        self._calcular_peso()
+
+    def _calcular_peso(self):
+        # log2(contagem * 0.5 ** ((hoje - ultimo_dia) / meia vida)) sem o termo
+        # de hoje, comum a todas as entradas: a ordem não muda com o passar dos dias
+        self.peso = math.log2(self.contagem) + self.ultimo_dia / MEIA_VIDA_DIAS
+
+    def registrar(self, texto, categoria, dia, contagem=1):
+        """Soma usos; o texto e a categoria exibidos são os do uso mais recente."""
+        if dia >= self.ultimo_dia:
+            self.texto = texto
+            self.categoria = categoria
+            self.ultimo_dia = dia
+        self.contagem += contagem
+        self._calcular_peso()
+
+    def como_dict(self):
+        return {'descricao': self.texto, 'categoria': self.categoria, 'contagem': self.contagem}
+
+class IndiceSugestoes:
+    """
+    Índice de prefixos das descrições, carregado do banco no primeiro uso.
+
+    Exclusões e edições de transações não reduzem os pesos; elas passam a
+    valer na próxima carga (``recarregar``).
+
+    Args:
+        carregar_linhas (Callable[[], Iterable[tuple]]): Retorna linhas
+            (descricao, categoria, contagem, data mais recente), como as de
+            ``CONSULTA_DESCRICOES``
+    """
+
+    def __init__(self, carregar_linhas):
+        self._carregar_linhas = carregar_linhas
+        self._lock = threading.Lock()
+        self._chaves = []
+        self._entradas = {}
+        self._melhores = {}
+        self._frequentes = {}
+        self._carregado = False
+
+    @property
+    def carregado(self):
+        return self._carregado
+
+    def __len__(self):
+        return len(self._chaves)
+
+    def carregar(self):
+        """Lê as descrições do banco, se ainda não foram lidas."""
+        with self._lock:
+            if not self._carregado:
+                self._carregar()
+
+    def recarregar(self):
+        """Descarta o índice e lê as descrições novamente."""
+        with self._lock:
+            self._carregar()
+
+    def _carregar(self):
+        entradas = {}
+        for texto, categoria, contagem, data in self._carregar_linhas():
+            chave = normalizar(texto)
+            if not chave:
+                continue
+            entrada = entradas.get(chave)
+            if entrada is None:
+                entradas[chave] = Entrada(texto, categoria, contagem, _dia(data))
+            else:
+                entrada.registrar(texto, categoria, _dia(data), contagem)
+        self._entradas = entradas
+        self._chaves = sorted(entradas)
+        self._melhores = {}
+        self._frequentes = {}
+        # Prefixos curtos abrangem faixas longas demais para ordenar a cada
+        # tecla; suas listas são montadas aqui, uma passada por tamanho
+        candidatas = self._chaves
+        tamanho = 1
+        while candidatas:
+            grupos = {}
+            for chave in candidatas:
+                if len(chave) >= tamanho:
+                    grupos.setdefault(chave[:tamanho], []).append(chave)
+            candidatas = []
+            for prefixo, chaves in grupos.items():
+                if len(chaves) > MAX_FAIXA:
+                    self._frequentes[prefixo] = heapq.nlargest(
+                        MAX_SUGESTOES, (entradas[c] for c in chaves),
+                        key=lambda entrada: entrada.peso)
+                    candidatas.extend(chaves)
+            tamanho += 1
+        self._carregado = True
+
+    def registrar(self, descricao, categoria, data):
+        """
+        Conta um novo uso de ``descricao``.
+
+        Não faz nada enquanto o índice não foi carregado: a carga já inclui
+        a transação gravada.
+        """
+        chave = normalizar(descricao)
+        if not chave:
+            return
+        with self._lock:
+            if not self._carregado:
+                return
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                entrada = self._entradas[chave] = Entrada(descricao, categoria, 1, _dia(data))
+                insort(self._chaves, chave)
+            else:
+                entrada.registrar(descricao, categoria, _dia(data))
+            # Só o peso desta entrada mudou, e para cima: basta reposicioná-la
+            # nas listas dos prefixos dela que estão guardadas
+            for tamanho in range(1, len(chave) + 1):
+                prefixo = chave[:tamanho]
+                melhores = self._frequentes.get(prefixo) or self._melhores.get(prefixo)
+                if melhores is None:
+                    continue
+                if entrada in melhores:
+                    melhores.sort(key=lambda e: e.peso, reverse=True)
+                elif len(melhores) < MAX_SUGESTOES or entrada.peso > melhores[-1].peso:
+                    melhores.append(entrada)
+                    melhores.sort(key=lambda e: e.peso, reverse=True)
+                    del melhores[MAX_SUGESTOES:]
+
+    def sugerir(self, prefixo, limite=10):
+        """
+        Retorna as descrições que começam por ``prefixo``, das mais usadas.
+
+        A comparação ignora caixa e acentos: 'farm' encontra 'Farmácia'.
+
+        Args:
+            prefixo (str): Texto digitado até o momento
+            limite (int): Máximo de sugestões (até ``MAX_SUGESTOES``)
+
+        Returns:
+            List[dict]: Itens com 'descricao', 'categoria' e 'contagem'
+        """
+        chave = normalizar(prefixo)
+        if not chave:
+            return []
+        if not self._carregado:
+            self.carregar()
+        with self._lock:
+            melhores = self._frequentes.get(chave) or self._melhores.get(chave)
+            if melhores is None:
+                inicio = bisect_left(self._chaves, chave)
+                fim = bisect_left(self._chaves, chave + _FIM_PREFIXO, inicio)
+                melhores = heapq.nlargest(
+                    MAX_SUGESTOES,
+                    (self._entradas[c] for c in self._chaves[inicio:fim]),
+                    key=lambda entrada: entrada.peso)
+                if len(self._melhores) >= MAX_PREFIXOS:
+                    self._melhores.clear()
+                self._melhores[chave] = melhores
+            return [entrada.como_dict() for entrada in melhores[:max(0, min(limite, MAX_SUGESTOES))]]
+
+def registrar_rota_sugestoes(app, indice, rota='/api/sugestoes'):
+    """
+    Expõe ``rota`` em um app Flask: GET ``?q=<prefixo>&limite=<n>`` retorna
+    ``{"sugestoes": [...]}`` em JSON.
+    """
+    from flask import jsonify, request
+
+    from .utils import ler_limite
+
+    def sugestoes():
+        limite = ler_limite(request.args.get('limite'), padrao=10, maximo=MAX_SUGESTOES)
+        return jsonify({'sugestoes': indice.sugerir(request.args.get('q', ''), limite)})
+
+    app.add_url_rule(rota, 'sugestoes', sugestoes)
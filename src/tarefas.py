@@ -0,0 +1,60 @@
+"""
+Execução de consultas em segundo plano para a interface desktop.
+
+Cada ``Tarefa`` roda uma função em um ``QThreadPool`` e entrega o resultado
+por sinais, que o Qt encaminha para a thread da interface. A tarefa carrega
+a geração do carregamento que a criou, para que resultados de carregamentos
+substituídos possam ser descartados.
+"""
+
+import logging
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+class SinaisTarefa(QObject):
+    """Sinais emitidos por uma Tarefa."""
+
+    concluida = pyqtSignal(int, object)   # geração, resultado
+    falhou = pyqtSignal(int, str)         # geração, mensagem de erro
+    finalizada = pyqtSignal(object)       # a própria tarefa
+
+class Tarefa(QRunnable):
+    """
+    Executa ``funcao(*args)`` fora da thread da interface.
+    
+    Attributes:
+        geracao (int): Geração do carregamento que criou a tarefa
+        sinais (SinaisTarefa): Sinais de resultado, erro e término
+    """
+
+    def __init__(self, geracao, funcao, *args):
+        super().__init__()
+        # A janela mantém a referência até o sinal ``finalizada``
+        self.setAutoDelete(False)
+        self.geracao = geracao
+        self.funcao = funcao
+        self.args = args
+        self.sinais = SinaisTarefa()
+        self._cancelada = False
+
+    @property
+    def cancelada(self):
+        return self._cancelada
+
+    def cancelar(self):
+        """Impede que a tarefa rode ou, se já estiver rodando, que entregue o resultado."""
+        self._cancelada = True
+
+    def run(self):
+        try:
+            if self._cancelada:
+                return
+            resultado = self.funcao(*self.args)
+            if not self._cancelada:
+                self.sinais.concluida.emit(self.geracao, resultado)
+        except Exception as e:
+            logging.error(f"Erro ao carregar dados em segundo plano: {e}", exc_info=True)
+            if not self._cancelada:
+                self.sinais.falhou.emit(self.geracao, str(e))
+        finally:
+            self.sinais.finalizada.emit(self)
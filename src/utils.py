@@ -1,19 +1,22 @@
 import re
 from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from typing import Union, Tuple, Optional
 
-def validar_valor(valor: str) -> Tuple[bool, Optional[float], Optional[str]]:
+# Valores monetários são armazenados e calculados em centavos (int)
+
+def valor_para_centavos(valor: str) -> int:
     """
-    Valida se uma string representa um valor monetário válido.
+    Converte um valor digitado (ex: 'R$ 1.234,56') para centavos.
     
     Args:
-        valor (str): String contendo o valor a ser validado
+        valor (str): String contendo o valor em reais
         
     Returns:
-        Tuple[bool, Optional[float], Optional[str]]: 
-            - Boolean indicando se é válido
-            - Valor convertido para float se válido, None se inválido
-            - Mensagem de erro se inválido, None se válido
+        int: Valor em centavos (ex: 123456)
+        
+    Raises:
+        ValueError: Se a string não representar um número
     """
     # Remove R$ e espaços
     valor = valor.replace('R$', '').strip()
@@ -21,10 +24,43 @@ def validar_valor(valor: str) -> Tuple[bool, Optional[float], Optional[str]]:
     valor = valor.replace('.', '').replace(',', '.')
     
     try:
-        valor_float = float(valor)
-        if valor_float <= 0:
+        reais = Decimal(valor)
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {valor!r}")
+    if not reais.is_finite():
+        raise ValueError(f"Valor inválido: {valor!r}")
+    return int((reais * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def centavos_para_decimal(centavos: int) -> Decimal:
+    """
+    Converte centavos para reais sem perda de precisão.
+    
+    Args:
+        centavos (int): Valor em centavos
+        
+    Returns:
+        Decimal: Valor em reais com duas casas (ex: Decimal('1234.56'))
+    """
+    return Decimal(centavos).scaleb(-2)
+
+def validar_valor(valor: str) -> Tuple[bool, Optional[int], Optional[str]]:
+    """
+    Valida se uma string representa um valor monetário válido.
+    
+    Args:
+        valor (str): String contendo o valor a ser validado
+        
+    Returns:
+        Tuple[bool, Optional[int], Optional[str]]: 
+            - Boolean indicando se é válido
+            - Valor convertido para centavos se válido, None se inválido
+            - Mensagem de erro se inválido, None se válido
+    """
+    try:
+        centavos = valor_para_centavos(valor)
+        if centavos <= 0:
             return False, None, "O valor deve ser maior que zero"
-        return True, valor_float, None
+        return True, centavos, None
     except ValueError:
         return False, None, "Valor inválido. Use apenas números e vírgula"
 
@@ -53,23 +89,79 @@ def validar_data(data: str) -> Tuple[bool, Optional[datetime], Optional[str]]:
     except ValueError:
         return False, None, "Data inválida. Use o formato dd/mm/aaaa"
 
-def formatar_valor_monetario(valor: Union[float, str]) -> str:
+def codificar_cursor(data: str, id: int) -> str:
+    """
+    Codifica a posição (data, id) da última linha de uma página.
+    
+    Args:
+        data (str): Data ISO da última transação exibida
+        id (int): ID da última transação exibida
+        
+    Returns:
+        str: Cursor para ser usado como parâmetro de URL (ex: 2026-10-01:42)
+    """
+    return f"{data}:{id}"
+
+def decodificar_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
+    """
+    Decodifica um cursor gerado por ``codificar_cursor``.
+    
+    Args:
+        cursor (Optional[str]): Cursor recebido na URL
+        
+    Returns:
+        Optional[Tuple[str, int]]: Par (data, id), ou None se ausente ou inválido
+    """
+    if not cursor:
+        return None
+    data, _, id = cursor.rpartition(':')
+    try:
+        datetime.strptime(data, "%Y-%m-%d")
+        return data, int(id)
+    except ValueError:
+        return None
+
+def ler_limite(valor: Optional[str], padrao: int = 50, maximo: int = 200) -> int:
+    """
+    Converte o parâmetro de tamanho de página, limitando-o a ``maximo``.
+    
+    Args:
+        valor (Optional[str]): Valor recebido na URL
+        padrao (int): Tamanho usado quando o valor é ausente ou inválido
+        maximo (int): Maior tamanho de página permitido
+        
+    Returns:
+        int: Tamanho de página entre 1 e ``maximo``
+    """
+    try:
+        limite = int(valor)
+    except (TypeError, ValueError):
+        return padrao
+    return max(1, min(limite, maximo))
+
+def formatar_valor_monetario(valor: Union[int, str, None]) -> str:
     """
-    Formata um valor numérico para o formato monetário brasileiro.
+    Formata um valor em centavos para o formato monetário brasileiro.
     
     Args:
-        valor (Union[float, str]): Valor a ser formatado
+        valor (Union[int, str, None]): Valor em centavos, ou string em reais
+            (ex: '1.234,56') a ser convertida
         
     Returns:
         str: Valor formatado (ex: R$ 1.234,56)
     """
+    if valor is None:
+        return "R$ 0,00"
     if isinstance(valor, str):
         try:
-            valor = float(valor.replace('R$', '').replace('.', '').replace(',', '.').strip())
+            valor = valor_para_centavos(valor)
         except ValueError:
             return "R$ 0,00"
     
-    return f"R$ {valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+    centavos = int(valor)
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}R$ {reais:,}".replace(',', '.') + f",{resto:02d}"
 
 def formatar_data(data: Union[str, datetime]) -> str:
     """
@@ -0,0 +1,47 @@
+// Autocompletar da descrição nos formulários de nova transação.
+// Campos com data-sugestoes="<url>" recebem uma datalist preenchida com as
+// descrições já usadas; ao escolher uma, a categoria do formulário é ajustada.
+document.querySelectorAll('input[data-sugestoes]').forEach(function(campo) {
+    const lista = document.createElement('datalist');
+    lista.id = 'sugestoes-' + Math.random().toString(36).slice(2);
+    campo.setAttribute('list', lista.id);
+    campo.setAttribute('autocomplete', 'off');
+    campo.after(lista);
+
+    let categorias = {};
+    let pedido = null;
+    let espera = null;
+
+    campo.addEventListener('input', function() {
+        const texto = campo.value.trim();
+        const categoria = categorias[campo.value];
+        const seletor = campo.form && campo.form.querySelector('select[name="categoria"]');
+        if (categoria && seletor) {
+            seletor.value = categoria;
+        }
+
+        clearTimeout(espera);
+        if (!texto) {
+            lista.replaceChildren();
+            return;
+        }
+        espera = setTimeout(function() {
+            if (pedido) {
+                pedido.abort();
+            }
+            pedido = new AbortController();
+            fetch(campo.dataset.sugestoes + '?q=' + encodeURIComponent(texto), {signal: pedido.signal})
+                .then(function(resposta) { return resposta.json(); })
+                .then(function(dados) {
+                    categorias = {};
+                    lista.replaceChildren(...dados.sugestoes.map(function(sugestao) {
+                        categorias[sugestao.descricao] = sugestao.categoria;
+                        const opcao = document.createElement('option');
+                        opcao.value = sugestao.descricao;
+                        return opcao;
+                    }));
+                })
+                .catch(function() {});
+        }, 80);
+    });
+});
@@ -0,0 +1,34 @@
+"""Fixtures compartilhadas: bancos sintéticos de src/gerador_dados.py e o app principal."""
+
+import contextlib
+
+import pytest
+
+from src.gerador_dados import banco_sintetico, banco_temporario
+
+@pytest.fixture(scope='session', autouse=True)
+def diretorio_isolado(tmp_path_factory):
+    # simple_app e web_app criam fin_assist.db no diretório atual ao serem importados
+    with contextlib.chdir(tmp_path_factory.mktemp('cwd')):
+        yield
+
+@pytest.fixture(scope='session')
+def diretorio_bancos(tmp_path_factory):
+    return tmp_path_factory.mktemp('bancos')
+
+@pytest.fixture
+def db():
+    with banco_temporario(500, semente=1) as db:
+        yield db
+
+@pytest.fixture
+def app_principal(tmp_path, diretorio_bancos):
+    """App do app.py sobre uma cópia de um banco sintético com o schema.sql."""
+    import app
+
+    original = banco_sintetico(diretorio_bancos, 500, semente=1, esquema='sql')
+    caminho = tmp_path / 'fin_assist.db'
+    caminho.write_bytes(original.read_bytes())
+    aplicacao = app.create_app(str(caminho), conexoes=2)
+    yield aplicacao
+    aplicacao.extensions['fin_assist'].pool.close()
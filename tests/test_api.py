@@ -0,0 +1,95 @@
+"""Valores monetários e gravação na API JSON (src/api.py)."""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+def transacao(valor):
+    return {'tipo': 'Despesa', 'valor': valor, 'data': date.today().isoformat(),
+            'descricao': 'teste da API', 'categoria': 'Outros'}
+
+@pytest.mark.parametrize('valor, centavos', [
+    ('12.50', 1250),
+    ('12.5', 1250),
+    ('1234', 123400),
+    ('12,50', 1250),
+    ('R$ 1.234,56', 123456),
+    ('1.234.567,89', 123456789),
+    (12.5, 1250),
+    (0.29, 29),
+    (7, 700),
+])
+def test_valores_aceitos(app_principal, valor, centavos):
+    cliente = app_principal.test_client()
+    resposta = cliente.post('/api/transacoes', json=transacao(valor))
+    assert resposta.status_code == 201
+    id = resposta.get_json()['resultados'][0]['id']
+
+    transacoes = cliente.get('/api/transacoes?limite=200').get_json()['transacoes']
+    gravada = next(t for t in transacoes if t['id'] == id)
+    assert gravada['valor'] == f'{centavos // 100}.{centavos % 100:02d}'
+
+@pytest.mark.parametrize('valor', [
+    '1.234', '12,345', 0.1 + 0.2, '12.5.0', 'abc', '', 'NaN', 'Infinity', True, [12],
+])
+def test_valores_ambiguos_ou_invalidos_sao_rejeitados(app_principal, valor):
+    resposta = app_principal.test_client().post('/api/transacoes', json=transacao(valor))
+    assert resposta.status_code == 422
+    assert 'valor' in resposta.get_json()['resultados'][0]['erros']
+
+@pytest.mark.parametrize('valor, erro', [
+    (0, "O valor deve ser maior que zero"),
+    ('-1.00', "O valor deve ser maior que zero"),
+    ('1e30', "Valor acima do máximo permitido"),
+])
+def test_limites_do_valor(app_principal, valor, erro):
+    resposta = app_principal.test_client().post('/api/transacoes', json=transacao(valor))
+    assert resposta.get_json()['resultados'][0]['erros'] == {'valor': erro}
+
+def test_meta_aceita_valor_atual_zero_e_responde_texto(app_principal):
+    cliente = app_principal.test_client()
+    resposta = cliente.post('/api/metas', json={
+        'descricao': 'Reserva', 'valor_alvo': '1500.00', 'valor_atual': 0,
+        'data_inicio': '2024-01-01', 'data_fim': '2024-12-31'})
+    assert resposta.status_code == 201
+    id = resposta.get_json()['resultados'][0]['id']
+
+    meta = next(m for m in cliente.get('/api/metas').get_json()['metas'] if m['id'] == id)
+    assert (meta['valor_alvo'], meta['valor_atual']) == ('1500.00', '0.00')
+
+@pytest.fixture
+def app_com_escrita_agrupada(db):
+    from flask import Flask
+
+    from src.api import registrar_api
+
+    db.ativar_escrita_agrupada(max_latencia=0.05)
+    aplicacao = Flask(__name__)
+    registrar_api(aplicacao, db.conexao, db.add_transacoes_lote, cache=db.cache)
+    return aplicacao
+
+def test_lote_da_api_passa_pela_fila_de_escrita(db, app_com_escrita_agrupada):
+    versao_cache = db.cache.versao
+    lote = [transacao(f'{i}.00') for i in range(1, 6)]
+    resposta = app_com_escrita_agrupada.test_client().post('/api/transacoes/batch', json=lote)
+    assert resposta.status_code == 201
+    assert db.escrita.estatisticas()['linhas'] == 5
+    assert db.cache.versao != versao_cache
+    assert 'teste da API' in [s['descricao'] for s in db.sugestoes.sugerir('teste')]
+
+def test_add_transacoes_lote_isola_erros_por_linha(db):
+    total = len(db.get_transacoes())
+    hoje = date.today().isoformat()
+    validas = [('Despesa', 100, hoje, 'a', 'Outros'), ('Receita', 200, hoje, 'b', 'Outros')]
+    invalida = ('Despesa', None, hoje, 'c', 'Outros')
+
+    resultados = db.add_transacoes_lote([validas[0], invalida, validas[1]])
+    assert isinstance(resultados[0], int) and isinstance(resultados[2], int)
+    assert isinstance(resultados[1], sqlite3.IntegrityError)
+    assert len(db.get_transacoes()) == total + 2
+
+    resultados = db.add_transacoes_lote([validas[0], invalida, validas[1]], atomico=True)
+    assert resultados[0] is None and resultados[2] is None
+    assert isinstance(resultados[1], sqlite3.IntegrityError)
+    assert len(db.get_transacoes()) == total + 2
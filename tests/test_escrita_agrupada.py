@@ -0,0 +1,99 @@
+"""Fila de gravação agrupada (src/escrita_agrupada.py)."""
+
+import sqlite3
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from src.escrita_agrupada import FilaEscrita
+
+@pytest.fixture
+def abrir_conexao(tmp_path):
+    caminho = tmp_path / 'fila.db'
+    with sqlite3.connect(caminho) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, a INTEGER NOT NULL, b TEXT UNIQUE)")
+    conn.close()
+    return lambda: sqlite3.connect(caminho, check_same_thread=False)
+
+def linhas(abrir_conexao):
+    conn = abrir_conexao()
+    try:
+        return conn.execute("SELECT a, b FROM t ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+def test_linha_invalida_nao_afeta_o_resto_do_lote(abrir_conexao):
+    fila = FilaEscrita(abrir_conexao, "INSERT INTO t (a, b) VALUES (?, ?)", max_latencia=0.05)
+    try:
+        futuros = [
+            fila.enviar((1, 'x')),
+            fila.enviar((2,)),            # número errado de parâmetros
+            fila.enviar((3, object())),   # tipo não suportado
+            fila.enviar((2 ** 70, 'z')),  # não cabe em INTEGER
+            fila.enviar((None, 'y')),     # NOT NULL
+            fila.enviar((4, 'x')),        # UNIQUE
+            fila.enviar((5, 'w')),
+        ]
+        wait(futuros, timeout=10)
+    finally:
+        fila.close()
+
+    assert isinstance(futuros[0].result(), int)
+    assert isinstance(futuros[6].result(), int)
+    assert isinstance(futuros[1].exception(), sqlite3.ProgrammingError)
+    assert isinstance(futuros[2].exception(), sqlite3.ProgrammingError)
+    assert isinstance(futuros[3].exception(), OverflowError)
+    assert isinstance(futuros[4].exception(), sqlite3.IntegrityError)
+    assert isinstance(futuros[5].exception(), sqlite3.IntegrityError)
+    assert linhas(abrir_conexao) == [(1, 'x'), (5, 'w')]
+    assert fila.estatisticas()['lotes'] == 1
+
+def test_close_entre_a_verificacao_e_o_put(abrir_conexao, monkeypatch):
+    fila = FilaEscrita(abrir_conexao, "INSERT INTO t (a) VALUES (?)")
+    put = fila._fila.put
+
+    def fechar_antes_do_put(item, *args, **kwargs):
+        if isinstance(item, tuple):
+            # close() termina inteiro depois que enviar() viu a fila aberta
+            fechamento = threading.Thread(target=fila.close)
+            fechamento.start()
+            fechamento.join()
+        put(item, *args, **kwargs)
+
+    monkeypatch.setattr(fila._fila, 'put', fechar_antes_do_put)
+    futuro = fila.enviar((1,))
+    with pytest.raises(RuntimeError):
+        futuro.result(timeout=5)
+    assert linhas(abrir_conexao) == []
+
+@pytest.mark.parametrize('rodada', range(5))
+def test_close_concorrente_nao_deixa_futures_pendentes(abrir_conexao, rodada):
+    fila = FilaEscrita(abrir_conexao, "INSERT INTO t (a) VALUES (?)", max_latencia=0.001)
+    futuros, recusados = [], []
+    inicio = threading.Barrier(5)
+
+    def enviar(cliente):
+        inicio.wait()
+        for i in range(200):
+            try:
+                futuros.append(fila.enviar((cliente * 1000 + i,)))
+            except RuntimeError:
+                recusados.append(i)
+                return
+
+    clientes = [threading.Thread(target=enviar, args=(c,)) for c in range(4)]
+    for cliente in clientes:
+        cliente.start()
+    inicio.wait()
+    fila.close()
+    for cliente in clientes:
+        cliente.join()
+
+    _, pendentes = wait(futuros, timeout=10)
+    assert not pendentes
+    gravados = [f.result() for f in futuros if f.exception() is None]
+    for futuro in futuros:
+        if futuro.exception() is not None:
+            assert isinstance(futuro.exception(), RuntimeError)
+    assert len(linhas(abrir_conexao)) == len(gravados)
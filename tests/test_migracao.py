@@ -0,0 +1,83 @@
+"""Migração de bancos com valores REAL em reais para INTEGER em centavos."""
+
+import sqlite3
+from decimal import Decimal
+
+from src.database import VERSAO_ESQUEMA, DatabaseManager
+from src.utils import centavos_para_decimal, valor_para_centavos
+
+# Tabelas como eram criadas antes da versão 1 do esquema
+ESQUEMA_REAIS = '''
+    CREATE TABLE transacoes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tipo TEXT NOT NULL,
+        valor REAL NOT NULL,
+        data TEXT NOT NULL,
+        descricao TEXT,
+        categoria TEXT NOT NULL
+    );
+    CREATE TABLE orcamentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        categoria TEXT NOT NULL,
+        valor_limite REAL NOT NULL,
+        mes INTEGER NOT NULL,
+        ano INTEGER NOT NULL,
+        UNIQUE(categoria, mes, ano)
+    );
+    CREATE TABLE metas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        descricao TEXT NOT NULL,
+        valor_alvo REAL NOT NULL,
+        valor_atual REAL DEFAULT 0,
+        data_inicio TEXT NOT NULL,
+        data_fim TEXT NOT NULL,
+        status TEXT DEFAULT 'Em Andamento'
+    );
+'''
+
+# Valores que não têm representação exata em ponto flutuante
+VALORES = [0.29, 12.34, 0.1 + 0.2, 1234.5, 99999.99, 1e-3]
+
+def criar_banco_antigo(caminho):
+    conn = sqlite3.connect(caminho)
+    conn.executescript(ESQUEMA_REAIS)
+    conn.executemany(
+        "INSERT INTO transacoes (tipo, valor, data, descricao, categoria) VALUES (?, ?, ?, ?, ?)",
+        [('Despesa', valor, '2024-01-15', f'item {i}', 'Outros') for i, valor in enumerate(VALORES)])
+    conn.execute("INSERT INTO orcamentos (categoria, valor_limite, mes, ano) VALUES ('Outros', 500.1, 1, 2024)")
+    conn.execute("INSERT INTO metas (descricao, valor_alvo, valor_atual, data_inicio, data_fim) "
+                 "VALUES ('Viagem', 3000.07, 150.5, '2024-01-01', '2024-12-31')")
+    conn.commit()
+    conn.close()
+
+def test_migracao_converte_reais_em_centavos(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    criar_banco_antigo(caminho)
+
+    with DatabaseManager(caminho) as db:
+        valores = [linha[0] for linha in db.fetch_all("SELECT valor FROM transacoes ORDER BY id")]
+        assert valores == [round(valor * 100) for valor in VALORES]
+        assert all(type(valor) is int for valor in valores)
+        assert db.fetch_one("SELECT valor_limite FROM orcamentos") == (50010,)
+        assert db.fetch_one("SELECT valor_alvo, valor_atual FROM metas") == (300007, 15050)
+        # O resumo mensal é recalculado já em centavos
+        assert db.get_resumo_financeiro()['despesas'] == sum(valores)
+        assert db.fetch_one("PRAGMA user_version") == (VERSAO_ESQUEMA,)
+
+def test_migracao_preserva_valores_de_ida_e_volta(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    criar_banco_antigo(caminho)
+
+    with DatabaseManager(caminho) as db:
+        for (valor,), original in zip(db.fetch_all("SELECT valor FROM transacoes ORDER BY id"), VALORES):
+            reais = centavos_para_decimal(valor)
+            assert reais == Decimal(f'{original:.2f}')
+            assert valor_para_centavos(str(reais).replace('.', ',')) == valor
+
+def test_migracao_nao_altera_banco_atualizado(tmp_path):
+    caminho = str(tmp_path / 'antigo.db')
+    criar_banco_antigo(caminho)
+    DatabaseManager(caminho).close()
+
+    with DatabaseManager(caminho) as db:
+        assert db.fetch_one("SELECT valor FROM transacoes WHERE descricao = 'item 1'") == (1234,)
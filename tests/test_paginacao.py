@@ -0,0 +1,71 @@
+"""Cursores de paginação e limites de página."""
+
+import pytest
+
+from src.utils import codificar_cursor, decodificar_cursor, ler_limite
+
+@pytest.mark.parametrize('cursor, esperado', [
+    ('2024-03-05:42', ('2024-03-05', 42)),
+    (codificar_cursor('2026-10-01', 7), ('2026-10-01', 7)),
+    (None, None),
+    ('', None),
+    ('2024-03-05', None),
+    ('2024-03-05:', None),
+    ('2024-03-05:abc', None),
+    ('2024-13-01:1', None),
+    ('ontem:1', None),
+    (':1', None),
+])
+def test_decodificar_cursor(cursor, esperado):
+    assert decodificar_cursor(cursor) == esperado
+
+@pytest.mark.parametrize('valor, esperado', [
+    (None, 50), ('', 50), ('abc', 50), ('1', 1), ('0', 1), ('-5', 1),
+    ('200', 200), ('201', 200), ('10000', 200),
+])
+def test_ler_limite(valor, esperado):
+    assert ler_limite(valor) == esperado
+
+def percorrer(db, limite):
+    paginas, cursor = [], None
+    while True:
+        pagina, cursor = db.get_pagina_transacoes(after=cursor, limit=limite)
+        paginas.append(pagina)
+        if cursor is None:
+            return paginas
+
+@pytest.mark.parametrize('limite', [1, 7, 50])
+def test_paginas_cobrem_todas_as_transacoes_em_ordem(db, limite):
+    todas = db.get_transacoes()
+    paginas = percorrer(db, limite)
+    assert [linha for pagina in paginas for linha in pagina] == todas
+    assert all(len(pagina) == limite for pagina in paginas[:-1])
+    assert 1 <= len(paginas[-1]) <= limite
+
+def test_ultima_pagina_cheia_nao_tem_cursor(db):
+    total = len(db.get_transacoes())
+    pagina, cursor = db.get_pagina_transacoes(limit=total)
+    assert len(pagina) == total
+    assert cursor is None
+
+    pagina, cursor = db.get_pagina_transacoes(limit=total - 1)
+    assert cursor is not None
+    assert db.get_pagina_transacoes(after=cursor, limit=total) == ([db.get_transacoes()[-1]], None)
+
+def test_cursor_apos_a_ultima_linha_retorna_pagina_vazia(db):
+    ultima = db.get_transacoes()[-1]
+    assert db.get_pagina_transacoes(after=(ultima[3], ultima[0]), limit=10) == ([], None)
+
+def test_paginas_do_app_seguem_o_cursor(app_principal):
+    cliente = app_principal.test_client()
+    resposta = cliente.get('/api/transacoes?limite=3')
+    assert resposta.status_code == 200
+    primeira = resposta.get_json()
+    assert len(primeira['transacoes']) == 3
+
+    resposta = cliente.get(f"/api/transacoes?limite=3&cursor={primeira['proximo_cursor']}")
+    segunda = resposta.get_json()
+    ids = [t['id'] for t in primeira['transacoes'] + segunda['transacoes']]
+    assert len(set(ids)) == 6
+
+    assert cliente.get('/api/transacoes?limite=3&cursor=invalido').get_json() == primeira
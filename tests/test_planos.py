@@ -0,0 +1,8 @@
+"""Planos de execução de todo o SQL do projeto (ver benchmarks/planos.py)."""
+
+from benchmarks.planos import verificar_planos
+
+def test_nenhum_comando_varre_ou_ordena_transacoes():
+    comandos, falhas = verificar_planos(transacoes=5_000)
+    assert comandos > 0
+    assert falhas == 0
@@ -0,0 +1,59 @@
+"""Revalidação condicional (ETag e Last-Modified) das páginas do app.py."""
+
+from datetime import date
+
+import pytest
+
+PAGINAS = ['/', '/transactions', '/budgets']
+
+def nova_transacao():
+    return {'tipo': 'Despesa', 'valor': 10, 'data': date.today().isoformat(),
+            'descricao': 'revalidação', 'categoria': 'Outros'}
+
+@pytest.mark.parametrize('pagina', PAGINAS)
+def test_etag_valido_retorna_304_sem_corpo(app_principal, pagina):
+    cliente = app_principal.test_client()
+    resposta = cliente.get(pagina)
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag']
+    assert 'no-cache' in resposta.headers['Cache-Control']
+
+    revalidada = cliente.get(pagina, headers={'If-None-Match': resposta.headers['ETag']})
+    assert revalidada.status_code == 304
+    assert revalidada.data == b''
+    assert revalidada.headers['ETag'] == resposta.headers['ETag']
+
+def test_last_modified_valido_retorna_304(app_principal):
+    cliente = app_principal.test_client()
+    resposta = cliente.get('/transactions')
+    revalidada = cliente.get('/transactions',
+                             headers={'If-Modified-Since': resposta.headers['Last-Modified']})
+    assert revalidada.status_code == 304
+
+def test_escrita_invalida_o_etag(app_principal):
+    cliente = app_principal.test_client()
+    etag = cliente.get('/transactions').headers['ETag']
+
+    assert cliente.post('/api/transacoes', json=nova_transacao()).status_code == 201
+
+    resposta = cliente.get('/transactions', headers={'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert resposta.headers['ETag'] != etag
+    assert 'revalidação' in resposta.get_data(as_text=True)
+
+def test_etag_de_outra_pagina_nao_vale(app_principal):
+    cliente = app_principal.test_client()
+    # A página inicial também depende do mês corrente
+    etag = cliente.get('/transactions').headers['ETag']
+    assert cliente.get('/', headers={'If-None-Match': etag}).status_code == 200
+
+def test_pagina_com_mensagem_nao_e_reaproveitada(app_principal):
+    cliente = app_principal.test_client()
+    etag = cliente.get('/transactions').headers['ETag']
+    with cliente.session_transaction() as sessao:
+        sessao['_flashes'] = [('success', 'Transação adicionada com sucesso!')]
+
+    resposta = cliente.get('/transactions', headers={'If-None-Match': etag})
+    assert resposta.status_code == 200
+    assert 'no-store' in resposta.headers['Cache-Control']
+    assert 'ETag' not in resposta.headers
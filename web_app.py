@@ -1,25 +1,44 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
+from src.api import registrar_api
 from src.database import DatabaseManager
+from src.exportador import ler_filtros, gerar_csv, gerar_jsonl
+from src.metricas import instrumentar_app
+from src.sugestoes import registrar_rota_sugestoes
 from src.models import Transacao, ResumoFinanceiro
-from src.utils import validar_valor, validar_data, formatar_valor_monetario
+from src.utils import (
+    validar_valor, validar_data, formatar_valor_monetario, centavos_para_decimal,
+    codificar_cursor, decodificar_cursor, ler_limite
+)
 from datetime import datetime
 import logging
+import atexit
 
 app = Flask(__name__)
+app.add_template_filter(formatar_valor_monetario, 'moeda')
+app.add_template_filter(centavos_para_decimal, 'reais')
 db = DatabaseManager()
+atexit.register(db.close)
+instrumentar_app(app, db.metricas)
+registrar_rota_sugestoes(app, db.sugestoes)
+registrar_api(app, db.conexao, db.add_transacoes_lote, cache=db.cache)
 
 @app.route('/')
 def index():
     """Página principal."""
     resumo = db.get_resumo_financeiro()
-    transacoes = db.get_transacoes()
+    cursor = decodificar_cursor(request.args.get('cursor'))
+    limite = ler_limite(request.args.get('limite'))
+    transacoes, proximo = db.get_pagina_transacoes(after=cursor, limit=limite)
     categorias = [cat[0] for cat in db.get_categorias()]
     
     return render_template(
         'index.html',
         resumo=resumo,
         transacoes=transacoes,
-        categorias=categorias
+        categorias=categorias,
+        limite=limite,
+        primeira_pagina=cursor is None,
+        proximo_cursor=codificar_cursor(*proximo) if proximo else None
     )
 
 @app.route('/adicionar_transacao', methods=['POST'])
@@ -33,7 +52,7 @@ def adicionar_transacao():
         descricao = request.form['descricao']
 
         # Validações
-        valido, valor_float, erro = validar_valor(valor)
+        valido, valor_centavos, erro = validar_valor(valor)
         if not valido:
             return jsonify({'error': erro}), 400
 
@@ -42,7 +61,7 @@ def adicionar_transacao():
             return jsonify({'error': erro}), 400
 
         # Salva no banco de dados
-        db.add_transacao(tipo, valor_float, data, descricao, categoria)
+        db.add_transacao(tipo, valor_centavos, data, descricao, categoria)
         
         return redirect(url_for('index'))
         
@@ -60,5 +79,20 @@ def excluir_transacao(id):
         logging.error(f"Erro ao excluir transação: {e}")
         return jsonify({'error': 'Erro ao excluir a transação'}), 500
 
+# Rotas para Exportação
+@app.route('/export/transacoes.csv')
+def exportar_transacoes_csv():
+    """Exporta as transações filtradas em CSV."""
+    linhas = db.iter_transacoes(**ler_filtros(request.args))
+    return Response(gerar_csv(linhas), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.csv'})
+
+@app.route('/export/transacoes.jsonl')
+def exportar_transacoes_jsonl():
+    """Exporta as transações filtradas em JSON lines."""
+    linhas = db.iter_transacoes(**ler_filtros(request.args))
+    return Response(gerar_jsonl(linhas), mimetype='application/x-ndjson',
+                    headers={'Content-Disposition': 'attachment; filename=transacoes.jsonl'})
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8000, debug=True)